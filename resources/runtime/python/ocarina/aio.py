@@ -0,0 +1,170 @@
+#! /usr/bin/python
+'''
+:mod:`aio` -- asyncio front-end to Ocarina
+==========================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module runs Ocarina functions in a worker process, off the
+asyncio event loop. Each :class:`Session` owns one worker, hence one
+model. Requires Python 3.5 or later.
+
+>>> session = Session()
+>>> async for step in session.run([ ("load", "foo.aadl"), ("analyze",),
+...                                 ("instantiate", "") ]):
+...     print(step.step, step.warnings, step.errors)
+>>> result = await session.check_theorem("check_periods")
+
+'''
+
+################################################################################
+
+try:
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+    import ocarina
+    from pool import Steps, StepResult
+except ImportError:
+    pass
+
+################################################################################
+
+def runStep (step):
+    '''Run one step in the worker, return its :data:`StepResult`'''
+
+    if step[0] != 'reset' and step[0] not in Steps:
+        raise ValueError('%s cannot be used as a step' % step[0])
+    if step[0] == 'reset':
+        ocarina.reset()
+        return StepResult('reset', None, [[]], [], [])
+    result = getattr(ocarina, step[0])(*step[1:])
+    return StepResult(step[0], result.value, result.stdout,
+                      result.warnings, result.errors)
+
+def runSteps (steps):
+    '''Run steps in the worker, up to the first one that fails, return
+       the :data:`StepResult` of the last step run'''
+
+    for step in steps:
+        result = runStep(step)
+        if result.errors != []:
+            break
+    return result
+
+################################################################################
+
+class Session(object):
+    '''Ocarina session run by a dedicated worker process
+
+    :param loop: the event loop, by default the current one
+    '''
+
+    def __init__ (self, loop=None):
+        self._loop = loop or asyncio.get_event_loop()
+        self._executor = ProcessPoolExecutor(max_workers=1)
+        self.submit(('reset',))
+
+    def submit (self, step):
+        '''Run one step, return a future of its :data:`StepResult`
+
+        Steps are run in submission order.
+        '''
+
+        return self._loop.run_in_executor(self._executor, runStep, step)
+
+    def run (self, steps):
+        '''Run steps up to the first one that fails, return an
+           asynchronous iterator over their :data:`StepResult`, in
+           order, as they complete'''
+
+        return Progress(self, steps)
+
+    def load (self, filename):
+        return self.submit(('load', filename))
+
+    def analyze (self):
+        return self.submit(('analyze',))
+
+    def instantiate (self, root_system):
+        return self.submit(('instantiate', root_system))
+
+    def generate (self, generator):
+        '''Generate code, see :data:`ocarina.generate`'''
+
+        return self.submit(('generate', generator))
+
+    def check_theorem (self, theorem_name):
+        '''Evaluate a REAL theorem on the instantiated model, return a
+           future of the :data:`StepResult` of the evaluation, or of
+           the setting of the theorem if it failed'''
+
+        return self._loop.run_in_executor(
+            self._executor, runSteps,
+            [ ('set_real_theorem', theorem_name),
+              ('generate', ocarina.Backends.real_theorem) ])
+
+    def reset (self):
+        return self.submit(('reset',))
+
+    def close (self):
+        '''Stop the worker, after the pending steps'''
+
+        self._executor.shutdown(wait=True)
+
+################################################################################
+
+class Progress(object):
+    '''Asynchronous iterator over the results of the steps run by
+       :meth:`Session.run`. Each step is submitted once the previous
+       one has completed successfully.
+
+    The messages of a step come with its result, once it completes:
+    they are not streamed while the step runs.
+    '''
+
+    def __init__ (self, session, steps):
+        self._session = session
+        self._steps = list(steps)
+        self._next = 0
+        self._last = None
+
+    def __aiter__ (self):
+        return self
+
+    def __anext__ (self):
+        if self._last is not None and self._last.result().errors != []:
+            raise StopAsyncIteration
+        if self._next == len(self._steps):
+            raise StopAsyncIteration
+        step = self._steps[self._next]
+        self._next += 1
+        self._last = self._session.submit(step)
+        return self._last
+
+################################################################################
+
+_defaultSession = None
+
+def getDefaultSession ():
+    '''Return the session used by the module-level functions, created
+       on first use'''
+
+    global _defaultSession
+    if _defaultSession is None:
+        _defaultSession = Session()
+    return _defaultSession
+
+def generate (generator):
+    '''Generate code in the default session, see :data:`ocarina.generate`'''
+
+    return getDefaultSession().generate(generator)
+
+def check_theorem (theorem_name):
+    '''Evaluate a REAL theorem in the default session'''
+
+    return getDefaultSession().check_theorem(theorem_name)
+
+def run (steps):
+    '''Run steps in the default session, see :meth:`Session.run`'''
+
+    return getDefaultSession().run(steps)
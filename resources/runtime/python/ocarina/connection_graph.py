@@ -0,0 +1,140 @@
+#! /usr/bin/python
+'''
+:mod:`connection_graph` -- Local index of the connections of a model
+====================================================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module provides a read-only index of the connection instances
+of an AADL instance tree, as returned by :func:`lmp.getConnectionGraph`.
+
+'''
+
+################################################################################
+
+from array import array
+
+################################################################################
+
+class _Adjacency(object):
+    '''Edges grouped by key, in compressed form: the edges of the key
+    at position p are edges[start[p]:start[p + 1]]'''
+
+    __slots__ = ( 'positions', 'start', 'edges' )
+
+    def __init__ (self, keys):
+        self.positions = {}
+        counts = []
+        for key in keys:
+            p = self.positions.get(key)
+            if p is None:
+                p = len(counts)
+                self.positions[key] = p
+                counts.append(0)
+            counts[p] += 1
+
+        start = [ 0 ] * (len(counts) + 1)
+        for p in range(len(counts)):
+            start[p + 1] = start[p] + counts[p]
+        self.start = array('l', start)
+        self.edges = array('l', [ 0 ] * len(keys))
+        fill = start[:-1]
+        for e, key in enumerate(keys):
+            p = self.positions[key]
+            self.edges[fill[p]] = e
+            fill[p] += 1
+
+    def __call__ (self, key):
+        p = self.positions.get(key)
+        if p is None:
+            return self.edges[0:0]
+        return self.edges[self.start[p]:self.start[p + 1]]
+
+################################################################################
+
+class ConnectionGraph(object):
+    '''Connection instances of a model, stored as parallel arrays
+    indexed by edge number, with adjacency indexes by connection end
+    and by owning component.
+
+    Connection ends and components are designated by their node ids;
+    0 stands for a connection end with no owning component.
+    '''
+
+    __slots__ = ( 'connections', 'sources', 'destinations',
+                  'sourceComponents', 'destinationComponents',
+                  '_bySource', '_byDestination',
+                  '_bySourceComponent', '_byDestinationComponent' )
+
+    def __init__ (self, flat):
+        '''Build the graph from the flat list returned by the binding
+
+        :param flat: the list returned by libocarina_python.getConnectionGraph
+        '''
+
+        self.connections = array('l', flat[0::5])
+        self.sources = array('l', flat[1::5])
+        self.destinations = array('l', flat[2::5])
+        self.sourceComponents = array('l', flat[3::5])
+        self.destinationComponents = array('l', flat[4::5])
+
+        self._bySource = _Adjacency(self.sources)
+        self._byDestination = _Adjacency(self.destinations)
+        self._bySourceComponent = _Adjacency(self.sourceComponents)
+        self._byDestinationComponent = _Adjacency(self.destinationComponents)
+
+    def __len__ (self):
+        return len(self.connections)
+
+    def outgoing (self, end):
+        '''Return the edges whose source is the connection end end'''
+
+        return self._bySource(end)
+
+    def incoming (self, end):
+        '''Return the edges whose destination is the connection end end'''
+
+        return self._byDestination(end)
+
+    def destinationsOf (self, end):
+        '''Return the connection ends end is connected to'''
+
+        return [ self.destinations[e] for e in self._bySource(end) ]
+
+    def sourcesOf (self, end):
+        '''Return the connection ends connected to end'''
+
+        return [ self.sources[e] for e in self._byDestination(end) ]
+
+    def fanOut (self, component):
+        '''Return the edges leaving the features of component'''
+
+        return self._bySourceComponent(component)
+
+    def fanIn (self, component):
+        '''Return the edges reaching the features of component'''
+
+        return self._byDestinationComponent(component)
+
+    def reachable (self, start, components=False):
+        '''Return the set of connection ends reachable from start by
+        following connections, or of components if components is set.
+        start itself is included.'''
+
+        if components:
+            follow = self._bySourceComponent
+            targets = self.destinationComponents
+        else:
+            follow = self._bySource
+            targets = self.destinations
+
+        seen = set([ start ])
+        pending = [ start ]
+        while pending:
+            node = pending.pop()
+            for e in follow(node):
+                target = targets[e]
+                if target not in seen:
+                    seen.add(target)
+                    pending.append(target)
+        return seen
@@ -0,0 +1,94 @@
+#! /usr/bin/python
+'''
+:mod:`flow_latency` -- Latency bounds of end-to-end flows
+=========================================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module computes the latency bounds of end-to-end flows, as
+returned by :func:`lmp.analyzeEndToEndFlows`, from the Latency
+properties of their elements and of the connections between them.
+
+'''
+
+################################################################################
+
+from collections import namedtuple
+
+################################################################################
+
+TimeUnits = { 'ps'  : 1e-12,
+              'ns'  : 1e-9,
+              'us'  : 1e-6,
+              'ms'  : 1e-3,
+              'sec' : 1.0,
+              'min' : 60.0,
+              'hr'  : 3600.0 }
+'''Factors from the AADL_Project Time_Units to seconds'''
+
+################################################################################
+
+FlowLatency = namedtuple('FlowLatency', 'elements connections minimum maximum')
+'''Latency bounds of an end-to-end flow, in seconds. elements is the
+list of the flow elements, connections the list of the connections
+between consecutive elements, where one was found.'''
+
+def analyzeFlows (flows, latencyOf, connectionOf):
+    '''Compute the latency bounds of flows
+
+    :param flows: the flows, as lists of element ids
+    :param latencyOf: function returning the ( minimum , maximum )
+       latency of an element or connection id, or None
+    :param connectionOf: function returning the connection from an
+       element to the next one, or None
+
+    Return a list of :data:`FlowLatency`, in the order of flows.
+    '''
+
+    # Prefix tree of the flows: node 0 is the empty prefix, each other
+    # node a prefix identified by its parent and its last element
+
+    children = {}
+    minima = [ 0.0 ]
+    maxima = [ 0.0 ]
+    lastConnections = [ None ]
+
+    results = []
+    for elements in flows:
+        node = 0
+        previous = None
+        connections = []
+        for element in elements:
+            key = ( node, element )
+            child = children.get(key)
+            if child is None:
+                low = minima[node]
+                high = maxima[node]
+                bounds = latencyOf(element)
+                if bounds is not None:
+                    low += bounds[0]
+                    high += bounds[1]
+
+                connection = None
+                if previous is not None:
+                    connection = connectionOf(previous, element)
+                    if connection is not None:
+                        bounds = latencyOf(connection)
+                        if bounds is not None:
+                            low += bounds[0]
+                            high += bounds[1]
+
+                child = len(minima)
+                children[key] = child
+                minima.append(low)
+                maxima.append(high)
+                lastConnections.append(connection)
+
+            if lastConnections[child] is not None:
+                connections.append(lastConnections[child])
+            node = child
+            previous = element
+
+        results.append(FlowLatency(list(elements), connections,
+                                   minima[node], maxima[node]))
+    return results
@@ -0,0 +1,183 @@
+#! /usr/bin/python
+'''
+:mod:`instance_tree` -- Local snapshot of an AADL instance tree
+===============================================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module provides a read-only copy of an AADL instance tree, as
+returned by :func:`lmp.snapshotInstanceTree`.
+
+'''
+
+################################################################################
+
+from array import array
+
+Categories = ( 'abstract', 'data', 'subprogram', 'subprogram_group',
+               'thread', 'thread_group', 'process', 'memory', 'processor',
+               'virtual_processor', 'bus', 'virtual_bus', 'device', 'system',
+               'unknown' )
+'''AADL component categories, in the order of Ocarina's Component_Category'''
+
+################################################################################
+
+class InstanceTree(object):
+    '''Component instances of a model, stored as parallel arrays indexed
+    by position in depth-first pre-order. Position 0 is the root.
+
+    Names, classifier names and property names are stored once in a
+    string table; property values are stored once in a value table.
+    '''
+
+    __slots__ = ( 'ids', 'parents', 'categories', 'nameRefs',
+                  'classifierRefs', 'propertyStart', 'propertyNameRefs',
+                  'propertyValueRefs', 'strings', 'values', 'childStart',
+                  'childIndexes', 'subtreeSizes', '_positions' )
+
+    def __init__ (self, flat):
+        '''Build the tree from the flat list returned by the binding
+
+        :param flat: the list returned by libocarina_python.snapshotInstanceTree
+        '''
+
+        self.ids = array('l')
+        self.parents = array('l')
+        self.categories = array('b')
+        self.nameRefs = array('l')
+        self.classifierRefs = array('l')
+        self.propertyStart = array('l', [ 0 ])
+        self.propertyNameRefs = array('l')
+        self.propertyValueRefs = array('l')
+        self.strings = []
+        self.values = []
+
+        stringRefs = {}
+        valueRefs = {}
+
+        def intern (table, refs, item):
+            ref = refs.get(item)
+            if ref is None:
+                ref = len(table)
+                refs[item] = ref
+                table.append(item)
+            return ref
+
+        i = 0
+        while i < len(flat):
+            self.ids.append(int(flat[i]))
+            self.parents.append(flat[i + 1])
+            self.categories.append(flat[i + 2])
+            self.nameRefs.append(intern(self.strings, stringRefs, flat[i + 3]))
+            self.classifierRefs.append(
+                intern(self.strings, stringRefs, flat[i + 4]))
+            propertyCount = flat[i + 5]
+            i = i + 6
+            for p in range(propertyCount):
+                count = flat[i]
+                self.propertyNameRefs.append(
+                    intern(self.strings, stringRefs, flat[i + 1]))
+                self.propertyValueRefs.append(
+                    intern(self.values, valueRefs,
+                           tuple(flat[i + 2:i + 1 + count])))
+                i = i + 1 + count
+            self.propertyStart.append(len(self.propertyNameRefs))
+
+        # Children are stored in compressed form: the children of
+        # position p are childIndexes[childStart[p]:childStart[p + 1]]
+
+        counts = [ 0 ] * (len(self.ids) + 1)
+        for parent in self.parents:
+            if parent >= 0:
+                counts[parent + 1] += 1
+        for p in range(len(self.ids)):
+            counts[p + 1] += counts[p]
+        self.childStart = array('l', counts)
+        self.childIndexes = array('l', [ 0 ] * counts[-1])
+        fill = list(counts)
+        for p, parent in enumerate(self.parents):
+            if parent >= 0:
+                self.childIndexes[fill[parent]] = p
+                fill[parent] += 1
+
+        sizes = [ 1 ] * len(self.ids)
+        for p in range(len(self.ids) - 1, 0, -1):
+            sizes[self.parents[p]] += sizes[p]
+        self.subtreeSizes = array('l', sizes)
+
+        self._positions = None
+
+    def __len__ (self):
+        return len(self.ids)
+
+    def position (self, nodeId):
+        '''Return the position of the instance whose node id is nodeId'''
+
+        if self._positions is None:
+            self._positions = dict((n, p) for p, n in enumerate(self.ids))
+        return self._positions[int(nodeId)]
+
+    def nodeId (self, p):
+        return self.ids[p]
+
+    def parent (self, p):
+        '''Return the position of the parent of p, -1 for the root'''
+
+        return self.parents[p]
+
+    def children (self, p):
+        '''Return the positions of the children of p'''
+
+        return self.childIndexes[self.childStart[p]:self.childStart[p + 1]]
+
+    def category (self, p):
+        return Categories[self.categories[p]]
+
+    def name (self, p):
+        return self.strings[self.nameRefs[p]]
+
+    def fullName (self, p):
+        '''Return the names from the root down to p, separated by dots'''
+
+        names = []
+        while p >= 0:
+            names.append(self.strings[self.nameRefs[p]])
+            p = self.parents[p]
+        names.reverse()
+        return '.'.join(names)
+
+    def classifier (self, p):
+        return self.strings[self.classifierRefs[p]]
+
+    def properties (self, p):
+        '''Return the property associations of p, as a dictionary from
+        property name to the tuple of its values'''
+
+        result = {}
+        for j in range(self.propertyStart[p], self.propertyStart[p + 1]):
+            result[self.strings[self.propertyNameRefs[j]]] = \
+                self.values[self.propertyValueRefs[j]]
+        return result
+
+    def property (self, p, name, default=None):
+        '''Return the values of the property name of p, or default'''
+
+        for j in range(self.propertyStart[p], self.propertyStart[p + 1]):
+            if self.strings[self.propertyNameRefs[j]] == name:
+                return self.values[self.propertyValueRefs[j]]
+        return default
+
+    def subtree (self, p=0):
+        '''Iterate over the positions of the subtree rooted at p, in
+        depth-first pre-order'''
+
+        # Positions are in pre-order, so the subtree of p is the
+        # contiguous range of its size starting at p
+
+        return range(p, p + self.subtreeSizes[p])
+
+    def findAll (self, category):
+        '''Return the positions of all instances of the given category'''
+
+        c = Categories.index(category.lower())
+        return [ p for p, k in enumerate(self.categories) if k == c ]
@@ -17,8 +17,18 @@ try:
     import libocarina_python # Ocarina bindings
     import ocarina_me_aadl_aadl_instances_nodes as AIN
     import ocarina_me_aadl_aadl_tree_nodes as ATN
+except ImportError:
+    pass
+
+try:
     from ocarina_common_tools import *
+    from instance_tree import InstanceTree, Categories
+    from connection_graph import ConnectionGraph
+    from property_table import PropertyTable
+    from flow_latency import analyzeFlows, TimeUnits
     import io
+    import re
+    from collections import OrderedDict
 except ImportError:
     pass
 
@@ -224,6 +234,87 @@ def getInstances (category):
 
 ################################################################################
 
+ChunkSize = 4096
+'''Number of node ids transferred per call by the iterators'''
+
+def _iterSlices (f, arguments, chunkSize):
+    '''Yield the node ids returned by f (*arguments, first, chunkSize),
+    for first = 1, 1 + chunkSize, ... until a short chunk is returned'''
+
+    first = 1
+    while True:
+        result = runOcarinaFunction (f, *(arguments + (first, chunkSize)))
+        if result[3] != []:
+            raise RuntimeError (''.join (result[3]))
+        for nodeId in result[0]:
+            yield nodeId
+        if len (result[0]) < chunkSize:
+            return
+        first = first + chunkSize
+
+def iterComponentTypes (category, chunkSize=ChunkSize):
+    '''Iterate over the component types of the current AADL project,
+    as :data:`getComponentTypes`, transferring chunkSize ids at a time'''
+
+    return _iterSlices (libocarina_python.getComponentTypesSlice,
+                        (category,), chunkSize)
+
+def iterComponentImplementations (category, chunkSize=ChunkSize):
+    '''Iterate over the component implementations of the current AADL
+    project, as :data:`getComponentImplementations`, transferring
+    chunkSize ids at a time'''
+
+    return _iterSlices (libocarina_python.getComponentImplementationsSlice,
+                        (category,), chunkSize)
+
+def iterInstances (category, chunkSize=ChunkSize):
+    '''Iterate over the component instances of the current AADL
+    project, as :data:`getInstances`, transferring chunkSize ids at a
+    time
+
+    Memory use does not depend on the size of the model, and the
+    iteration may be stopped at any time. Errors raise RuntimeError.
+
+    >>> threads = sum (1 for t in iterInstances ('thread'))
+    '''
+
+    return _iterSlices (libocarina_python.getInstancesSlice,
+                        (category,), chunkSize)
+
+def iterSubtree (root, order='dfs', chunkSize=ChunkSize):
+    '''Iterate over the component instances of the subtree rooted at
+    root, root included, transferring chunkSize ids at a time
+
+    :param root: the id of a component instance, e.g. from :data:`getRoot`
+    :param order: 'dfs' for depth-first pre-order, 'bfs' for
+       breadth-first order
+
+    >>> for node in iterSubtree (getRoot ()[0], 'bfs'):
+    ...     print (getInstanceName (node)[0])
+    '''
+
+    if order not in ( 'dfs', 'bfs' ):
+        raise ValueError ('order must be dfs or bfs')
+    return _iterSubtree (root, order, chunkSize)
+
+def _iterSubtree (root, order, chunkSize):
+    '''Yield the node ids of the subtree rooted at root, each chunk
+    starting after the last node of the previous one'''
+
+    after = 0
+    while True:
+        result = runOcarinaFunction (libocarina_python.getSubtreeSlice,
+                                     root, order, after, chunkSize)
+        if result[3] != []:
+            raise RuntimeError (''.join (result[3]))
+        for nodeId in result[0]:
+            yield nodeId
+        if len (result[0]) < chunkSize:
+            return
+        after = result[0][-1]
+
+################################################################################
+
 def getComponentName (nodeId):
     '''Get the name of an AADL component
 
@@ -269,6 +360,53 @@ def getInstanceName (nodeId):
 
 ################################################################################
 
+def getComponentNames (nodeIds):
+    '''Get the names of several AADL components in one call
+
+    :param nodeIds: the list of ids of the components whose names are searched
+
+    Returns the list of names, in the order of nodeIds
+    '''
+
+    return runOcarinaFunction (libocarina_python.getComponentNames,
+                               toNodeIdList (nodeIds))
+
+################################################################################
+
+def getInstanceNames (nodeIds):
+    '''Get the names of several AADL instances in one call
+
+    :param nodeIds: the list of ids of the instances whose names are searched
+
+    For instance, to retrieve the names of all thread instances,
+    you may use the following
+
+    >>> getInstanceNames (getInstances ('thread')[0])
+    '''
+
+    return runOcarinaFunction (libocarina_python.getInstanceNames,
+                               toNodeIdList (nodeIds))
+
+################################################################################
+
+def getChildren (nodeIds):
+    '''Get the component instances of the subcomponents of several
+    AADL component instances in one call
+
+    :param nodeIds: the list of ids of the parent component instances
+
+    Returns one list of children per element of nodeIds, in the
+    order of their subcomponents; the id is 0 for a subcomponent
+    without a component instance
+    '''
+
+    result = runOcarinaFunction (libocarina_python.getChildren,
+                                 toNodeIdList (nodeIds))
+    result[0] = splitCountedList (result[0])
+    return result
+
+################################################################################
+
 def getNodeId (name):
     '''Get the Id of a component from its name
 
@@ -283,8 +421,294 @@ def getNodeId (name):
 
 ################################################################################
 
+def findNode (name):
+    '''Get the id of a component type, implementation or instance from
+    its fully qualified name
+
+    :param name: the name of a classifier, e.g. 'Pkg::Thread.impl', or
+       the path of a component instance, made of the name of the root
+       system instance and of the subcomponent names, e.g.
+       'root.proc.th1'
+
+    Returns None if there is no such node. Names are looked up in a
+    hash index built once per model, and compared case-insensitively.
+
+    >>> findNode ('RMAAadl::Task.impl_1')
+    '''
+
+    result = findNodes ([ name ])
+    if result[3] == []:
+        result[0] = result[0][0]
+    return result
+
+################################################################################
+
+def findNodes (names):
+    '''Get the ids of several components or instances from their fully
+    qualified names in one call, in the format of :data:`findNode`
+    '''
+
+    result = runOcarinaFunction (libocarina_python.findNodes, list (names))
+    if result[3] == []:
+        result[0] = [ nodeId or None for nodeId in result[0] ]
+    return result
+
+################################################################################
+
 def getRoot ():
     '''Get the Id of the current root instantiated model
     '''
 
     return runOcarinaFunction (libocarina_python.getRoot)
+
+################################################################################
+
+def snapshotInstanceTree (root):
+    '''Get a local, read-only copy of the component instance tree
+    rooted at root, transferred in one call
+
+    :param root: the id of the root component instance
+
+    Returns an :class:`instance_tree.InstanceTree`; all navigation in
+    it is done without calling Ocarina. For instance
+
+    >>> tree = snapshotInstanceTree (getRoot ()[0])[0]
+    >>> [ tree.fullName (p) for p in tree.findAll ('thread') ]
+    '''
+
+    result = runOcarinaFunction (libocarina_python.snapshotInstanceTree,
+                                 int (root))
+    if result[3] == []:
+        result[0] = InstanceTree (result[0])
+    return result
+
+################################################################################
+
+def getConnectionGraph ():
+    '''Get the connection instances of the instantiated model, as a
+    local index transferred in one call
+
+    Returns a :class:`connection_graph.ConnectionGraph`. For instance,
+    to list the ports feature is connected to:
+
+    >>> graph = getConnectionGraph ()[0]
+    >>> graph.destinationsOf (feature)
+    '''
+
+    result = runOcarinaFunction (libocarina_python.getConnectionGraph)
+    if result[3] == []:
+        result[0] = ConnectionGraph (result[0])
+    return result
+
+################################################################################
+
+def getEndToEndFlows ():
+    '''Get the end-to-end flows of the instantiated model
+
+    Returns a list of flows, each of them being the list of its
+    elements: ports, parameters, components and buses, in flow order.
+    '''
+
+    result = runOcarinaFunction (libocarina_python.getEndToEndFlows)
+    result[0] = splitCountedList (result[0])
+    return result
+
+################################################################################
+
+def analyzeEndToEndFlows ():
+    '''Compute the latency bounds of the end-to-end flows of the
+    instantiated model
+
+    Each flow is resolved into its elements and the connection
+    instances between them; its bounds are the sums of their Latency
+    properties. The properties of all elements are fetched in one
+    call, and prefixes shared by several flows are evaluated once.
+
+    Returns a list of :data:`flow_latency.FlowLatency`, sorted by
+    decreasing worst-case latency.
+
+    >>> for flow in analyzeEndToEndFlows ()[0][:10]:
+    ...     print (flow.maximum, getInstanceNames (flow.elements)[0])
+    '''
+
+    flows = getEndToEndFlows ()
+    if flows[3] != []:
+        return flows
+    graph = getConnectionGraph ()
+    if graph[3] != []:
+        return graph
+    graph = graph[0]
+
+    pairs = {}
+    def connectionOf (source, destination):
+        key = ( source, destination )
+        if key not in pairs:
+            pairs[key] = None
+            for e in graph.outgoing (source):
+                if graph.destinations[e] == destination:
+                    pairs[key] = graph.connections[e]
+                    break
+        return pairs[key]
+
+    nodes = set (graph.connections)
+    for elements in flows[0]:
+        nodes.update (elements)
+    nodes = list (nodes)
+
+    values = runOcarinaFunction (libocarina_python.getTypedPropertyValues,
+                                 nodes, 'latency')
+    if values[3] != []:
+        return values
+
+    # Time values are returned in ps, the base unit of Time_Units
+
+    scale = TimeUnits['ps']
+    latencies = {}
+    for node, value in zip (nodes, decodeTypedValues (values[0])):
+        if isinstance (value, tuple):
+            latencies[node] = ( value[0] * scale, value[1] * scale )
+        elif value is not None:
+            latencies[node] = ( value * scale, value * scale )
+
+    result = analyzeFlows (flows[0], latencies.get, connectionOf)
+    result.sort (key=lambda flow: flow.maximum, reverse=True)
+    flows[0] = result
+    return flows
+
+################################################################################
+
+def getPropertyTable (category, properties, chunkSize=ChunkSize):
+    '''Get the values of a list of properties for all the component
+    instances of a category, as a column-oriented table
+
+    :param category: one of the AADL category defined in the standard,
+       or 'all'
+    :param properties: the names of the properties
+    :param chunkSize: number of instances per call to libocarina
+
+    Returns a :class:`property_table.PropertyTable`, with one row per
+    instance, built with len (properties) calls to libocarina per
+    chunk of instances. For instance, to get the periods of all
+    threads as a NumPy array:
+
+    >>> table = getPropertyTable ('thread', [ 'period', 'deadline' ])[0]
+    >>> periods = table.toNumpy ()['period']
+    '''
+
+    result = getInstances (category)
+    if result[3] != []:
+        return result
+    ids = result[0] or []
+
+    columns = [ [] for name in properties ]
+    for first in range (0, len (ids), chunkSize):
+        chunk = ids[first:first + chunkSize]
+        for column, name in zip (columns, properties):
+            values = runOcarinaFunction \
+                (libocarina_python.getTypedPropertyValues, chunk, name)
+            if values[3] != []:
+                return values
+            column.extend (decodeTypedValues (values[0]))
+
+    result[0] = PropertyTable (ids, properties, columns)
+    return result
+
+################################################################################
+
+_queryStep = re.compile(r'\s*(//|/)?\s*(\*|"[^"]*"|\'[^\']*\''
+                       r'|[A-Za-z_][A-Za-z0-9_.]*)(\s*\(\s*\))?\s*')
+_queryPredicate = re.compile(r'\[\s*([A-Za-z_][A-Za-z0-9_:]*)\s*'
+                             r'(?:(!=|=)\s*("[^"]*"|[^\]]*?)\s*)?\]\s*')
+_queryCategories = frozenset (c for c in Categories if c != 'unknown')
+_compiledQueries = OrderedDict ()
+_QueryCacheSize = 256
+
+def _compileQuery (query):
+    '''Compile a path expression into the flat list of steps passed
+    to libocarina_python.selectInstances, see :func:`select`'''
+
+    if query in _compiledQueries:
+        return _compiledQueries[query]
+
+    program = []
+    position = 0
+    while position < len (query):
+        step = _queryStep.match (query, position)
+        if step is None or (program != [] and step.group (1) is None):
+            raise ValueError ('invalid query at position %d: %s'
+                              % (position, query))
+        separator, test, call = step.groups ()
+        quoted = test[0] in '"\''
+        test = test.strip ('"\'').lower ()
+        position = step.end ()
+        if quoted and call is not None or quoted and test == '':
+            raise ValueError ('invalid query at position %d: %s'
+                              % (position, query))
+
+        if program == []:
+            program.append ('descendant' if separator == '//' else 'self')
+        else:
+            program.append ('descendant' if separator == '//' else 'child')
+        if quoted:
+            program.extend ([ 'name', test ])
+        elif test in _queryCategories:
+            program.extend ([ 'category', test ])
+        elif call is not None:
+            raise ValueError ('unknown category %s in query: %s'
+                              % (test, query))
+        elif test == '*':
+            program.extend ([ '*', '' ])
+        else:
+            program.extend ([ 'name', test ])
+
+        predicates = []
+        predicate = _queryPredicate.match (query, position)
+        while predicate is not None:
+            prop, operator, value = predicate.groups ()
+            if operator is None:
+                predicates.extend ([ 'has', prop.lower (), '' ])
+            else:
+                predicates.extend ([ operator, prop.lower (),
+                                     value.strip ('"') ])
+            position = predicate.end ()
+            predicate = _queryPredicate.match (query, position)
+        program.append (len (predicates) // 3)
+        program.extend (predicates)
+
+    if program == []:
+        raise ValueError ('empty query')
+    if len (_compiledQueries) >= _QueryCacheSize:
+        _compiledQueries.popitem (last=False)
+    _compiledQueries[query] = program
+    return program
+
+def select (query):
+    '''Select component instances with a path expression, evaluated by
+    Ocarina in one call
+
+    :param query: a list of steps separated by '/', to select the
+       subcomponents of the instances selected by the previous step,
+       or by '//', to select all their descendants. The first step
+       applies to the root system instance, or to all instances if it
+       starts with '//'.
+
+    A step is a category (e.g. thread, or thread()), a subcomponent
+    name, or '*', followed by predicates on properties. A name that is
+    also a category, e.g. a subcomponent called system, is quoted:
+    "system" or 'system'. Predicates are:
+    [Prop] if Prop is defined, [Prop=Value] if one of the values of
+    Prop is Value, [Prop!=Value] otherwise. Values are compared,
+    ignoring case, with the strings returned by
+    :data:`getPropertyValueByName`, e.g. Periodic or "10 ms".
+
+    Returns the ids of the instances selected by the last step.
+    Invalid queries raise ValueError.
+
+    >>> select ('system//process/thread[Dispatch_Protocol=Periodic]')
+    >>> select ('//thread[Priority]')
+    >>> select ('*/cpu')
+    >>> select ('*/"device"')
+    '''
+
+    return runOcarinaFunction (libocarina_python.selectInstances,
+                               _compileQuery (query))
@@ -0,0 +1,251 @@
+#! /usr/bin/python
+'''
+:mod:`model_generator` -- Synthetic AADL models for scaling tests
+=================================================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module writes valid AADLv2 models of arbitrary size, to measure
+how loading, instantiation and queries scale. Random choices are drawn
+from a seeded generator: the same parameters give the same model.
+
+'''
+
+################################################################################
+
+import os
+import random
+
+################################################################################
+
+_propertyKinds = ( 'Period', 'Deadline', 'Compute_Execution_Time',
+                   'Priority', 'Dispatch_Offset', 'Source_Stack_Size' )
+'''Properties associated to the thread subcomponents, in this order'''
+
+_periods = ( 10, 20, 25, 50, 100, 200, 500, 1000 )
+
+def _propertyValue (kind, period, rng):
+    '''Return the image of a value of property kind for a thread of
+       period period, in ms'''
+
+    if kind in ( 'Period', 'Deadline' ):
+        return '%d ms' % period
+    if kind == 'Compute_Execution_Time':
+        low = rng.randint(1, max(1, period // 20))
+        return '%d ms .. %d ms' % (low, 2 * low)
+    if kind == 'Priority':
+        return '%d' % rng.randint(1, 255)
+    if kind == 'Dispatch_Offset':
+        return '%d ms' % rng.randint(0, period - 1)
+    return '%d KByte' % rng.choice(( 4, 8, 16, 32, 64 ))
+
+################################################################################
+
+def _writeFile (path, lines):
+    '''Write the lines produced by the iterator lines to path'''
+
+    with open(path, 'w') as f:
+        for line in lines:
+            f.write(line)
+            f.write('\n')
+
+def _typesPackage (name, threadTypes, ports, flows):
+    yield 'package %s_Types' % name
+    yield 'public'
+    yield ''
+    yield '  data Msg'
+    yield '  end Msg;'
+    yield ''
+    yield '  processor CPU'
+    yield '  end CPU;'
+
+    for t in range(threadTypes):
+        yield ''
+        yield '  thread Worker_%d' % t
+        yield '  features'
+        for p in range(ports):
+            yield '    i%d : in event data port Msg;' % p
+            yield '    o%d : out event data port Msg;' % p
+        if flows > 0:
+            yield '  flows'
+            yield '    fsrc : flow source o0;'
+            yield '    fpath : flow path i0 -> o0;'
+            yield '    fsnk : flow sink i0;'
+        yield '  properties'
+        yield '    Dispatch_Protocol => Periodic;'
+        yield '  end Worker_%d;' % t
+        yield ''
+        yield '  thread implementation Worker_%d.impl' % t
+        yield '  end Worker_%d.impl;' % t
+
+    yield ''
+    yield 'end %s_Types;' % name
+
+def _processPackage (name, index, rng, threadTypes, threads, ports,
+                     connections, flows, flowLength, modes, properties):
+    process = 'Node_%d' % index
+    yield 'package %s_Process_%d' % (name, index)
+    yield 'public'
+    yield '  with %s_Types;' % name
+    yield ''
+    yield '  process %s' % process
+    if modes > 1:
+        yield '  features'
+        yield '    switch : in event port;'
+    yield '  end %s;' % process
+    yield ''
+    yield '  process implementation %s.impl' % process
+
+    if threads > 0:
+        yield '  subcomponents'
+        for t in range(threads):
+            yield '    t%d : thread %s_Types::Worker_%d.impl;' \
+                % (t, name, rng.randrange(threadTypes))
+
+    # Connections: first a chain t0 -> t1 -> ... on ports i0/o0,
+    # used by the flows, then random links on the other ports
+
+    chain = max(0, min(threads - 1, connections))
+    if connections > 0 and threads > 1:
+        yield '  connections'
+        for c in range(chain):
+            yield '    ch%d : port t%d.o0 -> t%d.i0;' % (c, c, c + 1)
+        for c in range(connections - chain):
+            source = rng.randrange(threads)
+            destination = rng.randrange(threads - 1)
+            if destination >= source:
+                destination += 1
+            port = rng.randrange(1, ports) if ports > 1 else 0
+            yield '    cx%d : port t%d.o%d -> t%d.i%d;' \
+                % (c, source, port, destination, port)
+
+    if flows > 0 and chain > 0:
+        yield '  flows'
+        for f in range(flows):
+            length = min(flowLength, chain)
+            first = rng.randint(0, chain - length)
+            elements = [ 't%d.fsrc' % first ]
+            for c in range(first, first + length):
+                elements.append('ch%d' % c)
+                if c + 1 < first + length:
+                    elements.append('t%d.fpath' % (c + 1))
+            elements.append('t%d.fsnk' % (first + length))
+            yield '    e%d : end to end flow %s;' % (f, ' -> '.join(elements))
+
+    if modes > 1:
+        yield '  modes'
+        yield '    m0 : initial mode;'
+        for m in range(1, modes):
+            yield '    m%d : mode;' % m
+        for m in range(modes):
+            yield '    m%d -[ switch ]-> m%d;' % (m, (m + 1) % modes)
+
+    if properties > 0 and threads > 0:
+        yield '  properties'
+        kinds = _propertyKinds[:properties]
+        for t in range(threads):
+            period = rng.choice(_periods)
+            for kind in kinds:
+                yield '    %s => %s applies to t%d;' \
+                    % (kind, _propertyValue(kind, period, rng), t)
+
+    yield '  end %s.impl;' % process
+    yield ''
+    yield 'end %s_Process_%d;' % (name, index)
+
+def _rootPackage (name, systems, processes):
+    yield 'package %s_Root' % name
+    yield 'public'
+    yield '  with %s_Types;' % name
+    for p in range(processes):
+        yield '  with %s_Process_%d;' % (name, p)
+    yield ''
+    yield '  system Sub'
+    yield '  end Sub;'
+    yield ''
+    yield '  system implementation Sub.impl'
+    yield '  subcomponents'
+    yield '    cpu : processor %s_Types::CPU;' % name
+    for p in range(processes):
+        yield '    p%d : process %s_Process_%d::Node_%d.impl;' % (p, name, p, p)
+    if processes > 0:
+        yield '  properties'
+        yield '    Actual_Processor_Binding => (reference (cpu)) applies to %s;' \
+            % ', '.join('p%d' % p for p in range(processes))
+    yield '  end Sub.impl;'
+    yield ''
+    yield '  system Root'
+    yield '  end Root;'
+    yield ''
+    yield '  system implementation Root.impl'
+    yield '  subcomponents'
+    for s in range(systems):
+        yield '    s%d : system Sub.impl;' % s
+    yield '  end Root.impl;'
+    yield ''
+    yield 'end %s_Root;' % name
+
+################################################################################
+
+def generateModel (directory, name='Synthetic', systems=1, processes=1,
+                   threads=10, threadTypes=10, ports=2, connections=None,
+                   flows=0, flowLength=4, modes=0, properties=2, seed=0):
+    '''Write a synthetic AADL model to directory
+
+    :param directory: directory of the AADL files, created if needed
+    :param name: prefix of the package names
+    :param systems: number of system instances in the root system,
+       all of the same implementation
+    :param processes: number of processes per system; each process
+       has its own implementation, in its own package
+    :param threads: number of threads per process
+    :param threadTypes: number of distinct thread types
+    :param ports: number of in and of out ports per thread type
+    :param connections: number of port connections per process,
+       threads - 1 by default
+    :param flows: number of end-to-end flows per process
+    :param flowLength: number of connections of each flow
+    :param modes: number of modes per process, none if less than 2
+    :param properties: number of property associations per thread,
+       at most 6
+    :param seed: seed of the random choices
+
+    Returns the pair ( files , root ), where files is the list of the
+    written files, in an order suitable for :func:`ocarina.load_many`,
+    and root the name of the root system, to pass to
+    :func:`ocarina.instantiate`. The model has systems * processes
+    * threads thread instances.
+
+    >>> files, root = generateModel ("/tmp/big", systems=10,
+    ...                              processes=10, threads=1000)
+    >>> load_many (files)
+    >>> instantiate (root)
+    '''
+
+    if connections is None:
+        connections = max(0, threads - 1)
+    threadTypes = max(1, threadTypes)
+    ports = max(1, ports)
+    properties = min(properties, len(_propertyKinds))
+
+    rng = random.Random(seed)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    def path (package):
+        return os.path.join(directory, package.lower() + '.aadl')
+
+    files = [ path('%s_Types' % name) ]
+    _writeFile(files[-1], _typesPackage(name, threadTypes, ports, flows))
+
+    for p in range(processes):
+        files.append(path('%s_Process_%d' % (name, p)))
+        _writeFile(files[-1],
+                   _processPackage(name, p, rng, threadTypes, threads,
+                                   ports, connections, flows, flowLength,
+                                   modes, properties))
+
+    files.append(path('%s_Root' % name))
+    _writeFile(files[-1], _rootPackage(name, systems, processes))
+
+    return files, 'root.impl'
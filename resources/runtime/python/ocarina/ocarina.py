@@ -16,8 +16,14 @@ try:
     import libocarina_python # Ocarina bindings
     import ocarina_me_aadl_aadl_instances_nodes as AIN
     import ocarina_me_aadl_aadl_tree_nodes as ATN
+except ImportError:
+    pass
+
+try:
     from ocarina_common_tools import *
     import io
+    import os
+    from collections import namedtuple
 except ImportError:
     pass
 
@@ -29,9 +35,92 @@ def version ():
     libocarina_python.version()
 
 ################################################################################
+Phases = ( 'load', 'analysis', 'instantiation', 'generation' )
+'''Processing phases timed by Ocarina, see :data:`status`'''
+
 def status ():
-    '''Print Ocarina status'''
+    '''Print Ocarina status, and return a report on the current session
+
+    The report is a dictionary with the following entries:
+
+    * phases: for each of :data:`Phases`, the number of runs since
+      the last :data:`reset` and the total time they took, in seconds
+    * names: the number of names and of characters in the name table
+    * nodes: the number of nodes of each kind in the declarative and
+      instance trees
+    * peak_memory: the peak resident memory of the process, in
+      bytes, or None if it is not available
+
+    >>> status ()['phases']['instantiation']
+    {'count': 1, 'time': 0.42}
+    '''
+
     libocarina_python.status()
+    values = libocarina_python.getStatus()
+
+    report = { 'phases' : {}, 'nodes' : {} }
+    for i, phase in enumerate (Phases):
+        report['phases'][phase] = { 'count' : values[2 * i],
+                                    'time' : float (values[2 * i + 1]) }
+    i = 2 * len (Phases)
+    report['names'] = { 'entries' : values[i],
+                        'characters' : values[i + 1] }
+    i = i + 2
+    for tree in ( 'declarative', 'instance' ):
+        count = values[i]
+        kinds = values[i + 1:i + 1 + 2 * count]
+        report['nodes'][tree] = dict (
+            (kind.lower()[2:], number)
+            for kind, number in zip (kinds[0::2], kinds[1::2]))
+        i = i + 1 + 2 * count
+    report['peak_memory'] = _peakMemory ()
+    return report
+
+def _peakMemory ():
+    '''Return the peak resident memory of the process, in bytes'''
+
+    try:
+        import resource
+        import sys
+    except ImportError:
+        return None
+    peak = resource.getrusage (resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak = peak * 1024     # kilobytes on Linux
+    return peak
+
+################################################################################
+_profile = None
+
+def enable_stats (enabled=True):
+    '''Start or stop recording the calls made to Ocarina, see
+    :data:`stats`'''
+
+    global _profile
+    if _profile is None:
+        _profile = Profile()
+    if enabled:
+        _profile.start()
+    else:
+        _profile.stop()
+
+def stats ():
+    '''Return the statistics of the calls made to Ocarina since
+    :data:`enable_stats`, as a dictionary from function name to the
+    number of calls, their total, mean, percentile and maximum wall
+    time and the bytes they wrote on stdout and stderr.
+
+    To profile a part of a script only, use a
+    :class:`ocarina_common_tools.Profile`:
+
+    >>> with Profile () as profile:
+    ...     analyze ()
+    >>> profile.dump (open ("profile.json", "w"))
+    '''
+
+    if _profile is None:
+        return {}
+    return _profile.report()
 
 ################################################################################
 def reset ():
@@ -41,6 +130,24 @@ def reset ():
     models.'''
 
     libocarina_python.reset()
+    _session.clear()
+
+################################################################################
+class _Session(object):
+    '''Files loaded since the last reset, see :data:`load_many`'''
+
+    def __init__ (self):
+        self.clear()
+
+    def clear (self):
+        self.files = set()          # resolved paths of the loaded files
+
+    def addFile (self, filename):
+        path = _resolvedPath (filename)
+        if path is not None:
+            self.files.add (path)
+
+_session = _Session()
 
 ################################################################################
 def load (filename):
@@ -54,7 +161,50 @@ def load (filename):
     >>> load("foo.aadl")
 
     '''
-    return runOcarinaFunction (libocarina_python.load, filename)
+    result = runOcarinaFunction (libocarina_python.load, filename)
+    if result[3] == []:
+        _session.addFile (filename)
+    return result
+
+################################################################################
+def _resolvedPath (filename):
+    '''Return the canonical path of filename, or None if it is not a
+       path to a file (e.g. a file to be found on the Ocarina search
+       path)'''
+
+    if not os.path.isfile (filename):
+        return None
+    return os.path.normcase (os.path.realpath (filename))
+
+def load_many (filenames):
+    '''Load several files, in one call to Ocarina
+
+    :param filenames: names of the files to be loaded, using Ocarina
+       search path
+    :type filenames: list of strings
+
+    Files already loaded since the last :data:`reset`, under the same
+    or another path to the same file, are skipped.
+
+    >>> load_many(["foo.aadl", "bar.aadl"])
+
+    '''
+
+    toLoad = []
+    paths = set()
+    for filename in filenames:
+        path = _resolvedPath (filename)
+        if path is not None:
+            if path in _session.files or path in paths:
+                continue
+            paths.add (path)
+        toLoad.append (filename)
+
+    result = runOcarinaFunction (libocarina_python.loadMany, toLoad)
+    if result[3] == []:
+        for filename in toLoad:
+            _session.addFile (filename)
+    return result
 
 ################################################################################
 def analyze ():
@@ -95,6 +245,41 @@ def add_real_library (libraryname):
 
     return runOcarinaFunction (libocarina_python.add_real_library, libraryname)
 
+################################################################################
+TheoremResult = namedtuple ('TheoremResult', 'passed values')
+'''Result of a REAL theorem, see :data:`check_theorems`'''
+
+def check_theorems (theorem_names):
+    '''Evaluate several REAL theorems on the instantiated model, in
+       one run of the REAL backend
+
+    :param theorem_names: names of the theorems, from the REAL libraries
+    :type theorem_names: list of strings
+
+    Returns a dictionary from theorem name to :data:`TheoremResult`,
+    whose values field maps the name of each element of the range
+    set to its result. Theorems not found in the REAL libraries are
+    reported as errors.
+
+    >>> add_real_library ("periodicity.real")
+    >>> check_theorems (["check_period", "check_deadline"])[0]["check_period"].passed
+
+    '''
+
+    result = runOcarinaFunction (libocarina_python.check_theorems,
+                                 list (theorem_names))
+    theorems = {}
+    values = result[0] or []
+    i = 0
+    while i < len (values):
+        count = values[i + 2]
+        elements = values[i + 3:i + 3 + 2 * count]
+        theorems[values[i]] = TheoremResult (
+            values[i + 1], dict (zip (elements[0::2], elements[1::2])))
+        i = i + 3 + 2 * count
+    result[0] = theorems
+    return result
+
 ################################################################################
 Backends = Enum ([ "polyorb_hi_ada", "polyorb_hi_c", "real_theorem"])
 '''List of supported backends, used by :data:`generate`'''
@@ -129,6 +314,56 @@ def getPropertyValueByName (nodeId,propertyString):
 
 ################################################################################
 
+def getPropertyValues (nodeIds,propertyString):
+    '''Get the values of the property propertyString applied to each
+       model element of nodeIds, in one call.
+
+       Returns one list per element of nodeIds, in the format of
+       :data:`getPropertyValueByName`
+    '''
+    result = runOcarinaFunction (libocarina_python.getPropertyValues,
+                                 toNodeIdList (nodeIds), propertyString)
+    result[0] = splitCountedList (result[0])
+    return result
+
+################################################################################
+
+def getTypedPropertyValue (nodeId,propertyString):
+    '''Get the value of the property propertyString applied to model
+       element nodeId, as a Python value rather than as strings.
+
+       Integer and real numbers are returned as int and float, in the
+       base unit of their units type (e.g. ps for Time, bits for
+       Size); ranges as :data:`Range` pairs ( low , high ); lists as
+       tuples; strings and enumeration literals as strings; references
+       and classifiers as node ids. The value is None if the property is not defined.
+
+       >>> getTypedPropertyValue (thread, 'period')[0]
+       10000000000
+       >>> getTypedPropertyValue (thread, 'compute_execution_time')[0]
+       Range(low=1000000000, high=2000000000)
+    '''
+    result = getTypedPropertyValues ([ nodeId ], propertyString)
+    if result[3] == []:
+        result[0] = result[0][0]
+    return result
+
+################################################################################
+
+def getTypedPropertyValues (nodeIds,propertyString):
+    '''Get the values of the property propertyString applied to each
+       model element of nodeIds, in one call.
+
+       Returns one value per element of nodeIds, in the format of
+       :data:`getTypedPropertyValue`
+    '''
+    result = runOcarinaFunction (libocarina_python.getTypedPropertyValues,
+                                 toNodeIdList (nodeIds), propertyString)
+    result[0] = decodeTypedValues (result[0])
+    return result
+
+################################################################################
+
 def getSourcePorts (feature_nodeId):
     '''Get the source port associated to the feature_nodeId passed as
        parameter, in the case feature_nodeId participates in a
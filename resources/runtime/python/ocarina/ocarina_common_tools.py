@@ -11,13 +11,17 @@ Tools used by Python binding to the Ocarina AADL processor
 
 try:
     import sys
-    import StringIO
     from contextlib import contextmanager
     import ctypes
     import io
     import os
     import tempfile
     import platform
+    import atexit
+    import re
+    import json
+    import time
+    from collections import namedtuple
 
 except ImportError:
     pass
@@ -28,21 +32,372 @@ def runOcarinaFunction (f, *parameters):
        the redirections
     '''
 
-    info = io.BytesIO()
-    error = io.BytesIO()
+    if _quietDepth > 0:
+        return runOcarinaQuery (f, *parameters)
+    if _activeProfiles:
+        return _profiledFunction (f, parameters)
+
+    raisedError = []
+    res = ''
+    session = getCaptureSession()
+    session.begin()
+    try:
+        res = f (*parameters)
+    except:
+        raisedError.append(getErrorMessage())
+    finally:
+        info, error = session.end()
+    return OcarinaResult (res, info, error, raisedError)
+
+def _profiledFunction (f, parameters):
+    '''runOcarinaFunction, recording the call in the active profiles'''
+
     raisedError = []
     res = ''
-    with std_redirector(info,error):
+    start = _clock()
+    session = getCaptureSession()
+    session.begin()
+    try:
+        callStart = _clock()
         try:
             res = f (*parameters)
-        except:
-            raisedError.append(getErrorMessage())
-    stderrMsg = sortStderrMessages(error.getvalue().decode('utf-8'))
-    stdoutMsg = sortStdoutMessages (info.getvalue().decode('utf-8'))
+        finally:
+            callEnd = _clock()
+    except:
+        raisedError.append(getErrorMessage())
+    finally:
+        info, error = session.end()
+    end = _clock()
+    _record(f, end - start, callEnd - callStart, len(info), len(error))
+    return OcarinaResult (res, info, error, raisedError)
+
+################################################################################
+def runOcarinaQuery (f, *parameters):
+    '''Wrapper to run an Ada function provided by Ocarina in "quiet"
+       mode: stdout and stderr are not captured, and the messages of
+       the result are always empty. It is only used when requested,
+       through :func:`quiet` or by a direct call.
+    '''
+
+    raisedError = []
+    res = ''
+    if _activeProfiles:
+        start = _clock()
+    try:
+        res = f (*parameters)
+    except:
+        raisedError.append(getErrorMessage())
+    if _activeProfiles:
+        elapsed = _clock() - start
+        _record(f, elapsed, elapsed, 0, 0)
+    return OcarinaResult (res, b'', b'', raisedError)
+
+_quietDepth = 0
+
+@contextmanager
+def quiet ():
+    '''Run the calls of the block in "quiet" mode, see
+       :func:`runOcarinaQuery`
+
+    Messages written by Ocarina in the block are not captured: they
+    go to the terminal. It saves the redirection of stdout and stderr
+    on long sequences of accessors, e.g. when walking a large
+    instance tree.
+
+    >>> with quiet():
+    ...     names = [ lmp.getInstanceName(n)[0] for n in nodes ]
+    '''
+
+    global _quietDepth
+    _quietDepth += 1
+    try:
+        yield
+    finally:
+        _quietDepth -= 1
+
+################################################################################
+
+_clock = getattr(time, 'perf_counter', time.time)
+
+class _CallStats(object):
+    '''Calls to one function of the binding, see :class:`Profile`'''
+
+    __slots__ = ( 'times', 'callTime', 'stdoutBytes', 'stderrBytes' )
+
+    def __init__ (self):
+        self.times = []
+        self.callTime = 0.0
+        self.stdoutBytes = 0
+        self.stderrBytes = 0
+
+    def report (self):
+        times = sorted(self.times)
+        total = sum(times)
+
+        def percentile (p):
+            return times[min(len(times) - 1, int(p * len(times) / 100.0))]
+
+        return { 'calls' : len(times),
+                 'total' : total,
+                 'mean' : total / len(times),
+                 'p50' : percentile(50),
+                 'p90' : percentile(90),
+                 'p99' : percentile(99),
+                 'max' : times[-1],
+                 'call_time' : self.callTime,
+                 'overhead' : total - self.callTime,
+                 'stdout_bytes' : self.stdoutBytes,
+                 'stderr_bytes' : self.stderrBytes }
+
+class Profile(object):
+    '''Wall time spent in the functions of the binding.
+
+    While a profile is active, each call made through
+    :func:`runOcarinaFunction` or :func:`runOcarinaQuery` is recorded
+    under the name of the called function: its wall time, the part
+    of it spent in the function itself, the rest being the cost of
+    the redirection of stdout and stderr, and the number of bytes
+    captured on each stream. Several profiles may be active at once.
+
+    >>> with Profile() as profile:
+    ...     load("foo.aadl")
+    >>> profile.dump(open("profile.json", "w"))
+    '''
+
+    def __init__ (self):
+        self.calls = {}
+
+    def start (self):
+        '''Start recording calls'''
+
+        if self not in _activeProfiles:
+            _activeProfiles.append(self)
+
+    def stop (self):
+        '''Stop recording calls'''
+
+        if self in _activeProfiles:
+            _activeProfiles.remove(self)
+
+    def clear (self):
+        '''Forget the recorded calls'''
+
+        self.calls = {}
+
+    def __enter__ (self):
+        self.start()
+        return self
 
-    if stderrMsg[1]!=[]:
-        raisedError.append(stderrMsg[1])
-    return [ res , stdoutMsg, stderrMsg[0], raisedError ]
+    def __exit__ (self, *exc_info):
+        self.stop()
+        return False
+
+    def record (self, name, elapsed, callTime, stdoutBytes, stderrBytes):
+        stats = self.calls.get(name)
+        if stats is None:
+            stats = self.calls[name] = _CallStats()
+        stats.times.append(elapsed)
+        stats.callTime += callTime
+        stats.stdoutBytes += stdoutBytes
+        stats.stderrBytes += stderrBytes
+
+    def report (self):
+        '''Return a dictionary from function name to its statistics:
+           number of calls, total, mean, percentile and maximum wall
+           time, time spent in the function and redirection overhead,
+           in seconds, and captured bytes'''
+
+        return dict((name, stats.report())
+                    for name, stats in self.calls.items())
+
+    def dump (self, stream):
+        '''Write the report as JSON to stream'''
+
+        json.dump(self.report(), stream, indent=2, sort_keys=True)
+
+_activeProfiles = []
+
+def _record (f, elapsed, callTime, stdoutBytes, stderrBytes):
+    name = getattr(f, '__name__', repr(f))
+    for profile in _activeProfiles:
+        profile.record(name, elapsed, callTime, stdoutBytes, stderrBytes)
+
+################################################################################
+
+class OcarinaResult(object):
+    '''Result of a call to Ocarina.
+
+    It behaves as the list [ res , stdoutMsg, stderrMsg, raisedError ]
+    returned by previous versions of the binding, where res is the
+    value returned by the function, stdoutMsg the messages written on
+    stdout, stderrMsg the warnings and raisedError the errors.
+
+    The captured messages are kept as bytes; they are decoded and
+    sorted only when first accessed.
+    '''
+
+    __slots__ = ( 'value', '_stdoutBytes', '_stderrBytes', '_exceptions',
+                  '_stdout', '_stderr' )
+
+    def __init__ (self, value, stdoutBytes, stderrBytes, exceptions):
+        self.value = value
+        self._stdoutBytes = stdoutBytes
+        self._stderrBytes = stderrBytes
+        self._exceptions = exceptions
+        self._stdout = None
+        self._stderr = None
+
+    @property
+    def stdout (self):
+        '''Messages written on stdout, as [ lines ]'''
+
+        if self._stdout is None:
+            self._stdout = sortStdoutMessages(
+                self._stdoutBytes.decode('utf-8'))
+        return self._stdout
+
+    def _sortedStderr (self):
+        if self._stderr is None:
+            self._stderr = sortStderrMessages(
+                self._stderrBytes.decode('utf-8'))
+        return self._stderr
+
+    @property
+    def warnings (self):
+        '''Warning messages written on stderr'''
+
+        return self._sortedStderr()[0]
+
+    @property
+    def errors (self):
+        '''Raised errors, followed by the list of error messages
+        written on stderr, if any'''
+
+        errors = list(self._exceptions)
+        if self._sortedStderr()[1] != []:
+            errors.append(self._sortedStderr()[1])
+        return errors
+
+    @property
+    def diagnostics (self):
+        '''Messages written on stderr, as a list of :data:`Diagnostic`'''
+
+        return parseDiagnostics(self._stderrBytes.decode('utf-8'))
+
+    def __getitem__ (self, index):
+        if index == 0 or index == -4:
+            return self.value
+        if index == 1 or index == -3:
+            return self.stdout
+        if index == 2 or index == -2:
+            return self.warnings
+        if index == 3 or index == -1:
+            return self.errors
+        if isinstance(index, slice):
+            return list(self)[index]
+        raise IndexError('result index out of range')
+
+    def __setitem__ (self, index, value):
+        if index != 0:
+            raise IndexError('only the result value can be replaced')
+        self.value = value
+
+    def __len__ (self):
+        return 4
+
+    def __iter__ (self):
+        yield self.value
+        yield self.stdout
+        yield self.warnings
+        yield self.errors
+
+    def __eq__ (self, other):
+        if not isinstance(other, (OcarinaResult, list, tuple)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__ (self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return NotImplemented
+        return not equal
+
+    __hash__ = None
+
+    def __repr__ (self):
+        return repr(list(self))
+
+################################################################################
+
+def toNodeIdList (nodeIds):
+    '''Convert a list of node ids to the integer list expected by the
+       batched functions of the binding
+    '''
+
+    return [ int(n) for n in nodeIds ]
+
+def splitCountedList (values):
+    '''Split a flat list made of groups "count, item_1 .. item_count",
+       as returned by the batched functions, into a list of lists
+    '''
+
+    result = []
+    if not values:
+        return result
+
+    i = 0
+    while i < len(values):
+        count = int(values[i])
+        result.append(values[i + 1:i + 1 + count])
+        i = i + 1 + count
+    return result
+
+################################################################################
+
+Range = namedtuple('Range', 'low high')
+'''Value of a range property, as returned by decodeTypedValues'''
+
+def _decodeTypedValue (values, i):
+    '''Decode the tagged property value starting at values[i], return
+       the value and the index of the next one'''
+
+    tag = values[i]
+    if tag == 'i':
+        return int(values[i + 1]), i + 2
+    if tag == 'f':
+        return float(values[i + 1]), i + 2
+    if tag in ( 's', 'e', 'b', 'r', 'c' ):
+        return values[i + 1], i + 2
+    if tag == 'R':
+        low, i = _decodeTypedValue(values, i + 1)
+        high, i = _decodeTypedValue(values, i)
+        return Range(low, high), i
+    if tag == 'L':
+        count = int(values[i + 1])
+        i = i + 2
+        items = []
+        for item in range(count):
+            value, i = _decodeTypedValue(values, i)
+            items.append(value)
+        return tuple(items), i
+
+    # 'n' (undefined property) and '?' (unsupported value)
+    return None, i + 1
+
+def decodeTypedValues (values):
+    '''Decode the flat list of tagged property values returned by
+       getTypedPropertyValues into a list of Python values
+    '''
+
+    result = []
+    if not values:
+        return result
+
+    i = 0
+    while i < len(values):
+        value, i = _decodeTypedValue(values, i)
+        result.append(value)
+    return result
 
 ################################################################################
 
@@ -51,7 +406,7 @@ def getErrorMessage ():
     '''
     keep = False
     msg = ''
-    for line in StringIO.StringIO(sys.exc_info()[1]):
+    for line in splitLines(str(sys.exc_info()[1])):
         if line.lower().startswith('message:'):
             keep = True
         if line.lower().startswith('call stack traceback locations:'):
@@ -62,6 +417,16 @@ def getErrorMessage ():
 
 ################################################################################
 
+def splitLines (messages):
+    '''Split messages after each newline, keeping the newlines'''
+
+    lines = messages.split('\n')
+    last = lines.pop()
+    lines = [ line + '\n' for line in lines ]
+    if last != '':
+        lines.append(last)
+    return lines
+
 def sortStdoutMessages (messages):
     '''Get the messages from stdout
 
@@ -70,12 +435,9 @@ def sortStdoutMessages (messages):
     return a pair of the form [ info ]
     '''
 
-    MsgList = []
+    return [ splitLines(messages) ]
 
-    for line in StringIO.StringIO(messages):
-        MsgList.append(line)
-
-    return [ MsgList ]
+_severityPrefix = re.compile(r'(error|warning):', re.IGNORECASE)
 
 def sortStderrMessages (messages):
     '''Get the error and warning messages from stderr
@@ -86,97 +448,224 @@ def sortStderrMessages (messages):
 
     '''
 
+    # Messages are built as lists of pieces, joined once when complete
+
     msgType = 'error'
-    warningMsg = ''
-    errorMsg = ''
+    warningMsg = []
+    errorMsg = []
     warningMsgList = []
     errorMsgList = []
 
-    for line in StringIO.StringIO(messages):
-        if line.lower().startswith('error:'):
-            if warningMsg.strip()!='':
-                warningMsgList.append(warningMsg.strip())
-                warningMsg = ''
-            if errorMsg.strip()!='':
-                errorMsgList.append(errorMsg.strip())
-                errorMsg = ''
-            msgType = 'error'
-            errorMsg = warningMsg + line[7:] + '\n'
-        elif line.lower().startswith('warning:'):
-            if warningMsg.strip()!='':
-                warningMsgList.append(warningMsg.strip())
-                warningMsg = ''
-            if errorMsg.strip()!='':
-                errorMsgList.append(errorMsg.strip())
-                errorMsg = ''
-            msgType = 'warning'
-            warningMsg = warningMsg + line[9:] + '\n'
-        else:
+    def flush (pieces, msgList):
+        msg = ''.join(pieces).strip()
+        if msg != '':
+            msgList.append(msg)
+            return []
+        return pieces
+
+    for line in splitLines(messages):
+        prefix = _severityPrefix.match(line)
+        if prefix is None:
             if msgType == 'warning':
-                warningMsg = warningMsg + line + '\n'
-            elif msgType == 'error':
-                errorMsg = errorMsg + line + '\n'
+                warningMsg.extend((line, '\n'))
             else:
-                errorMsg = errorMsg + line + '\n'
+                errorMsg.extend((line, '\n'))
+            continue
 
-    if warningMsg.strip()!='':
-        warningMsgList.append(warningMsg.strip())
-    if errorMsg.strip()!='':
-        errorMsgList.append(errorMsg.strip())
+        warningMsg = flush(warningMsg, warningMsgList)
+        errorMsg = flush(errorMsg, errorMsgList)
+        if prefix.group(1).lower() == 'error':
+            msgType = 'error'
+            errorMsg = warningMsg + [ line[7:], '\n' ]
+        else:
+            msgType = 'warning'
+            warningMsg.extend((line[9:], '\n'))
+
+    flush(warningMsg, warningMsgList)
+    flush(errorMsg, errorMsgList)
     return [ warningMsgList , errorMsgList ]
 
 ################################################################################
 
-@contextmanager
-def std_redirector(stdoutStream, stderrStream):
+Diagnostic = namedtuple('Diagnostic', 'severity file line column message')
+'''A message reported by Ocarina. file, line and column are None for
+messages that are not attached to a location in a model'''
 
-    libc = ctypes.CDLL(None)
+_locatedMessage = re.compile(r'([^:\n]+):(\d+):(\d+): (.*)')
 
-    # Note: Darwin (OS X) does ont export stdout/stderr as symbols,
-    # but exports __stdoutp/__stderrp instead
+def parseDiagnostics (messages):
+    '''Get the structured list of diagnostics from stderr
 
-    if platform.system () == "Darwin":
-        c_stdout = ctypes.c_void_p.in_dll(libc, '__stdoutp')
-        c_stderr = ctypes.c_void_p.in_dll(libc, '__stderrp')
-    else:
-        c_stdout = ctypes.c_void_p.in_dll(libc, 'stdout')
-        c_stderr = ctypes.c_void_p.in_dll(libc, 'stderr')
+    :param messages: the messages written on stderr
+
+    return a list of :data:`Diagnostic`, one per message. A line with
+    neither a location nor a severity continues the message of the
+    previous diagnostic.
+    '''
 
-    original_stdout_fd = sys.stdout.fileno()
-    original_stderr_fd = sys.stderr.fileno()
+    diagnostics = []
+    for line in messages.split('\n'):
+        line = line.rstrip()
+        if line == '':
+            continue
+
+        located = _locatedMessage.match(line)
+        prefix = _severityPrefix.match(line)
+        if located is None and prefix is None and diagnostics != []:
+            last = diagnostics[-1]
+            diagnostics[-1] = last._replace(
+                message=last.message + '\n' + line.strip())
+            continue
+
+        fileName = lineNo = column = None
+        if located is not None:
+            fileName = located.group(1)
+            lineNo = int(located.group(2))
+            column = int(located.group(3))
+            line = located.group(4)
+            prefix = _severityPrefix.match(line)
+
+        severity = 'error'
+        if prefix is not None:
+            severity = prefix.group(1).lower()
+            line = line[prefix.end():].lstrip()
+
+        diagnostics.append(
+            Diagnostic(severity, fileName, lineNo, column, line))
+    return diagnostics
 
-    def _redirect_stdout(to_fd):
-        libc.fflush(c_stdout)
-        sys.stdout.close()
-        os.dup2(to_fd, original_stdout_fd)
-        sys.stdout = os.fdopen(original_stdout_fd, 'wb')
+################################################################################
 
-    def _redirect_stderr(to_fd):
-        libc.fflush(c_stderr)
-        sys.stderr.close()
-        os.dup2(to_fd, original_stderr_fd)
-        sys.stderr = os.fdopen(original_stderr_fd, 'wb')
+class CaptureSession(object):
+    '''Capture of the stdout and stderr file descriptors, used by
+       :func:`runOcarinaFunction`.
 
-    saved_stdout_fd = os.dup(original_stdout_fd)
-    saved_stderr_fd = os.dup(original_stderr_fd)
-    try:
-        stdoutfile = tempfile.TemporaryFile(mode='w+b')
-        _redirect_stdout(stdoutfile.fileno())
-        stderrfile = tempfile.TemporaryFile(mode='w+b')
-        _redirect_stderr(stderrfile.fileno())
-        yield
-        _redirect_stdout(saved_stdout_fd)
-        _redirect_stderr(saved_stderr_fd)
+       The capture files and the libc handles are set up once per
+       session; each call saves the current descriptors, swaps them
+       with dup2 and drains what was written.
 
-        stdoutfile.flush()
-        stdoutfile.seek(0, io.SEEK_SET)
-        stdoutStream.write(stdoutfile.read())
+       Note: pipes are not used, as a call that writes more than the
+       pipe buffer would block forever.
+    '''
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.libc = ctypes.CDLL(None)
+
+        # Note: Darwin (OS X) does ont export stdout/stderr as symbols,
+        # but exports __stdoutp/__stderrp instead
+
+        if platform.system () == "Darwin":
+            self.c_stdout = ctypes.c_void_p.in_dll(self.libc, '__stdoutp')
+            self.c_stderr = ctypes.c_void_p.in_dll(self.libc, '__stderrp')
+        else:
+            self.c_stdout = ctypes.c_void_p.in_dll(self.libc, 'stdout')
+            self.c_stderr = ctypes.c_void_p.in_dll(self.libc, 'stderr')
+
+        self.stdout_fd = sys.stdout.fileno()
+        self.stderr_fd = sys.stderr.fileno()
+        self.saved_stdout_fd = None
+        self.saved_stderr_fd = None
+        self.stdoutFile = self._newCaptureFile('ocarina_stdout')
+        self.stderrFile = self._newCaptureFile('ocarina_stderr')
+
+    @staticmethod
+    def _newCaptureFile (name):
+        '''Return an unnamed file to capture one stream, in memory
+           when the platform supports it'''
+
+        if hasattr(os, 'memfd_create'):
+            return os.fdopen(os.memfd_create(name), 'w+b')
+        return tempfile.TemporaryFile(mode='w+b')
+
+    def _redirect (self, stdout_fd, stderr_fd):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self.libc.fflush(self.c_stdout)
+        self.libc.fflush(self.c_stderr)
+        os.dup2(stdout_fd, self.stdout_fd)
+        os.dup2(stderr_fd, self.stderr_fd)
+
+    def begin (self):
+        '''Redirect stdout and stderr to the capture files'''
+
+        # Save the descriptors as they are now, so that a redirection
+        # made by the caller since the previous call is kept
+
+        self.saved_stdout_fd = os.dup(self.stdout_fd)
+        self.saved_stderr_fd = os.dup(self.stderr_fd)
+        self._redirect(self.stdoutFile.fileno(), self.stderrFile.fileno())
+
+    def end (self):
+        '''Restore stdout and stderr, return the captured bytes as a
+           pair ( stdout , stderr )'''
+
+        self._redirect(self.saved_stdout_fd, self.saved_stderr_fd)
+        os.close(self.saved_stdout_fd)
+        os.close(self.saved_stderr_fd)
+        self.saved_stdout_fd = None
+        self.saved_stderr_fd = None
+        return ( self._drain(self.stdoutFile.fileno()),
+                 self._drain(self.stderrFile.fileno()) )
+
+    @staticmethod
+    def _drain (fd):
+        '''Read back what was written to fd, then empty it'''
+
+        size = os.lseek(fd, 0, os.SEEK_CUR)
+        if size == 0:
+            return b''
+
+        chunks = []
+        os.lseek(fd, 0, os.SEEK_SET)
+        while size > 0:
+            chunk = os.read(fd, size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        return b''.join(chunks)
+
+    def close (self):
+        self.stdoutFile.close()
+        self.stderrFile.close()
+
+_captureSession = None
+
+def getCaptureSession ():
+    '''Return the capture session, created on first use'''
+
+    # A child process created by fork() inherits the session of its
+    # parent, whose capture files share their offsets with it: it
+    # must use its own
+
+    global _captureSession
+    if _captureSession is None or _captureSession.pid != os.getpid():
+        _captureSession = CaptureSession()
+    return _captureSession
+
+def _closeCaptureSession ():
+    '''Close the capture session of this process, if any'''
+
+    if _captureSession is not None and _captureSession.pid == os.getpid():
+        _captureSession.close()
+
+atexit.register(_closeCaptureSession)
+
+################################################################################
+
+@contextmanager
+def std_redirector(stdoutStream, stderrStream):
+    '''Redirect stdout and stderr to stdoutStream and stderrStream for
+       the duration of the block'''
 
-        stderrfile.flush()
-        stderrfile.seek(0, io.SEEK_SET)
-        stderrStream.write(stderrfile.read())
+    session = getCaptureSession()
+    session.begin()
+    try:
+        yield
     finally:
-        stdoutfile.close()
-        os.close(saved_stdout_fd)
-        stderrfile.close()
-        os.close(saved_stderr_fd)
+        info, error = session.end()
+        stdoutStream.write(info)
+        stderrStream.write(error)
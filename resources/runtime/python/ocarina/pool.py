@@ -0,0 +1,111 @@
+#! /usr/bin/python
+'''
+:mod:`pool` -- Pool of Ocarina worker processes
+===============================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module runs independent jobs on a pool of worker processes, each
+with its own libocarina. A job is a list of steps, each a tuple of the
+name of an :mod:`ocarina` function and its parameters, e.g.
+
+>>> with Pool(4) as pool:
+...     results = pool.map([ [ ("load", f), ("analyze",),
+...                            ("instantiate", "") ] for f in models ])
+
+'''
+
+################################################################################
+
+try:
+    import multiprocessing
+    from collections import namedtuple
+    import ocarina
+except ImportError:
+    pass
+
+Steps = ( 'load', 'load_many', 'analyze', 'instantiate', 'generate',
+          'set_real_theorem', 'add_real_library', 'check_theorems' )
+'''Names of the functions that may be used as steps of a job'''
+
+StepResult = namedtuple('StepResult', 'step value stdout warnings errors')
+'''Result of one step of a job, with the fields of :class:`OcarinaResult`'''
+
+################################################################################
+
+def runJob (steps):
+    '''Reset Ocarina, then run the steps of a job, up to the first one
+       that fails. Return the list of :data:`StepResult`.
+
+       This function is run by the workers of a :class:`Pool`; it may
+       also be called directly.
+    '''
+
+    ocarina.reset()
+    results = []
+    for step in steps:
+        if step[0] not in Steps:
+            raise ValueError('%s cannot be used as a job step' % step[0])
+        result = getattr(ocarina, step[0])(*step[1:])
+        results.append(StepResult(step[0], result.value, result.stdout,
+                                  result.warnings, result.errors))
+        if result.errors != []:
+            break
+    return results
+
+################################################################################
+
+class Pool(object):
+    '''Pool of Ocarina worker processes
+
+    :param processes: number of workers, by default the number of CPUs
+    :param maxJobsPerWorker: number of jobs after which a worker is
+       replaced by a new process, by default workers are never replaced
+    '''
+
+    def __init__ (self, processes=None, maxJobsPerWorker=None):
+        self._pool = multiprocessing.Pool(processes,
+                                          maxtasksperchild=maxJobsPerWorker)
+
+    def submit (self, steps, callback=None):
+        '''Submit a job, return a multiprocessing AsyncResult whose
+           get() method returns the list of :data:`StepResult`'''
+
+        return self._pool.apply_async(runJob, (steps,), callback=callback)
+
+    def run (self, steps):
+        '''Run a job, return its list of :data:`StepResult`'''
+
+        return self.submit(steps).get()
+
+    def map (self, jobs):
+        '''Run the jobs, return their results in the same order'''
+
+        return self._pool.map(runJob, jobs, chunksize=1)
+
+    def imap_unordered (self, jobs):
+        '''Run the jobs, iterate over their results as they complete'''
+
+        return self._pool.imap_unordered(runJob, jobs)
+
+    def close (self):
+        '''Wait for the pending jobs, then stop the workers'''
+
+        self._pool.close()
+        self._pool.join()
+
+    def terminate (self):
+        '''Stop the workers at once'''
+
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__ (self):
+        return self
+
+    def __exit__ (self, excType, excValue, traceback):
+        if excType is None:
+            self.close()
+        else:
+            self.terminate()
+        return False
@@ -0,0 +1,148 @@
+#! /usr/bin/python
+'''
+:mod:`property_table` -- Property values of many instances, by column
+=====================================================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module provides a column-oriented table of property values over
+a set of component instances, as returned by :func:`lmp.getPropertyTable`.
+
+'''
+
+################################################################################
+
+import numbers
+from array import array
+
+try:
+    from ocarina_common_tools import Range
+except ImportError:
+    pass
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+################################################################################
+
+def _integerCode ():
+    '''Return the typecode of 64-bit integer arrays, if supported'''
+
+    try:
+        array('q')
+        return 'q'
+    except ValueError:
+        return 'l'
+
+_IntegerCode = _integerCode()
+
+def _numberColumn (values):
+    '''Return values as an integer array if they are all integers and
+       fit in one, as a double array otherwise'''
+
+    if all(isinstance(v, numbers.Integral) for v in values):
+        try:
+            return array(_IntegerCode, values)
+        except OverflowError:
+            pass
+    return array('d', values)
+
+def _isNumber (value):
+    return isinstance(value, numbers.Real)
+
+def _isRange (value):
+    return isinstance(value, Range) \
+        and _isNumber(value.low) and _isNumber(value.high)
+
+################################################################################
+
+class PropertyTable(object):
+    '''Values of a list of properties for a list of component instances
+
+    ids is the array of the instance ids, one per row. For each
+    property p, masks[p] is an array of bytes, 1 in the rows where p
+    is defined. The values are in columns:
+
+    - columns[p] if all the values of p are numbers, references or
+      Booleans, as an array of integers or of doubles,
+    - columns[p + '.low'] and columns[p + '.high'] if they are all
+      ranges, as two such arrays,
+    - columns[p] otherwise, as a list of the values of
+      :func:`ocarina.getTypedPropertyValue`.
+
+    Numbers are in the base unit of their units type, e.g. ps for
+    Time. Undefined values are 0 in arrays and None in lists.
+    '''
+
+    def __init__ (self, ids, properties, values):
+        '''Build the table from the list of ids, the list of property
+           names and, for each property, the list of its values in
+           the order of ids, None where undefined'''
+
+        self.ids = array('l', ids)
+        self.properties = list(properties)
+        self.columns = {}
+        self.masks = {}
+        for name, column in zip(self.properties, values):
+            self._addColumn(name, column)
+
+    def _addColumn (self, name, values):
+        self.masks[name] = array('b', [ v is not None for v in values ])
+        defined = [ v for v in values if v is not None ]
+
+        if all(_isNumber(v) for v in defined):
+            self.columns[name] = _numberColumn(
+                [ 0 if v is None else v for v in values ])
+        elif all(_isRange(v) for v in defined):
+            self.columns[name + '.low'] = _numberColumn(
+                [ 0 if v is None else v[0] for v in values ])
+            self.columns[name + '.high'] = _numberColumn(
+                [ 0 if v is None else v[1] for v in values ])
+        else:
+            self.columns[name] = list(values)
+
+    def __len__ (self):
+        return len(self.ids)
+
+    def row (self, index):
+        '''Return the values of the index-th row, as a dictionary from
+           column names to values, None where undefined'''
+
+        result = { 'id' : self.ids[index] }
+        for name, column in self.columns.items():
+            prop = name.rsplit('.', 1)[0] if name not in self.masks else name
+            result[name] = column[index] if self.masks[prop][index] else None
+        return result
+
+    def toNumpy (self):
+        '''Return the ids and the columns as NumPy arrays sharing the
+           memory of the table, in a dictionary keyed by 'id' and
+           column names
+
+        Numeric columns are masked arrays, masked where the property
+        is undefined; the other columns are object arrays. Raises
+        ImportError if NumPy is not installed.
+        '''
+
+        if numpy is None:
+            raise ImportError('NumPy is not installed')
+
+        def view (column):
+            if len(column) == 0:
+                return numpy.array([], dtype=column.typecode)
+            return numpy.frombuffer(column, dtype=column.typecode)
+
+        result = { 'id' : view(self.ids) }
+        for name, column in self.columns.items():
+            prop = name.rsplit('.', 1)[0] if name not in self.masks else name
+            undefined = view(self.masks[prop]) == 0
+            if isinstance(column, array):
+                result[name] = numpy.ma.masked_array(view(column),
+                                                     mask=undefined)
+            else:
+                values = numpy.empty(len(column), dtype=object)
+                values[:] = column
+                result[name] = values
+        return result
@@ -0,0 +1,339 @@
+#! /usr/bin/python
+'''
+:mod:`schedulability` -- Schedulability analysis of periodic threads
+====================================================================
+
+.. moduleauthor:: Jerome Hugues, Arnaud Schach
+
+This module checks the schedulability of the periodic threads of an
+instantiated model, per processor: processor utilization, the
+utilization bounds of Rate Monotonic (Liu & Layland) and EDF, and the
+worst-case response times of fixed-priority preemptive scheduling.
+
+The analyses run on the :class:`TaskSet` returned by :func:`getTaskSet`,
+and may evaluate many variants of the thread parameters in one batch.
+
+'''
+
+################################################################################
+
+import math
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import lmp
+    from ocarina_common_tools import *
+    from flow_latency import TimeUnits
+except ImportError:
+    pass
+
+################################################################################
+
+def liuLaylandBound (n):
+    '''Return the utilization bound of n tasks under Rate Monotonic
+       scheduling, n (2^(1/n) - 1)'''
+
+    if n <= 0:
+        return 1.0
+    return n * (2.0 ** (1.0 / n) - 1.0)
+
+################################################################################
+
+class TaskSet(object):
+    '''Periodic threads and their processors
+
+    Times are in seconds. wcets holds the worst-case execution times,
+    i.e. the upper bound of Compute_Execution_Time. processors holds
+    the id of the processor of each thread, 0 if it is not bound:
+    unbound threads are analyzed as if they shared one processor.
+
+    Priorities follow the AADL convention: the greater the value, the
+    higher the priority; threads of equal priority are assumed to
+    preempt each other. If priorities is None, Rate Monotonic
+    priorities are derived from the periods of each variant.
+
+    The analyses take optional variants of the parameters. Each of
+    periods, deadlines, wcets and priorities may be None, to keep the
+    values of the task set, one sequence of one value per thread, or a
+    sequence of such sequences, one per variant; all the parameters
+    given with several variants must have the same number of them.
+    '''
+
+    def __init__ (self, ids, processors, periods, deadlines, wcets,
+                  priorities=None):
+        self.ids = array('l', ids)
+        self.processors = array('l', processors)
+        self.periods = array('d', periods)
+        self.deadlines = array('d', deadlines)
+        self.wcets = array('d', wcets)
+        self.priorities = None if priorities is None \
+            else array('d', priorities)
+        self.processorIds = sorted(set(self.processors))
+
+    def __len__ (self):
+        return len(self.ids)
+
+    ############################################################################
+
+    def _variants (self, periods, deadlines, wcets, priorities):
+        '''Return the parameters as lists of variants of equal length'''
+
+        def variants (values, default):
+            if values is None:
+                return [ default ]
+            values = list(values)
+            if len(values) > 0 and not hasattr(values[0], '__len__'):
+                values = [ values ]
+            for variant in values:
+                if len(variant) != len(self.ids):
+                    raise ValueError('%d values given for %d threads'
+                                     % (len(variant), len(self.ids)))
+            return values
+
+        parameters = [ variants(periods, self.periods),
+                       variants(deadlines, self.deadlines),
+                       variants(wcets, self.wcets),
+                       variants(priorities, self.priorities) ]
+        count = max(len(p) for p in parameters)
+        for p in parameters:
+            if len(p) not in ( 1, count ):
+                raise ValueError('all parameters with several variants '
+                                 'shall have the same number of them')
+        return count, [ p * count if len(p) == 1 else p for p in parameters ]
+
+    def _processorIndexes (self):
+        positions = dict((p, k) for k, p in enumerate(self.processorIds))
+        return [ positions[p] for p in self.processors ]
+
+    @staticmethod
+    def _rateMonotonic (periods):
+        '''Return priorities decreasing with the periods'''
+
+        return [ -t for t in periods ]
+
+    ############################################################################
+
+    def utilization (self, periods=None, wcets=None):
+        '''Return the utilization of each processor, in the order of
+           processorIds, for each variant: an array of shape (variants,
+           processors) with NumPy, a list of lists otherwise'''
+
+        count, (T, D, C, P) = self._variants(periods, None, wcets, None)
+        return self._load(count, T, C)
+
+    def _load (self, count, T, C):
+        indexes = self._processorIndexes()
+        if numpy is not None:
+            ratios = numpy.asarray(C, dtype=float) \
+                / numpy.asarray(T, dtype=float)
+            onehot = numpy.zeros((len(indexes), len(self.processorIds)))
+            onehot[numpy.arange(len(indexes)), indexes] = 1.0
+            return ratios.dot(onehot)
+
+        result = []
+        for v in range(count):
+            load = [ 0.0 ] * len(self.processorIds)
+            for i, k in enumerate(indexes):
+                load[k] += C[v][i] / T[v][i]
+            result.append(load)
+        return result
+
+    def rmaTest (self, periods=None, wcets=None):
+        '''Return, for each variant and processor, whether its
+           utilization is below the bound of Liu & Layland, a
+           sufficient condition of schedulability under Rate Monotonic
+           scheduling with deadlines equal to periods'''
+
+        load = self.utilization(periods, wcets)
+        indexes = self._processorIndexes()
+        bounds = [ liuLaylandBound(indexes.count(k))
+                   for k in range(len(self.processorIds)) ]
+        if numpy is not None:
+            return load <= numpy.asarray(bounds)
+        return [ [ u <= b for u, b in zip(row, bounds) ] for row in load ]
+
+    def edfTest (self, periods=None, deadlines=None, wcets=None):
+        '''Return, for each variant and processor, whether its density,
+           the sum of C / min (D, T), is at most 1: a necessary and
+           sufficient condition of schedulability under EDF when
+           deadlines are equal to periods, and sufficient otherwise'''
+
+        count, (T, D, C, P) = self._variants(periods, deadlines, wcets, None)
+        if numpy is not None:
+            windows = numpy.minimum(numpy.asarray(T, dtype=float),
+                                    numpy.asarray(D, dtype=float))
+        else:
+            windows = [ [ min(t, d) for t, d in zip(T[v], D[v]) ]
+                        for v in range(count) ]
+        load = self._load(count, windows, C)
+        if numpy is not None:
+            return load <= 1.0
+        return [ [ u <= 1.0 for u in row ] for row in load ]
+
+    ############################################################################
+
+    def responseTimes (self, periods=None, deadlines=None, wcets=None,
+                       priorities=None, maxIterations=1000):
+        '''Return the worst-case response time of each thread under
+           fixed-priority preemptive scheduling, for each variant: an
+           array of shape (variants, threads) with NumPy, a list of
+           lists otherwise.
+
+        Response times are computed by the iteration R = C + sum of
+        ceil (R / Tj) * Cj over the threads j of higher or equal
+        priority on the same processor; the response time of a thread
+        whose iteration exceeds its deadline is infinite.
+        '''
+
+        count, (T, D, C, P) = self._variants(periods, deadlines, wcets,
+                                             priorities)
+        P = [ self._rateMonotonic(T[v]) if P[v] is None else P[v]
+              for v in range(count) ]
+        if numpy is not None:
+            return self._responseTimesNumpy(T, D, C, P, maxIterations)
+
+        processors = self.processors
+        result = []
+        for v in range(count):
+            t, d, c, p = T[v], D[v], C[v], P[v]
+            times = []
+            for i in range(len(self.ids)):
+                interferers = [ j for j in range(len(self.ids))
+                                if j != i and processors[j] == processors[i]
+                                and p[j] >= p[i] ]
+                r = c[i]
+                for iteration in range(maxIterations):
+                    following = c[i] + sum(math.ceil(r / t[j]) * c[j]
+                                           for j in interferers)
+                    if following > d[i]:
+                        r = float('inf')
+                        break
+                    if following == r:
+                        break
+                    r = following
+                times.append(r)
+            result.append(times)
+        return result
+
+    def _responseTimesNumpy (self, T, D, C, P, maxIterations):
+        T = numpy.asarray(T, dtype=float)
+        D = numpy.asarray(D, dtype=float)
+        C = numpy.asarray(C, dtype=float)
+        P = numpy.asarray(P, dtype=float)
+        processors = numpy.asarray(self.processors)
+        n = len(self.ids)
+
+        # interferes[v, i, j]: thread j may preempt thread i in variant v
+
+        interferes = (processors[:, None] == processors[None, :]) \
+            & ~numpy.eye(n, dtype=bool)
+        interferes = interferes[None, :, :] & (P[:, None, :] >= P[:, :, None])
+
+        R = C.copy()
+        active = numpy.ones(R.shape, dtype=bool)
+        for iteration in range(maxIterations):
+            following = C + numpy.where(
+                interferes,
+                numpy.ceil(R[:, :, None] / T[:, None, :]) * C[:, None, :],
+                0.0).sum(axis=2)
+            missed = active & (following > D)
+            R[missed] = numpy.inf
+            active &= ~missed
+            changed = active & (following != R)
+            R[changed] = following[changed]
+            active = changed
+            if not active.any():
+                break
+        return R
+
+    def schedulable (self, periods=None, deadlines=None, wcets=None,
+                     priorities=None):
+        '''Return, for each variant, whether all the threads meet their
+           deadlines under fixed-priority preemptive scheduling'''
+
+        count, (T, D, C, P) = self._variants(periods, deadlines, wcets,
+                                             priorities)
+        R = self.responseTimes(periods, deadlines, wcets, priorities)
+        if numpy is not None:
+            return (R <= numpy.asarray(D, dtype=float)).all(axis=1)
+        return [ all(r <= d for r, d in zip(R[v], D[v]))
+                 for v in range(count) ]
+
+################################################################################
+
+def _first (value):
+    '''Return the first element of a list value, or value itself'''
+
+    if isinstance(value, tuple) and not isinstance(value, Range):
+        return value[0] if len(value) > 0 else None
+    return value
+
+def getTaskSet (category='thread'):
+    '''Get the periodic threads of the instantiated model, with their
+    Period, Deadline, Compute_Execution_Time, Priority and
+    Actual_Processor_Binding properties
+
+    Threads without a period are ignored. The deadline defaults to
+    the period; if a thread has no priority, Rate Monotonic
+    priorities are used for all threads. A thread without a processor
+    binding takes the binding of the process that contains it.
+
+    Returns a :class:`TaskSet`.
+
+    >>> tasks = getTaskSet ()[0]
+    >>> tasks.schedulable (periods=[ [ 0.5, 1.0 ], [ 0.4, 1.0 ] ])
+    '''
+
+    result = lmp.getPropertyTable(category, [ 'period', 'deadline',
+                                              'compute_execution_time',
+                                              'priority',
+                                              'actual_processor_binding' ])
+    if result[3] != []:
+        return result
+    table = result[0]
+
+    processes = lmp.getPropertyTable('process',
+                                     [ 'actual_processor_binding' ])
+    if processes[3] != []:
+        return processes
+    children = lmp.getChildren(processes[0].ids)
+    if children[3] != []:
+        return children
+
+    bindings = {}
+    for k, threads in enumerate(children[0]):
+        binding = _first(processes[0].row(k)['actual_processor_binding'])
+        bindings.update((thread, binding) for thread in threads)
+
+    scale = TimeUnits['ps']
+    ids, processors, periods, deadlines, wcets, priorities = \
+        [], [], [], [], [], []
+    for k in range(len(table)):
+        row = table.row(k)
+        if row['period'] is None:
+            continue
+        processor = _first(row['actual_processor_binding'])
+        if processor is None:
+            processor = bindings.get(row['id'])
+        wcet = row.get('compute_execution_time.high',
+                       row.get('compute_execution_time'))
+        if isinstance(wcet, tuple):
+            wcet = wcet[-1]
+
+        ids.append(row['id'])
+        processors.append(processor or 0)
+        periods.append(row['period'] * scale)
+        deadlines.append((row['deadline'] or row['period']) * scale)
+        wcets.append((wcet or 0) * scale)
+        priorities.append(row['priority'])
+
+    if None in priorities:
+        priorities = None
+    result[0] = TaskSet(ids, processors, periods, deadlines, wcets,
+                        priorities)
+    return result
@@ -0,0 +1,219 @@
+#! /usr/bin/python
+
+'''Benchmark of the Python binding over a corpus of AADL models.
+
+Each model is loaded, analyzed, instantiated, queried and optionally
+passed to a backend, several times; the time of each phase is
+recorded in a JSON baseline, and compared to a previous baseline to
+detect regressions.
+
+Models are either AADL files, all the AADL files of a directory (e.g.
+the tests/ corpus, as run by autotest.sh) or synthetic models made of
+a given number of threads and connections, written by
+model_generator.
+'''
+
+import sys
+import os
+import getopt
+import json
+import platform
+import shutil
+import tempfile
+import time
+
+usage = '''Usage is:
+bench.py [-a <aadlfile>[,<aadlfile>]*] [-d <directory>]*
+         [-s <threads>x<connections>]* [-r <root object>]
+         [-g <backend>] [-n <runs>] [-o <baseline>]
+         [-b <baseline>] [-t <tolerance>]
+
+  -a  benchmark the given AADL files, as one model
+  -d  benchmark each AADL file found under directory
+  -s  benchmark a synthetic model, e.g. -s 1000x2000
+  -r  root system to instantiate (default: the only one)
+  -g  backend to run after instantiation, from ocarina.Backends
+  -n  number of runs of each model (default: 3)
+  -o  write the results as a JSON baseline to this file
+  -b  compare the results to this JSON baseline
+  -t  allowed slowdown before reporting a regression (default: 0.2)'''
+
+Phases = ( 'load', 'analyze', 'instantiate', 'query', 'generate' )
+
+################################################################################
+
+def runModel (files, root, backend):
+    '''Process one model, return the time of each phase, stopping at
+       the first failing phase'''
+
+    import ocarina
+    import lmp
+
+    def query ():
+        result = lmp.getInstances('all')
+        if result[3] == []:
+            result = ocarina.getPropertyValues(result[0], 'period')
+        return result
+
+    steps = [ ('load', lambda: ocarina.load_many(files)),
+              ('analyze', ocarina.analyze),
+              ('instantiate', lambda: ocarina.instantiate(root)),
+              ('query', query) ]
+    if backend is not None:
+        steps.append(('generate', lambda: ocarina.generate(
+            getattr(ocarina.Backends, backend))))
+
+    ocarina.reset()
+    times = {}
+    for phase, step in steps:
+        start = time.time()
+        result = step()
+        times[phase] = time.time() - start
+        if result[3] != []:
+            return times, '%s: %s' % (phase, result[3])
+    return times, None
+
+def summarize (samples):
+    '''Return the statistics of a list of times'''
+
+    samples = sorted(samples)
+    median = samples[len(samples) // 2]
+    return { 'runs' : len(samples),
+             'min' : samples[0],
+             'median' : median,
+             'max' : samples[-1],
+             'per_second' : 1.0 / median if median > 0 else None }
+
+def benchmark (models, root, backend, runs):
+    '''Benchmark each model, a triple ( name , files , root ), where
+       root replaces the default root if it is not None, return a
+       dictionary from model name to the statistics of its phases'''
+
+    results = {}
+    for name, files, modelRoot in models:
+        samples = {}
+        error = None
+        for run in range(runs):
+            times, error = runModel(files, modelRoot or root, backend)
+            for phase, elapsed in times.items():
+                samples.setdefault(phase, []).append(elapsed)
+            if error is not None:
+                break
+
+        results[name] = dict((phase, summarize(samples[phase]))
+                             for phase in Phases if phase in samples)
+        if error is not None:
+            results[name]['error'] = error
+        print('%-50s %s' % (name, '  '.join(
+            '%s %.3fs' % (phase, results[name][phase]['median'])
+            for phase in Phases if phase in results[name])))
+    return results
+
+def compare (results, baseline, tolerance):
+    '''Return the list of phases slower than in baseline by more than
+       tolerance, as strings'''
+
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        for phase in Phases:
+            if phase not in results[name] or phase not in baseline[name]:
+                continue
+            current = results[name][phase]['median']
+            previous = baseline[name][phase]['median']
+            if current > previous * (1.0 + tolerance):
+                regressions.append('%s %s: %.3fs, was %.3fs (+%d%%)'
+                                   % (name, phase, current, previous,
+                                      100 * (current - previous)
+                                      / max(previous, 1e-9)))
+    return regressions
+
+################################################################################
+
+def main (argv):
+    '''Benchmark function'''
+    import model_generator
+
+    try:
+        opts, args = getopt.getopt(argv, "ha:d:s:r:g:n:o:b:t:")
+    except getopt.GetoptError:
+        print('Error in command options. ' + usage)
+        sys.exit(2)
+
+    models = []
+    synthetic = []
+    root = ''
+    backend = None
+    runs = 3
+    output = None
+    baselineFile = None
+    tolerance = 0.2
+
+    for opt, arg in opts:
+        if opt == '-h':
+            print(usage)
+            sys.exit()
+        elif opt == '-a':
+            files = arg.split(',')
+            models.append((os.path.basename(files[0]), files, None))
+        elif opt == '-d':
+            for directory, dirs, names in sorted(os.walk(arg)):
+                for name in sorted(names):
+                    if name.endswith('.aadl'):
+                        path = os.path.join(directory, name)
+                        models.append((os.path.relpath(path, arg),
+                                       [ path ], None))
+        elif opt == '-s':
+            threads, connections = arg.split('x')
+            synthetic.append((int(threads), int(connections)))
+        elif opt == '-r':
+            root = arg
+        elif opt == '-g':
+            backend = arg
+        elif opt == '-n':
+            runs = int(arg)
+        elif opt == '-o':
+            output = arg
+        elif opt == '-b':
+            baselineFile = arg
+        elif opt == '-t':
+            tolerance = float(arg)
+
+    workdir = tempfile.mkdtemp(prefix='ocarina_bench')
+    for threads, connections in synthetic:
+        name = 'synthetic_%dx%d' % (threads, connections)
+        files, syntheticRoot = model_generator.generateModel(
+            os.path.join(workdir, name), threads=threads,
+            connections=connections)
+        models.append((name, files, syntheticRoot))
+
+    if models == []:
+        print('At least one model shall be given. ' + usage)
+        sys.exit(2)
+
+    try:
+        results = benchmark(models, root, backend, runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump({ 'python' : platform.python_version(),
+                        'platform' : platform.platform(),
+                        'date' : time.strftime('%Y-%m-%dT%H:%M:%S'),
+                        'models' : results },
+                      f, indent=2, sort_keys=True)
+
+    if baselineFile is not None:
+        with open(baselineFile) as f:
+            baseline = json.load(f)['models']
+        regressions = compare(results, baseline, tolerance)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions != []:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+    sys.exit (0)                       # exit
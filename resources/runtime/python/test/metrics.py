@@ -80,35 +80,35 @@ def main(argv):
     for impl in aadlCompoImpl:
         tmp=lmp.ATN.Subcomponents(impl)[0]
         if tmp is not None :
-            aadlSubcomponents=aadlSubcomponents+tmp
+            aadlSubcomponents.extend(tmp)
     print 'Number of Subcomponents:\t\t',len(aadlSubcomponents)
     aadlCalls=[]
     for impl in aadlCompoImpl:
         tmp=lmp.ATN.Calls(impl)[0]
         if tmp is not None :
-            aadlCalls=aadlCalls+tmp
+            aadlCalls.extend(tmp)
     print 'Number of Call Sequences:\t\t',len(aadlCalls)
     aadlSubprogramCalls=[]
     for call in aadlCalls:
-        aadlSubprogramCalls=aadlSubprogramCalls+lmp.ATN.Subprogram_Calls(call)[0]
+        aadlSubprogramCalls.extend(lmp.ATN.Subprogram_Calls(call)[0])
     print 'Number of Subprogram Calls:\t\t',len(aadlSubprogramCalls)
     aadlFeatures=[]
     for type in aadlCompoTypes:
         tmp=lmp.ATN.Features(type)[0]
         if tmp is not None :
-            aadlFeatures=aadlFeatures+tmp
+            aadlFeatures.extend(tmp)
     print 'Number of Features:\t\t\t',len(aadlFeatures)
     aadlConnections=[]
     for impl in aadlCompoImpl:
         tmp=lmp.ATN.Connections(impl)[0]
         if tmp is not None :
-            aadlConnections=aadlConnections+tmp
+            aadlConnections.extend(tmp)
     print 'Number of Connections:\t\t\t',len(aadlConnections)
     aadlProperties=[]
     for elt in aadlCompoTypes+aadlCompoImpl+aadlFeatures+aadlConnections:
         tmp=lmp.ATN.Properties(elt)[0]
         if tmp is not None :
-            aadlProperties=aadlProperties+tmp
+            aadlProperties.extend(tmp)
     print 'Number of Property Associations:\t',len(aadlProperties)
     print '---- Prototypes ------------------------------------'
     knownAadlElt=lmp.getPrototypes()[0]
@@ -132,19 +132,19 @@ def main(argv):
     for propSet in aadlPropertySets:
         tmp=lmp.getPropertyTypes(propSet)[0]
         if tmp is not None :
-            aadlPropertyTypes=aadlPropertyTypes+tmp
+            aadlPropertyTypes.extend(tmp)
     print 'Number of Property Types:\t\t',len(aadlPropertyTypes)
     aadlPropertyDefinitions=[]
     for propSet in aadlPropertySets:
         tmp=lmp.getPropertyDefinitions(propSet)[0]
         if tmp is not None :
-            aadlPropertyDefinitions=aadlPropertyDefinitions+tmp
+            aadlPropertyDefinitions.extend(tmp)
     print 'Number of Property Definitions:\t\t',len(aadlPropertyDefinitions)
     aadlPropertyConstants=[]
     for propSet in aadlPropertySets:
         tmp=lmp.getPropertyConstants(propSet)[0]
         if tmp is not None :
-            aadlPropertyConstants=aadlPropertyConstants+tmp
+            aadlPropertyConstants.extend(tmp)
     print 'Number of Property Constants:\t\t',len(aadlPropertyConstants)
     print '---- Annexes ---------------------------------------'
     aadlAnnexes=lmp.getAnnexes()[0]
@@ -40,7 +40,7 @@ def visitor (component, level):
     about its features, subcomponents and properties.
 
     Args:
-    component (str):  the NodeId of the component
+    component (int):  the NodeId of the component
     level (int): indentation level
 
     """
@@ -50,8 +50,9 @@ def visitor (component, level):
     features=ocarina.AIN.Features(component)[0];
     if features is not None :
         print ' ' * level,' -> features:',features
-        for feature in features :
-            print ' ' * level,'   -> feature:',feature,', ',lmp.getInstanceName(feature)[0]
+        featureNames=lmp.getInstanceNames(features)[0]
+        for feature, featureName in zip(features, featureNames) :
+            print ' ' * level,'   -> feature:',feature,', ',featureName
             print ' ' * level,'      source feature: ', lmp.getInstanceName(ocarina.getSourcePorts(feature)[0])[0]
             print ' ' * level,'      destination feature: ', lmp.getInstanceName(ocarina.getDestinationPorts(feature)[0])[0]
 
@@ -64,9 +65,12 @@ def visitor (component, level):
     subcomponents=ocarina.AIN.Subcomponents(component)[0];
     if subcomponents is not None :
         print ' ' * level,' -> subcomponents:',subcomponents
-        for subcomponent in subcomponents :
-            print ' ' * level,'   -> ',subcomponent,",",lmp.getInstanceName(subcomponent)[0]
-            visitor(str(ocarina.AIN.Corresponding_Instance(subcomponent)[0]),level+3)
+        subcomponentNames=lmp.getInstanceNames(subcomponents)[0]
+        children=lmp.getChildren([component])[0][0]
+        for subcomponent, name, child in zip(subcomponents, subcomponentNames, children) :
+            print ' ' * level,'   -> ',subcomponent,",",name
+            if child != 0 :
+                visitor(child,level+3)
 
     print ' ' * level,'end of visit of ',component
 
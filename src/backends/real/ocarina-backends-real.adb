@@ -92,6 +92,10 @@ package body Ocarina.Backends.REAL is
 
    Root_System : Node_Id;
 
+   Last_Elements : Element_Results.Vector;
+   --  Results for each element of the range set, computed by the
+   --  last call to Apply_To_All_Elements
+
    --  Buffer for runtime instance
 
    type Runtime_Instance is record
@@ -328,7 +332,9 @@ package body Ocarina.Backends.REAL is
                    (Referenced_Set
                       (Set_Reference
                          (Range_Variable (Range_Declaration (R))))))));
-      Success : Boolean := True;
+      Success  : Boolean := True;
+      Element_Success : Boolean;
+      Elements : Element_Results.Vector;
    begin
       --  For each element of the global ("range") set, we build the
       --  dependant sets and then we check the verification expression
@@ -356,13 +362,22 @@ package body Ocarina.Backends.REAL is
          Set_Var_Value
            (Referenced_Var (Variable_Ref (Range_Declaration (R))),
             New_Elem_Value (Current_Range_Variable));
-         Build_All_Objects (R, Success);
-         if Success then
-            Success := Manage_Check_Expression (R);
+         Build_All_Objects (R, Element_Success);
+         if Element_Success then
+            Element_Success := Manage_Check_Expression (R);
          end if;
-         Write_Line (" => Result: " & Success'Img);
+         Write_Line (" => Result: " & Element_Success'Img);
          Write_Line ("");
-         exit when not Success;
+         Element_Results.Append
+           (Elements,
+            (Element => Current_Range_Variable, Success => Element_Success));
+         Success := Success and then Element_Success;
+
+         --  A single theorem stops at its first failing element,
+         --  whereas theorems checked together report every element
+
+         exit when not Success
+           and then Ocarina.Analyzer.REAL.Main_Theorems = null;
       end loop;
 
       if Force_Result_To_False then
@@ -379,6 +394,7 @@ package body Ocarina.Backends.REAL is
          " is: " &
          Boolean'Image (Success));
       Write_Line ("");
+      Last_Elements := Elements;
       return Success;
    end Apply_To_All_Elements;
 
@@ -3205,6 +3221,8 @@ package body Ocarina.Backends.REAL is
       Fd : File_Descriptor;
 
    begin
+      Theorem_Results.Clear (Results);
+
       Root_System := Instantiate_Model (AADL_Root);
       Exit_On_Error (No (AADL_Root), "Cannot instantiate AADL models");
 
@@ -3242,10 +3260,20 @@ package body Ocarina.Backends.REAL is
               ("theorem " &
                Get_Name_String (RN.Name (RN.Identifier (RNU.REAL_Root))) &
                " is: FALSE");
+            Theorem_Results.Append
+              (Results,
+               (Theorem  => RN.Name (RN.Identifier (RNU.REAL_Root)),
+                Success  => False,
+                Elements => Element_Results.Empty_Vector));
 
          else
             Initialize_Sets_Table (RNU.REAL_Root);
-            Apply_To_All_Elements (RNU.REAL_Root);
+            Success := Apply_To_All_Elements (RNU.REAL_Root);
+            Theorem_Results.Append
+              (Results,
+               (Theorem  => RN.Name (RN.Identifier (RNU.REAL_Root)),
+                Success  => Success,
+                Elements => Last_Elements));
             Clean_Runtime;
          end if;
          Write_Line ("");
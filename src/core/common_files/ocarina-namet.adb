@@ -406,6 +406,24 @@ package body Ocarina.Namet is
       end loop;
    end Initialize;
 
+   ----------------------
+   -- Name_Chars_Count --
+   ----------------------
+
+   function Name_Chars_Count return Nat is
+   begin
+      return Nat (Name_Chars.Last - Name_Chars.First + 1);
+   end Name_Chars_Count;
+
+   ------------------------
+   -- Name_Entries_Count --
+   ------------------------
+
+   function Name_Entries_Count return Nat is
+   begin
+      return Nat (Name_Entries.Last - Name_Entries.First + 1);
+   end Name_Entries_Count;
+
    ----------------
    -- Name_Enter --
    ----------------
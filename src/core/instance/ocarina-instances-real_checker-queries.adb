@@ -63,6 +63,25 @@ package body Ocarina.Instances.REAL_Checker.Queries is
      (E           : Node_Id;
       Component_T : Instance_Type) return Boolean;
 
+   function Compute_Instances_Of_Component_Type
+     (Component_T : Instance_Type) return Result_Set;
+   --  Search in the instance tree for instances of a given type
+
+   function Copy (S : Result_Set) return Result_Set;
+   --  Return a new set with the elements of S
+
+   --  The sets of instances of each type are computed once per
+   --  instance tree, and shared by all the theorems evaluated on it:
+   --  they are cached until the next call to Init, or until
+   --  Root_Instance changes.
+
+   Instance_Sets      : array (Instance_Type) of Result_Set;
+   Instance_Set_Valid : array (Instance_Type) of Boolean :=
+     (others => False);
+   Instance_Sets_Root : Node_Id := No_Node;
+
+   procedure Invalidate_Instance_Sets;
+
    ------------------
    -- Is_Component --
    ------------------
@@ -146,6 +165,30 @@ package body Ocarina.Instances.REAL_Checker.Queries is
    function Get_Instances_Of_Component_Type
      (Component_T : Instance_Type) return Result_Set
    is
+   begin
+      if Instance_Sets_Root /= Root_Instance then
+         Invalidate_Instance_Sets;
+         Instance_Sets_Root := Root_Instance;
+      end if;
+
+      if not Instance_Set_Valid (Component_T) then
+         Instance_Sets (Component_T) :=
+           Compute_Instances_Of_Component_Type (Component_T);
+         Instance_Set_Valid (Component_T) := True;
+      end if;
+
+      --  Return a copy, as callers may add elements to the set
+
+      return Copy (Instance_Sets (Component_T));
+   end Get_Instances_Of_Component_Type;
+
+   -----------------------------------------
+   -- Compute_Instances_Of_Component_Type --
+   -----------------------------------------
+
+   function Compute_Instances_Of_Component_Type
+     (Component_T : Instance_Type) return Result_Set
+   is
 
       function Find_Subprogram_Declaration
         (E   : Node_Id;
@@ -217,7 +260,7 @@ package body Ocarina.Instances.REAL_Checker.Queries is
       end loop;
 
       return Results;
-   end Get_Instances_Of_Component_Type;
+   end Compute_Instances_Of_Component_Type;
 
    -------------------------------------
    -- Get_Instances_Of_Component_Type --
@@ -549,6 +592,36 @@ package body Ocarina.Instances.REAL_Checker.Queries is
    procedure Init (Root : Node_Id) is
    begin
       Root_Instance := Root;
+      Invalidate_Instance_Sets;
+      Instance_Sets_Root := Root;
    end Init;
 
+   ------------------------------
+   -- Invalidate_Instance_Sets --
+   ------------------------------
+
+   procedure Invalidate_Instance_Sets is
+   begin
+      for T in Instance_Type loop
+         if Instance_Set_Valid (T) then
+            Free (Instance_Sets (T));
+            Instance_Set_Valid (T) := False;
+         end if;
+      end loop;
+   end Invalidate_Instance_Sets;
+
+   ----------
+   -- Copy --
+   ----------
+
+   function Copy (S : Result_Set) return Result_Set is
+      Result : Result_Set;
+   begin
+      Init (Result);
+      for N in First .. Last (S) loop
+         Append (Result, S.Table (N));
+      end loop;
+      return Result;
+   end Copy;
+
 end Ocarina.Instances.REAL_Checker.Queries;
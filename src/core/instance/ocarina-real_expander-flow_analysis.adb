@@ -519,6 +519,24 @@ package body Ocarina.REAL_Expander.Flow_Analysis is
       end loop;
    end Store_Flows;
 
+   ----------------
+   -- Flow_Count --
+   ----------------
+
+   function Flow_Count return Natural is
+   begin
+      return Flow.Last (End_To_End_Flows);
+   end Flow_Count;
+
+   -------------------
+   -- Flow_Elements --
+   -------------------
+
+   function Flow_Elements (Index : Positive) return List_Id is
+   begin
+      return End_To_End_Flows.Table (Index).List;
+   end Flow_Elements;
+
    -----------
    -- Reset --
    -----------
@@ -175,11 +175,37 @@ package body Ocarina.Analyzer.REAL is
       A  : Node_Id;
       T  : Node_Id;
       It : Natural := RNU.Node_List.First;
+
+      procedure Append_Library_Theorem (Theorem_Name : Name_Id);
+      --  Append the library theorems named Theorem_Name to the list
+      --  of theorems to be run
+
+      ----------------------------
+      -- Append_Library_Theorem --
+      ----------------------------
+
+      procedure Append_Library_Theorem (Theorem_Name : Name_Id) is
+      begin
+         for J in RNU.Node_List.First .. RNU.Node_List.Last (Library_Theorems)
+         loop
+            A := Library_Theorems.Table (J).Node;
+
+            if Theorem_Name = Name (Identifier (A)) then
+               N.Node := A;
+               Set_Related_Entity (N.Node, AADL_Root);
+
+               --  Append to the list of theorems to be run
+
+               RNU.Node_List.Append (To_Run_Theorem_List, N);
+            end if;
+         end loop;
+      end Append_Library_Theorem;
+
    begin
       --  XXX The list of theorem to be checked should be computed
       --  from the instance tree instead
 
-      if Main_Theorem = No_Name then
+      if Main_Theorem = No_Name and then Main_Theorems = null then
          --  We walk through all annex clauses to build the list of
          --  theorems to be checked.
 
@@ -210,23 +236,17 @@ package body Ocarina.Analyzer.REAL is
 
       else
          --  Otherwise, iterate over Library theorems and fetch the
-         --  corresponding theorem.
+         --  corresponding theorems, in the order they were requested.
 
          RNU.Node_List.Init (To_Run_Theorem_List); --  Reset list of theorems
 
-         for J in RNU.Node_List.First .. RNU.Node_List.Last (Library_Theorems)
-         loop
-            A := Library_Theorems.Table (J).Node;
-
-            if Main_Theorem = Name (Identifier (A)) then
-               N.Node := A;
-               Set_Related_Entity (N.Node, AADL_Root);
-
-               --  Append to the list of theorems to be run
-
-               RNU.Node_List.Append (To_Run_Theorem_List, N);
-            end if;
-         end loop;
+         if Main_Theorems = null then
+            Append_Library_Theorem (Main_Theorem);
+         else
+            for K in Main_Theorems'Range loop
+               Append_Library_Theorem (Main_Theorems (K));
+            end loop;
+         end if;
       end if;
    end Build_Theorem_List;
 
@@ -43,8 +43,18 @@ with Ocarina.ME_AADL.AADL_Instances.Entities;
 with Ocarina.ME_AADL.AADL_Instances.Nutils;
 
 with Ocarina.Instances.Finder;
+with Ocarina.REAL_Expander.Flow_Analysis;
+with Ocarina.Backends.Properties.Utils;
 
+with GNAT.OS_Lib;                use GNAT.OS_Lib;
+
+with Ada.Containers.Hashed_Maps;
+with Ada.Containers.Hashed_Sets;
+with Ada.Containers.Indefinite_Hashed_Maps;
 with Ada.Strings.Equal_Case_Insensitive;
+with Ada.Strings.Hash_Case_Insensitive;
+
+with Ocarina.Property_Cache;
 
 package body Ocarina.Lmp is
 
@@ -55,6 +65,112 @@ package body Ocarina.Lmp is
    package AIE renames Ocarina.ME_AADL.AADL_Instances.Entities;
    package AINU renames Ocarina.ME_AADL.AADL_Instances.Nutils;
 
+   type Category_Vectors is array (Ocarina.ME_AADL.Component_Category)
+     of Node_Vectors.Vector;
+
+   type Category_Index is record
+      Serial     : Integer := -1;
+      All_Nodes  : Node_Vectors.Vector;
+      Categories : Category_Vectors;
+   end record;
+   --  Component types, implementations or instances, sorted by
+   --  category. Serial is the serial number of the tree the index
+   --  was built from, see Ocarina.Utils.
+
+   Type_Index           : Category_Index;
+   Implementation_Index : Category_Index;
+   Instance_Index       : Category_Index;
+
+   Connection_Graph        : Node_Vectors.Vector;
+   Connection_Graph_Serial : Integer := -1;
+   --  Flat list returned by Get_Connection_Graph, and serial number of
+   --  the instance tree it was built from
+
+   End_To_End_Flows        : Node_Vectors.Vector;
+   End_To_End_Flows_Serial : Integer := -1;
+   --  Flat list returned by Get_End_To_End_Flows, and serial number of
+   --  the instance tree the flows were explored in
+
+   function Hash (N : Node_Id) return Ada.Containers.Hash_Type is
+     (Ada.Containers.Hash_Type'Mod (N));
+
+   package Full_Name_Maps is new Ada.Containers.Hashed_Maps
+     (Key_Type        => Node_Id,
+      Element_Type    => Name_Id,
+      Hash            => Hash,
+      Equivalent_Keys => "=");
+
+   package Node_Maps is new Ada.Containers.Indefinite_Hashed_Maps
+     (Key_Type        => String,
+      Element_Type    => Node_Id,
+      Hash            => Ada.Strings.Hash_Case_Insensitive,
+      Equivalent_Keys => Ada.Strings.Equal_Case_Insensitive);
+
+   type Name_Index is record
+      Serial     : Integer := -1;
+      Nodes      : Node_Maps.Map;
+      Full_Names : Full_Name_Maps.Map;
+   end record;
+   --  Nodes by fully qualified name or instance path, and full names
+   --  by node, as returned by Get_Component_Fullname and
+   --  Get_Instance_Name
+
+   Declarative_Names : Name_Index;
+   Instance_Names    : Name_Index;
+
+   package Node_Sets is new Ada.Containers.Hashed_Sets
+     (Element_Type        => Node_Id,
+      Hash                => Hash,
+      Equivalent_Elements => "=");
+
+   type Axis_Kind is (Self_Axis, Child_Axis, Descendant_Axis);
+   type Test_Kind is (Any_Test, Category_Test, Name_Test);
+   type Predicate_Kind is (Has_Predicate, Equal_Predicate,
+      Not_Equal_Predicate);
+
+   type Predicate is record
+      Kind     : Predicate_Kind;
+      Property : Name_Id;
+      Value    : Name_Id;
+   end record;
+
+   package Predicate_Vectors is new Ada.Containers.Vectors
+     (Positive, Predicate);
+
+   type Step is record
+      Axis       : Axis_Kind;
+      Test       : Test_Kind;
+      Category   : Ocarina.ME_AADL.Component_Category;
+      Name       : Name_Id;
+      Predicates : Predicate_Vectors.Vector;
+   end record;
+   --  Compiled step of a path expression, see Select_Instances
+
+   package Step_Vectors is new Ada.Containers.Vectors (Positive, Step);
+
+   procedure Update_Declarative_Names;
+   procedure Update_Instance_Names;
+   --  Rebuild the corresponding name index if its tree has changed
+
+   procedure Build_Index
+     (Index     : in out Category_Index;
+      Nodes     : Node_List;
+      Instances : Boolean;
+      Serial    : Natural);
+   --  Fill Index in one pass over Nodes, a list of component types
+   --  and implementations, or of component instances if Instances is
+   --  set, chained by Next_Entity.
+
+   function Lookup (Index : Category_Index; Kind : String)
+      return Node_Vectors.Vector;
+   --  Return the nodes of Index whose category is Kind, or all nodes
+   --  if Kind is "all".
+
+   procedure Update_Type_Index;
+   procedure Update_Implementation_Index;
+   procedure Update_Instance_Index;
+   --  Rebuild the corresponding index if its tree has changed
+
    ------------------
    -- Get_Packages --
    ------------------
@@ -93,131 +209,22 @@ package body Ocarina.Lmp is
    -- Get_Component_Types --
    -------------------------
 
-   function Get_Component_Types (kind : String) return Node_List is
-      use Ocarina.ME_AADL;
-      EL : Node_List;
+   function Get_Component_Types (kind : String)
+      return Node_Vectors.Vector is
    begin
-      if Ada.Strings.Equal_Case_Insensitive (kind, "all") then
-         return Find_All_Component_Types (Get_AADL_Root);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "abstract") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Abstract);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "data") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Data);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "subprogram") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Subprogram);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "subprogram_group") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Subprogram_Group);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "thread") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Thread);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "thread_group") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Thread_Group);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "process") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Process);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "memory") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Memory);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "processor") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Processor);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "virtual_processor") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Virtual_Processor);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "bus") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Bus);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "virtual_bus") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Virtual_Bus);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "device") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_Device);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "system") then
-         return Filter_Component_By_Category (
-            Find_All_Component_Types (Get_AADL_Root), CC_System);
-      end if;
-      EL.First := No_Node;
-      EL.Last := No_Node;
-      return EL;
+      Update_Type_Index;
+      return Lookup (Type_Index, kind);
    end Get_Component_Types;
 
    -----------------------------------
    -- Get_Component_Implementations --
    -----------------------------------
 
-   function Get_Component_Implementations (kind : String) return Node_List is
-      use Ocarina.ME_AADL;
-      EL : Node_List;
+   function Get_Component_Implementations (kind : String)
+      return Node_Vectors.Vector is
    begin
-      if Ada.Strings.Equal_Case_Insensitive (kind, "all") then
-         return Find_All_Declarations (Get_AADL_Root,
-            (1 => ATN.K_Component_Implementation));
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "abstract") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Abstract);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "data") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Data);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "subprogram") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Subprogram);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "subprogram_group") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Subprogram_Group);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "thread") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Thread);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "thread_group") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Thread_Group);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "process") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Process);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "memory") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Memory);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "processor") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Processor);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "virtual_processor") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Virtual_Processor);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "bus") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Bus);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "virtual_bus") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Virtual_Bus);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "device") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_Device);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "system") then
-         return Filter_Component_By_Category (
-            Find_All_Declarations (Get_AADL_Root,
-               (1 => ATN.K_Component_Implementation)), CC_System);
-      end if;
-      EL.First := No_Node;
-      EL.Last := No_Node;
-      return EL;
+      Update_Implementation_Index;
+      return Lookup (Implementation_Index, kind);
    end Get_Component_Implementations;
 
    -----------------
@@ -496,60 +503,392 @@ package body Ocarina.Lmp is
    -- Get_Instances --
    -------------------
 
-   function Get_Instances (kind : String) return Node_List is
+   function Get_Instances (kind : String) return Node_Vectors.Vector is
+   begin
+      Update_Instance_Index;
+      return Lookup (Instance_Index, kind);
+   end Get_Instances;
+
+   -----------------------
+   -- Update_Type_Index --
+   -----------------------
+
+   procedure Update_Type_Index is
+   begin
+      if Type_Index.Serial /= Get_Declarative_Serial then
+         Build_Index
+           (Type_Index, Find_All_Component_Types (Get_AADL_Root),
+            False, Get_Declarative_Serial);
+      end if;
+   end Update_Type_Index;
+
+   ---------------------------------
+   -- Update_Implementation_Index --
+   ---------------------------------
+
+   procedure Update_Implementation_Index is
+   begin
+      if Implementation_Index.Serial /= Get_Declarative_Serial then
+         Build_Index
+           (Implementation_Index,
+            Find_All_Declarations (Get_AADL_Root,
+               (1 => ATN.K_Component_Implementation)),
+            False, Get_Declarative_Serial);
+      end if;
+   end Update_Implementation_Index;
+
+   ---------------------------
+   -- Update_Instance_Index --
+   ---------------------------
+
+   procedure Update_Instance_Index is
+   begin
+      if Instance_Index.Serial /= Get_Instance_Serial then
+         Build_Index
+           (Instance_Index, Find_All_Component_Instances (Get_AADL_Root),
+            True, Get_Instance_Serial);
+      end if;
+   end Update_Instance_Index;
+
+   -----------------
+   -- Build_Index --
+   -----------------
+
+   procedure Build_Index
+     (Index     : in out Category_Index;
+      Nodes     : Node_List;
+      Instances : Boolean;
+      Serial    : Natural)
+   is
       use Ocarina.ME_AADL;
-      EL : Node_List;
+      List_Node : Node_Id;
    begin
-      if Ada.Strings.Equal_Case_Insensitive (kind, "all") then
-         return Find_All_Component_Instances (Get_AADL_Root);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "abstract") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Abstract);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "data") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Data);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "subprogram") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Subprogram);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "subprogram_group") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Subprogram_Group);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "thread") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Thread);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "thread_group") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Thread_Group);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "process") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Process);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "memory") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Memory);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "processor") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Processor);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "virtual_processor") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root),
-               CC_Virtual_Processor);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "bus") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Bus);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "virtual_bus") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Virtual_Bus);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "device") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_Device);
-      elsif Ada.Strings.Equal_Case_Insensitive (kind, "system") then
-         return Filter_Instance_By_Category (
-            Find_All_Component_Instances (Get_AADL_Root), CC_System);
+      Index.All_Nodes.Clear;
+      for C in Component_Category loop
+         Index.Categories (C).Clear;
+      end loop;
+
+      --  Nodes are chained using Next_Entity, which is shared by all
+      --  lists built by the finders: we copy them in vectors so that
+      --  the index is not altered by later searches.
+
+      List_Node := Nodes.First;
+      while Present (List_Node) loop
+         Index.All_Nodes.Append (List_Node);
+         if Instances then
+            Index.Categories (AIE.Get_Category_Of_Component (List_Node))
+              .Append (List_Node);
+            List_Node := AIN.Next_Entity (List_Node);
+         else
+            Index.Categories (ATE.Get_Category_Of_Component (List_Node))
+              .Append (List_Node);
+            List_Node := ATN.Next_Entity (List_Node);
+         end if;
+      end loop;
+
+      Index.Serial := Serial;
+   end Build_Index;
+
+   ------------
+   -- Lookup --
+   ------------
+
+   function Lookup (Index : Category_Index; Kind : String)
+      return Node_Vectors.Vector
+   is
+      use Ocarina.ME_AADL;
+   begin
+      if Ada.Strings.Equal_Case_Insensitive (Kind, "all") then
+         return Index.All_Nodes;
       end if;
-      EL.First := No_Node;
-      EL.Last := No_Node;
-      return EL;
-   end Get_Instances;
+
+      for C in CC_Abstract .. CC_System loop
+         if Ada.Strings.Equal_Case_Insensitive
+           ("CC_" & Kind, Component_Category'Image (C))
+         then
+            return Index.Categories (C);
+         end if;
+      end loop;
+
+      return Node_Vectors.Empty_Vector;
+   end Lookup;
+
+   -----------------------
+   -- Return_Node_Slice --
+   -----------------------
+
+   procedure Return_Node_Slice
+     (Data  : in out Callback_Data'Class;
+      Index : Node_Index;
+      Kind  : String;
+      First : Positive;
+      Count : Natural)
+   is
+      use Ocarina.ME_AADL;
+
+      procedure Return_Slice (Nodes : Node_Vectors.Vector);
+      --  Nodes is passed by reference, Vector being a tagged type
+
+      procedure Return_Slice (Nodes : Node_Vectors.Vector) is
+         Last : constant Natural :=
+           Natural'Min (Natural (Nodes.Length), First + Count - 1);
+      begin
+         Set_Return_Value_As_List (Data);
+         for J in First .. Last loop
+            Set_Return_Value (Data, Integer (Nodes.Element (J)));
+         end loop;
+      end Return_Slice;
+
+      procedure Return_Slice (From : Category_Index);
+      --  Return the slice of the nodes of From whose category is Kind
+
+      procedure Return_Slice (From : Category_Index) is
+      begin
+         if Ada.Strings.Equal_Case_Insensitive (Kind, "all") then
+            Return_Slice (From.All_Nodes);
+            return;
+         end if;
+
+         for C in CC_Abstract .. CC_System loop
+            if Ada.Strings.Equal_Case_Insensitive
+              ("CC_" & Kind, Component_Category'Image (C))
+            then
+               Return_Slice (From.Categories (C));
+               return;
+            end if;
+         end loop;
+
+         Return_Slice (Node_Vectors.Empty_Vector);
+      end Return_Slice;
+
+   begin
+      case Index is
+         when Type_Nodes =>
+            Update_Type_Index;
+            Return_Slice (Type_Index);
+
+         when Implementation_Nodes =>
+            Update_Implementation_Index;
+            Return_Slice (Implementation_Index);
+
+         when Instance_Nodes =>
+            Update_Instance_Index;
+            Return_Slice (Instance_Index);
+      end case;
+   end Return_Node_Slice;
+
+   -----------------------
+   -- Get_Subtree_Slice --
+   -----------------------
+
+   procedure Get_Subtree_Slice
+     (Data          : in out Callback_Data'Class;
+      Root          : Node_Id;
+      Breadth_First : Boolean;
+      After         : Node_Id;
+      Count         : Natural)
+   is
+      function First_Child (N : Node_Id) return Node_Id;
+      --  Return the component instance of the first subcomponent of N
+      --  that has one, or No_Node
+
+      function Next_Sibling (N : Node_Id) return Node_Id;
+      --  Return the component instance of the next subcomponent of the
+      --  parent of N that has one, or No_Node
+
+      function Parent (N : Node_Id) return Node_Id;
+      --  Return the component instance that contains N, or No_Node
+
+      function Next_At_Depth
+        (N      : Node_Id;
+         Level  : Natural;
+         Target : Natural) return Node_Id;
+      --  Return the first node following N, at depth Level below
+      --  Root, in depth-first pre-order whose depth is Target, or
+      --  No_Node. Nodes deeper than Target are not visited.
+
+      procedure Advance (N : in out Node_Id; Level : in out Natural);
+      --  Move N, at depth Level below Root, to the next node in the
+      --  requested order, or to No_Node
+
+      -----------------
+      -- First_Child --
+      -----------------
+
+      function First_Child (N : Node_Id) return Node_Id is
+         List_Node : Node_Id;
+      begin
+         if AINU.Is_Empty (AIN.Subcomponents (N)) then
+            return No_Node;
+         end if;
+
+         List_Node := AIN.First_Node (AIN.Subcomponents (N));
+         while Present (List_Node) loop
+            if Present (AIN.Corresponding_Instance (List_Node)) then
+               return AIN.Corresponding_Instance (List_Node);
+            end if;
+            List_Node := AIN.Next_Node (List_Node);
+         end loop;
+         return No_Node;
+      end First_Child;
+
+      ------------------
+      -- Next_Sibling --
+      ------------------
+
+      function Next_Sibling (N : Node_Id) return Node_Id is
+         List_Node : Node_Id := AIN.Parent_Subcomponent (N);
+      begin
+         if No (List_Node) then
+            return No_Node;
+         end if;
+
+         List_Node := AIN.Next_Node (List_Node);
+         while Present (List_Node) loop
+            if Present (AIN.Corresponding_Instance (List_Node)) then
+               return AIN.Corresponding_Instance (List_Node);
+            end if;
+            List_Node := AIN.Next_Node (List_Node);
+         end loop;
+         return No_Node;
+      end Next_Sibling;
+
+      ------------
+      -- Parent --
+      ------------
+
+      function Parent (N : Node_Id) return Node_Id is
+      begin
+         if No (AIN.Parent_Subcomponent (N)) then
+            return No_Node;
+         end if;
+         return AIN.Parent_Component (AIN.Parent_Subcomponent (N));
+      end Parent;
+
+      -------------------
+      -- Next_At_Depth --
+      -------------------
+
+      function Next_At_Depth
+        (N      : Node_Id;
+         Level  : Natural;
+         Target : Natural) return Node_Id
+      is
+         M : Node_Id := N;
+         L : Natural := Level;
+         C : Node_Id;
+      begin
+         loop
+            if L < Target then
+               C := First_Child (M);
+            else
+               C := No_Node;
+            end if;
+
+            if Present (C) then
+               L := L + 1;
+            else
+               loop
+                  if M = Root then
+                     return No_Node;
+                  end if;
+                  C := Next_Sibling (M);
+                  exit when Present (C);
+                  M := Parent (M);
+                  L := L - 1;
+               end loop;
+            end if;
+
+            M := C;
+            if L = Target then
+               return M;
+            end if;
+         end loop;
+      end Next_At_Depth;
+
+      -------------
+      -- Advance --
+      -------------
+
+      procedure Advance (N : in out Node_Id; Level : in out Natural) is
+         M : Node_Id;
+      begin
+         if Breadth_First then
+
+            --  Nodes of the same depth follow each other in depth-first
+            --  pre-order; the first node of the next depth is searched
+            --  from Root.
+
+            M := Next_At_Depth (N, Level, Level);
+            if No (M) then
+               M := Next_At_Depth (Root, 0, Level + 1);
+               Level := Level + 1;
+            end if;
+            N := M;
+
+         else
+            M := First_Child (N);
+            while No (M) and then N /= Root loop
+               M := Next_Sibling (N);
+               N := Parent (N);
+            end loop;
+            N := M;
+         end if;
+      end Advance;
+
+      N     : Node_Id;
+      Level : Natural := 0;
+      Sent  : Natural := 0;
+   begin
+      Set_Return_Value_As_List (Data);
+      if No (Root) or else AIN.Kind (Root) /= AIN.K_Component_Instance
+        or else Count = 0
+      then
+         return;
+      end if;
+
+      if No (After) then
+         N := Root;
+      else
+         --  Find the depth of After; nothing follows a node outside of
+         --  the subtree
+
+         if AIN.Kind (After) /= AIN.K_Component_Instance then
+            return;
+         end if;
+         N := After;
+         while N /= Root loop
+            N := Parent (N);
+            if No (N) then
+               return;
+            end if;
+            Level := Level + 1;
+         end loop;
+
+         N := After;
+         Advance (N, Level);
+      end if;
+
+      while Present (N) loop
+         Set_Return_Value (Data, Integer (N));
+         Sent := Sent + 1;
+         exit when Sent = Count;
+         Advance (N, Level);
+      end loop;
+   end Get_Subtree_Slice;
+
+   ------------------
+   -- Return_Nodes --
+   ------------------
+
+   procedure Return_Nodes (Data : in out Callback_Data'Class;
+      Nodes : Node_Vectors.Vector) is
+   begin
+      Set_Return_Value_As_List (Data);
+      for N of Nodes loop
+         Set_Return_Value (Data, Integer (N));
+      end loop;
+   end Return_Nodes;
 
    ---------------------------------
    -- Filter_Instance_By_Category --
@@ -592,10 +931,19 @@ package body Ocarina.Lmp is
 
    procedure Get_Component_Fullname (Data : in out Callback_Data'Class;
       N : Node_Id) is
+      Position : Full_Name_Maps.Cursor;
    begin
-      Set_Return_Value (Data, ATE.Get_Name_Of_Entity (
-           ATN.Namespace (N), False) & "::"
-           & ATE.Get_Name_Of_Entity (N, True));
+      Update_Declarative_Names;
+      Position := Declarative_Names.Full_Names.Find (N);
+
+      if Full_Name_Maps.Has_Element (Position) then
+         Set_Return_Value
+           (Data, Namet.Get_Name_String (Full_Name_Maps.Element (Position)));
+      else
+         Set_Return_Value (Data, ATE.Get_Name_Of_Entity (
+              ATN.Namespace (N), False) & "::"
+              & ATE.Get_Name_Of_Entity (N, True));
+      end if;
    end Get_Component_Fullname;
 
    -----------------------
@@ -604,11 +952,597 @@ package body Ocarina.Lmp is
 
    procedure Get_Instance_Name (Data : in out Callback_Data'Class;
       N : Node_Id) is
+      Position : Full_Name_Maps.Cursor;
    begin
-      Set_Return_Value (Data, Namet.Get_Name_String (
-         AINU.Compute_Full_Name_Of_Instance (N)));
+      Update_Instance_Names;
+      Position := Instance_Names.Full_Names.Find (N);
+
+      if Full_Name_Maps.Has_Element (Position) then
+         Set_Return_Value
+           (Data, Namet.Get_Name_String (Full_Name_Maps.Element (Position)));
+      else
+         Set_Return_Value (Data, Namet.Get_Name_String (
+            AINU.Compute_Full_Name_Of_Instance (N)));
+      end if;
    end Get_Instance_Name;
 
+   ------------------------------
+   -- Update_Declarative_Names --
+   ------------------------------
+
+   procedure Update_Declarative_Names is
+
+      procedure Add (Nodes : Node_Vectors.Vector);
+
+      ---------
+      -- Add --
+      ---------
+
+      procedure Add (Nodes : Node_Vectors.Vector) is
+         Full_Name : Name_Id;
+      begin
+         for N of Nodes loop
+            Full_Name := Namet.Get_String_Name
+              (ATE.Get_Name_Of_Entity (ATN.Namespace (N), False) & "::"
+               & ATE.Get_Name_Of_Entity (N, True));
+            Declarative_Names.Full_Names.Include (N, Full_Name);
+            Declarative_Names.Nodes.Include
+              (Namet.Get_Name_String (Full_Name), N);
+         end loop;
+      end Add;
+
+   begin
+      if Declarative_Names.Serial /= Get_Declarative_Serial then
+         Declarative_Names.Nodes.Clear;
+         Declarative_Names.Full_Names.Clear;
+
+         Update_Type_Index;
+         Update_Implementation_Index;
+         Add (Type_Index.All_Nodes);
+         Add (Implementation_Index.All_Nodes);
+
+         Declarative_Names.Serial := Get_Declarative_Serial;
+      end if;
+   end Update_Declarative_Names;
+
+   ---------------------------
+   -- Update_Instance_Names --
+   ---------------------------
+
+   procedure Update_Instance_Names is
+
+      procedure Visit (N : Node_Id; Path : String);
+
+      -----------
+      -- Visit --
+      -----------
+
+      procedure Visit (N : Node_Id; Path : String) is
+         List_Node : Node_Id;
+      begin
+         Instance_Names.Nodes.Include (Path, N);
+         Instance_Names.Full_Names.Include
+           (N, AINU.Compute_Full_Name_Of_Instance (N));
+
+         if not AINU.Is_Empty (AIN.Subcomponents (N)) then
+            List_Node := AIN.First_Node (AIN.Subcomponents (N));
+            while Present (List_Node) loop
+               if Present (AIN.Corresponding_Instance (List_Node)) then
+                  Visit (AIN.Corresponding_Instance (List_Node),
+                         Path & "."
+                         & String'(AIE.Get_Name_Of_Entity (List_Node)));
+               end if;
+               List_Node := AIN.Next_Node (List_Node);
+            end loop;
+         end if;
+      end Visit;
+
+      Root : constant Node_Id := Get_AADL_Root;
+   begin
+      if Instance_Names.Serial /= Get_Instance_Serial then
+         Instance_Names.Nodes.Clear;
+         Instance_Names.Full_Names.Clear;
+
+         if Present (Root)
+           and then AIN.Kind (Root) = AIN.K_Architecture_Instance
+           and then Present (AIN.Root_System (Root))
+         then
+            Visit (AIN.Root_System (Root),
+                   String'(AIE.Get_Name_Of_Entity (AIN.Root_System (Root))));
+         end if;
+
+         Instance_Names.Serial := Get_Instance_Serial;
+      end if;
+   end Update_Instance_Names;
+
+   ---------------
+   -- Find_Node --
+   ---------------
+
+   function Find_Node (Name : String) return Node_Id is
+      Position : Node_Maps.Cursor;
+   begin
+      Update_Declarative_Names;
+      Position := Declarative_Names.Nodes.Find (Name);
+      if Node_Maps.Has_Element (Position) then
+         return Node_Maps.Element (Position);
+      end if;
+
+      Update_Instance_Names;
+      Position := Instance_Names.Nodes.Find (Name);
+      if Node_Maps.Has_Element (Position) then
+         return Node_Maps.Element (Position);
+      end if;
+
+      return No_Node;
+   end Find_Node;
+
+   ------------------
+   -- Get_Children --
+   ------------------
+
+   procedure Get_Children (Data : in out Callback_Data'Class;
+      N : Node_Id) is
+      List_Node : Node_Id;
+   begin
+      if AINU.Is_Empty (AIN.Subcomponents (N)) then
+         Set_Return_Value (Data, 0);
+         return;
+      end if;
+
+      Set_Return_Value (Data, AINU.Length (AIN.Subcomponents (N)));
+      List_Node := AIN.First_Node (AIN.Subcomponents (N));
+      while Present (List_Node) loop
+         Set_Return_Value (Data, Integer
+            (AIN.Corresponding_Instance (List_Node)));
+         List_Node := AIN.Next_Node (List_Node);
+      end loop;
+   end Get_Children;
+
+   --------------------------
+   -- Get_Connection_Graph --
+   --------------------------
+
+   procedure Get_Connection_Graph (Data : in out Callback_Data'Class) is
+
+      function Owner (E : Node_Id) return Node_Id;
+      --  Return the component instance that owns the connection end E
+
+      -----------
+      -- Owner --
+      -----------
+
+      function Owner (E : Node_Id) return Node_Id is
+      begin
+         case AIN.Kind (E) is
+            when AIN.K_Port_Spec_Instance
+              | AIN.K_Feature_Group_Spec_Instance
+              | AIN.K_Subprogram_Spec_Instance
+              | AIN.K_Parameter_Instance
+              | AIN.K_Subcomponent_Access_Instance =>
+               return AIN.Parent_Component (E);
+
+            when AIN.K_Subcomponent_Instance =>
+               return AIN.Corresponding_Instance (E);
+
+            when AIN.K_Component_Instance =>
+               return E;
+
+            when others =>
+               return No_Node;
+         end case;
+      end Owner;
+
+      C        : Node_Id;
+      Src, Dst : Node_Id;
+   begin
+      if Connection_Graph_Serial /= Get_Instance_Serial then
+         Connection_Graph.Clear;
+
+         for Component of Get_Instances ("all") loop
+            if not AINU.Is_Empty (AIN.Connections (Component)) then
+               C := AIN.First_Node (AIN.Connections (Component));
+               while Present (C) loop
+                  if AIN.Kind (C) = AIN.K_Connection_Instance then
+                     Src := AIE.Get_Referenced_Entity (AIN.Source (C));
+                     Dst := AIE.Get_Referenced_Entity (AIN.Destination (C));
+                     Connection_Graph.Append (C);
+                     Connection_Graph.Append (Src);
+                     Connection_Graph.Append (Dst);
+                     Connection_Graph.Append (Owner (Src));
+                     Connection_Graph.Append (Owner (Dst));
+                  end if;
+                  C := AIN.Next_Node (C);
+               end loop;
+            end if;
+         end loop;
+
+         Connection_Graph_Serial := Get_Instance_Serial;
+      end if;
+
+      Set_Return_Value_As_List (Data);
+      for N of Connection_Graph loop
+         Set_Return_Value (Data, Integer (N));
+      end loop;
+   end Get_Connection_Graph;
+
+   --------------------------
+   -- Get_End_To_End_Flows --
+   --------------------------
+
+   procedure Get_End_To_End_Flows (Data : in out Callback_Data'Class) is
+      use Ocarina.REAL_Expander.Flow_Analysis;
+
+      Root : constant Node_Id := Get_AADL_Root;
+      L    : List_Id;
+      P    : Node_Id;
+   begin
+      if No (Root) or else AIN.Kind (Root) /= AIN.K_Architecture_Instance
+      then
+         Set_Return_Value_As_List (Data);
+         return;
+      end if;
+
+      --  The flows are explored once per instance tree and kept in a
+      --  local list, rather than stored in the root system with
+      --  Store_Flows: a query must not modify the instance tree.
+
+      if End_To_End_Flows_Serial /= Get_Instance_Serial then
+         End_To_End_Flows.Clear;
+         Explore_Flows;
+
+         for I in 1 .. Flow_Count loop
+            L := Flow_Elements (I);
+            if not AINU.Is_Empty (L) then
+               End_To_End_Flows.Append (Node_Id (AINU.Length (L)));
+               P := AIN.First_Node (L);
+               while Present (P) loop
+                  End_To_End_Flows.Append (AIN.Corresponding_Entity (P));
+                  P := AIN.Next_Node (P);
+               end loop;
+            end if;
+         end loop;
+
+         End_To_End_Flows_Serial := Get_Instance_Serial;
+      end if;
+
+      Set_Return_Value_As_List (Data);
+      for N of End_To_End_Flows loop
+         Set_Return_Value (Data, Integer (N));
+      end loop;
+   end Get_End_To_End_Flows;
+
+   ----------------------------
+   -- Snapshot_Instance_Tree --
+   ----------------------------
+
+   procedure Snapshot_Instance_Tree (Data : in out Callback_Data'Class;
+      Root : Node_Id) is
+      use Ocarina.ME_AADL;
+
+      Count : Integer := 0;
+
+      procedure Visit (N : Node_Id; Parent : Integer);
+
+      -----------
+      -- Visit --
+      -----------
+
+      procedure Visit (N : Node_Id; Parent : Integer) is
+         Index     : constant Integer := Count;
+         List_Node : Node_Id;
+      begin
+         Count := Count + 1;
+
+         Set_Return_Value (Data, Integer (N));
+         Set_Return_Value (Data, Parent);
+         Set_Return_Value (Data, Component_Category'Pos
+            (AIE.Get_Category_Of_Component (N)));
+
+         if Present (AIN.Parent_Subcomponent (N)) then
+            Set_Return_Value (Data, String'(AIE.Get_Name_Of_Entity
+               (AIN.Parent_Subcomponent (N))));
+         else
+            Set_Return_Value (Data, String'(AIE.Get_Name_Of_Entity (N)));
+         end if;
+
+         Set_Return_Value (Data, String'(ATE.Get_Name_Of_Entity
+            (AIN.Corresponding_Declaration (N), True, True)));
+
+         if AINU.Is_Empty (AIN.Properties (N)) then
+            Set_Return_Value (Data, 0);
+         else
+            Set_Return_Value (Data, AINU.Length (AIN.Properties (N)));
+            List_Node := AIN.First_Node (AIN.Properties (N));
+            while Present (List_Node) loop
+               declare
+                  Result : String_List :=
+                    Ocarina.Backends.Properties.Utils.Check_And_Get_Property
+                    (N, List_Node);
+               begin
+                  Set_Return_Value (Data, Result'Length);
+                  for Elt of Result loop
+                     Set_Return_Value (Data, Elt.all);
+                     Free (Elt);
+                  end loop;
+               end;
+               List_Node := AIN.Next_Node (List_Node);
+            end loop;
+         end if;
+
+         if not AINU.Is_Empty (AIN.Subcomponents (N)) then
+            List_Node := AIN.First_Node (AIN.Subcomponents (N));
+            while Present (List_Node) loop
+               if Present (AIN.Corresponding_Instance (List_Node)) then
+                  Visit (AIN.Corresponding_Instance (List_Node), Index);
+               end if;
+               List_Node := AIN.Next_Node (List_Node);
+            end loop;
+         end if;
+      end Visit;
+
+   begin
+      Set_Return_Value_As_List (Data);
+      Visit (Root, -1);
+   end Snapshot_Instance_Tree;
+
+   ----------------------
+   -- Select_Instances --
+   ----------------------
+
+   procedure Select_Instances
+     (Data  : in out Callback_Data'Class;
+      Query : List_Instance'Class)
+   is
+      use Ocarina.ME_AADL;
+
+      Steps    : Step_Vectors.Vector;
+      Position : Positive := 1;
+      Current  : Node_Vectors.Vector;
+      Selected : Node_Vectors.Vector;
+      Visited  : Node_Sets.Set;
+      Root     : constant Node_Id := Get_AADL_Root;
+
+      function Next_Arg return String;
+      function Next_Arg return Integer;
+      --  Return the next element of Query
+
+      function Matches (N : Node_Id; S : Step) return Boolean;
+      --  Return True if the component instance N passes the test and
+      --  the predicates of S
+
+      procedure Add_Descendants (N : Node_Id; S : Step);
+      --  Append to Selected the descendants of N that match S, unless
+      --  they have already been visited for this step
+
+      procedure Add_Matching (Nodes : Node_Vectors.Vector; S : Step);
+      --  Append to Selected the elements of Nodes that match S
+
+      --------------
+      -- Next_Arg --
+      --------------
+
+      function Next_Arg return String is
+      begin
+         Position := Position + 1;
+         return Nth_Arg (Query, Position - 1);
+      end Next_Arg;
+
+      function Next_Arg return Integer is
+      begin
+         Position := Position + 1;
+         return Nth_Arg (Query, Position - 1);
+      end Next_Arg;
+
+      -------------
+      -- Matches --
+      -------------
+
+      function Matches (N : Node_Id; S : Step) return Boolean is
+      begin
+         case S.Test is
+            when Any_Test =>
+               null;
+
+            when Category_Test =>
+               if AIE.Get_Category_Of_Component (N) /= S.Category then
+                  return False;
+               end if;
+
+            when Name_Test =>
+               if Present (AIN.Parent_Subcomponent (N)) then
+                  if Name_Id'(AIE.Get_Name_Of_Entity
+                    (AIN.Parent_Subcomponent (N), False)) /= S.Name
+                  then
+                     return False;
+                  end if;
+               elsif Name_Id'(AIE.Get_Name_Of_Entity (N, False)) /= S.Name
+               then
+                  return False;
+               end if;
+         end case;
+
+         for P of S.Predicates loop
+            declare
+               Result : constant String_List_Access :=
+                 Ocarina.Property_Cache.Get_Property (N, P.Property);
+               Defined : constant Boolean :=
+                 not (Result'Length = 2
+                      and then Result (Result'Last).all = " KO");
+               Found   : Boolean := False;
+            begin
+               if not Defined then
+                  return False;
+               end if;
+
+               if P.Kind /= Has_Predicate then
+                  for J in Result'First + 1 .. Result'Last loop
+                     if Ada.Strings.Equal_Case_Insensitive
+                       (Result (J).all, Namet.Get_Name_String (P.Value))
+                     then
+                        Found := True;
+                        exit;
+                     end if;
+                  end loop;
+
+                  if Found /= (P.Kind = Equal_Predicate) then
+                     return False;
+                  end if;
+               end if;
+            end;
+         end loop;
+
+         return True;
+      end Matches;
+
+      ---------------------
+      -- Add_Descendants --
+      ---------------------
+
+      procedure Add_Descendants (N : Node_Id; S : Step) is
+         List_Node : Node_Id;
+         Child     : Node_Id;
+      begin
+         if AINU.Is_Empty (AIN.Subcomponents (N)) then
+            return;
+         end if;
+
+         List_Node := AIN.First_Node (AIN.Subcomponents (N));
+         while Present (List_Node) loop
+            Child := AIN.Corresponding_Instance (List_Node);
+            if Present (Child) and then not Visited.Contains (Child) then
+               Visited.Insert (Child);
+               if Matches (Child, S) then
+                  Selected.Append (Child);
+               end if;
+               if S.Axis = Descendant_Axis then
+                  Add_Descendants (Child, S);
+               end if;
+            end if;
+            List_Node := AIN.Next_Node (List_Node);
+         end loop;
+      end Add_Descendants;
+
+      ------------------
+      -- Add_Matching --
+      ------------------
+
+      procedure Add_Matching (Nodes : Node_Vectors.Vector; S : Step) is
+      begin
+         for N of Nodes loop
+            if Matches (N, S) then
+               Selected.Append (N);
+            end if;
+         end loop;
+      end Add_Matching;
+
+   begin
+      --  Decode all the steps first, so that Query is read only once
+
+      while Position <= Number_Of_Arguments (Query) loop
+         declare
+            S          : Step;
+            Axis       : constant String := Next_Arg;
+            Test       : constant String := Next_Arg;
+            Test_Value : constant String := Next_Arg;
+            Count      : constant Integer := Next_Arg;
+         begin
+            if Axis = "self" then
+               S.Axis := Self_Axis;
+            elsif Axis = "child" then
+               S.Axis := Child_Axis;
+            else
+               S.Axis := Descendant_Axis;
+            end if;
+
+            if Test = "category" then
+               S.Test := Category_Test;
+               S.Category := CC_Unknown;
+               for C in Component_Category loop
+                  if Ada.Strings.Equal_Case_Insensitive
+                    ("CC_" & Test_Value, Component_Category'Image (C))
+                  then
+                     S.Category := C;
+                  end if;
+               end loop;
+            elsif Test = "name" then
+               S.Test := Name_Test;
+               S.Name := Namet.Get_String_Name (Test_Value);
+            else
+               S.Test := Any_Test;
+            end if;
+
+            for J in 1 .. Count loop
+               declare
+                  P        : Predicate;
+                  Operator : constant String := Next_Arg;
+                  Property : constant String := Next_Arg;
+                  Value    : constant String := Next_Arg;
+               begin
+                  if Operator = "has" then
+                     P.Kind := Has_Predicate;
+                  elsif Operator = "=" then
+                     P.Kind := Equal_Predicate;
+                  else
+                     P.Kind := Not_Equal_Predicate;
+                  end if;
+                  P.Property := Namet.Get_String_Name (Property);
+                  P.Value := Namet.Get_String_Name (Value);
+                  S.Predicates.Append (P);
+               end;
+            end loop;
+
+            Steps.Append (S);
+         end;
+      end loop;
+
+      if No (Root)
+        or else AIN.Kind (Root) /= AIN.K_Architecture_Instance
+        or else No (AIN.Root_System (Root))
+        or else Steps.Is_Empty
+      then
+         Return_Nodes (Data, Current);
+         return;
+      end if;
+
+      for J in Steps.First_Index .. Steps.Last_Index loop
+         declare
+            S : constant Step := Steps.Element (J);
+         begin
+            Selected.Clear;
+            Visited.Clear;
+
+            if S.Axis = Self_Axis then
+               Current.Clear;
+               Current.Append (AIN.Root_System (Root));
+               Add_Matching (Current, S);
+
+            elsif J = Steps.First_Index then
+               --  A leading "//": filter the index of all component
+               --  instances built by the instance finder, rather than
+               --  walking the tree.
+
+               Update_Instance_Index;
+               if S.Test = Category_Test then
+                  Add_Matching (Instance_Index.Categories (S.Category), S);
+               else
+                  Add_Matching (Instance_Index.All_Nodes, S);
+               end if;
+
+            else
+               for N of Current loop
+                  Add_Descendants (N, S);
+               end loop;
+            end if;
+         end;
+
+         Current := Selected;
+         exit when Current.Is_Empty;
+      end loop;
+
+      Return_Nodes (Data, Current);
+   end Select_Instances;
+
    ----------------------------------------
    -- Find_All_Component_Implementations --
    ----------------------------------------
@@ -0,0 +1,194 @@
+------------------------------------------------------------------------------
+--                                                                          --
+--                           OCARINA COMPONENTS                             --
+--                                                                          --
+--               O C A R I N A . P R O P E R T Y _ C A C H E                --
+--                                                                          --
+--                                 B o d y                                  --
+--                                                                          --
+--                      Copyright (C) 2016 ESA & ISAE.                      --
+--                                                                          --
+-- Ocarina  is free software; you can redistribute it and/or modify under   --
+-- terms of the  GNU General Public License as published  by the Free Soft- --
+-- ware  Foundation;  either version 3,  or (at your option) any later ver- --
+-- sion. Ocarina is distributed in the hope that it will be useful, but     --
+-- WITHOUT ANY WARRANTY; without even the implied warranty of               --
+-- MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.                     --
+--                                                                          --
+-- As a special exception under Section 7 of GPL version 3, you are granted --
+-- additional permissions described in the GCC Runtime Library Exception,   --
+-- version 3.1, as published by the Free Software Foundation.               --
+--                                                                          --
+-- You should have received a copy of the GNU General Public License and    --
+-- a copy of the GCC Runtime Library Exception along with this program;     --
+-- see the files COPYING3 and COPYING.RUNTIME respectively.  If not, see    --
+-- <http://www.gnu.org/licenses/>.                                          --
+--                                                                          --
+--                 Ocarina is maintained by the TASTE project               --
+--                      (taste-users@lists.tuxfamily.org)                   --
+--                                                                          --
+------------------------------------------------------------------------------
+
+with Ada.Containers.Doubly_Linked_Lists;
+with Ada.Containers.Hashed_Maps;
+
+with Ocarina.Backends.Properties.Utils;
+with Ocarina.Utils;                      use Ocarina.Utils;
+
+package body Ocarina.Property_Cache is
+
+   use Ada.Containers;
+
+   type Property_Key is record
+      Node      : Node_Id;
+      Property  : Node_Id;
+      Prop_Name : Name_Id;
+   end record;
+   --  A property is designated either by a property node, or by its
+   --  name; the other component is then No_Node or No_Name.
+
+   type Cache_Entry is record
+      Key   : Property_Key;
+      Value : String_List_Access;
+   end record;
+
+   package Entry_Lists is new Doubly_Linked_Lists (Cache_Entry);
+
+   function Hash (Key : Property_Key) return Hash_Type;
+
+   package Entry_Maps is new Hashed_Maps
+     (Key_Type        => Property_Key,
+      Element_Type    => Entry_Lists.Cursor,
+      Hash            => Hash,
+      Equivalent_Keys => "=",
+      "="             => Entry_Lists."=");
+
+   Entries : Entry_Lists.List;
+   --  Cached values, from the most to the least recently used
+
+   Positions : Entry_Maps.Map;
+   --  Position of each key in Entries
+
+   Declarative_Serial : Integer := -1;
+   Instance_Serial    : Integer := -1;
+   --  Serial numbers of the trees the cached values were computed on
+
+   function Get
+     (Key : Property_Key;
+      Compute : not null access function return String_List)
+     return String_List_Access;
+   --  Return the cached value for Key, computing it if needed
+
+   ----------
+   -- Hash --
+   ----------
+
+   function Hash (Key : Property_Key) return Hash_Type is
+   begin
+      return Hash_Type'Mod (Key.Node) * 16#9E37_79B9#
+        xor Hash_Type'Mod (Key.Property) * 16#85EB_CA6B#
+        xor Hash_Type'Mod (Key.Prop_Name);
+   end Hash;
+
+   ---------
+   -- Get --
+   ---------
+
+   function Get
+     (Key : Property_Key;
+      Compute : not null access function return String_List)
+     return String_List_Access
+   is
+      Position : Entry_Maps.Cursor;
+      Last     : Cache_Entry;
+   begin
+      if Declarative_Serial /= Get_Declarative_Serial
+        or else Instance_Serial /= Get_Instance_Serial
+      then
+         Clear;
+         Declarative_Serial := Get_Declarative_Serial;
+         Instance_Serial := Get_Instance_Serial;
+      end if;
+
+      Position := Positions.Find (Key);
+
+      if Entry_Maps.Has_Element (Position) then
+         --  Move the value to the front of the list, as the most
+         --  recently used one
+
+         Entries.Splice
+           (Before   => Entries.First,
+            Position => Entry_Maps.Element (Position));
+         return Entry_Lists.Element (Entries.First).Value;
+      end if;
+
+      if Natural (Entries.Length) >= Max_Entries then
+         Last := Entries.Last_Element;
+         Free (Last.Value);
+         Positions.Delete (Last.Key);
+         Entries.Delete_Last;
+      end if;
+
+      Entries.Prepend ((Key => Key, Value => new String_List'(Compute.all)));
+      Positions.Insert (Key, Entries.First);
+      return Entry_Lists.Element (Entries.First).Value;
+   end Get;
+
+   ------------------
+   -- Get_Property --
+   ------------------
+
+   function Get_Property
+     (E        : Node_Id;
+      Property : Node_Id) return String_List_Access
+   is
+      function Compute return String_List;
+
+      -------------
+      -- Compute --
+      -------------
+
+      function Compute return String_List is
+      begin
+         return Ocarina.Backends.Properties.Utils.Check_And_Get_Property
+           (E, Property);
+      end Compute;
+
+   begin
+      return Get ((E, Property, No_Name), Compute'Access);
+   end Get_Property;
+
+   function Get_Property
+     (E         : Node_Id;
+      Prop_Name : Name_Id) return String_List_Access
+   is
+      function Compute return String_List;
+
+      -------------
+      -- Compute --
+      -------------
+
+      function Compute return String_List is
+      begin
+         return Ocarina.Backends.Properties.Utils.Check_And_Get_Property
+           (E, Prop_Name);
+      end Compute;
+
+   begin
+      return Get ((E, No_Node, Prop_Name), Compute'Access);
+   end Get_Property;
+
+   -----------
+   -- Clear --
+   -----------
+
+   procedure Clear is
+   begin
+      for Cached of Entries loop
+         Free (Cached.Value);
+      end loop;
+      Entries.Clear;
+      Positions.Clear;
+   end Clear;
+
+end Ocarina.Property_Cache;
@@ -47,11 +47,20 @@ with Ocarina.Lmp;                use Ocarina.Lmp;
 with Ocarina.ME_AADL.AADL_Tree.Nodes.Python;
 with Ocarina.ME_AADL.AADL_Instances.Nodes.Python;
 with Ocarina.ME_AADL.AADL_Tree.Entities;
+with Ocarina.ME_AADL.AADL_Tree.Nodes;
+with Ocarina.ME_AADL.AADL_Tree.Nutils;
+with Ocarina.AADL_Values;
+with Ocarina.Instances.Queries;
+with Ocarina.Processor.Properties;
 
 with Ocarina.Namet; use Ocarina.Namet;
-with Ocarina.Backends.Properties.Utils;
+with Utils;
+with Ocarina.Property_Cache;
 with Ocarina.Backends.Utils;     use Ocarina.Backends.Utils;
+with Ocarina.Backends.REAL;
+with Ocarina.Analyzer.REAL;
 with GNAT.Os_Lib; use GNAT.Os_Lib;
+with Ada.Strings.Equal_Case_Insensitive;
 with Ocarina.ME_AADL.AADL_Instances.Nutils;
 with Ocarina.ME_AADL.AADL_Instances.Nodes;
 use Ocarina.ME_AADL.AADL_Instances.Nodes;
@@ -59,34 +68,53 @@ use Ocarina.ME_AADL.AADL_Instances.Nodes;
 package body Ocarina.Python_Cmd is
 
    package ATE renames Ocarina.ME_AADL.AADL_Tree.Entities;
+   package ATN renames Ocarina.ME_AADL.AADL_Tree.Nodes;
+   package ATNU renames Ocarina.ME_AADL.AADL_Tree.Nutils;
+   package AIQ renames Ocarina.Instances.Queries;
+   package OV renames Ocarina.AADL_Values;
    package ATNP renames Ocarina.ME_AADL.AADL_Tree.Nodes.Python;
    package AINP renames Ocarina.ME_AADL.AADL_Instances.Nodes.Python;
    package AINU renames Ocarina.ME_AADL.AADL_Instances.Nutils;
    procedure Get_Node_Id (Data : in out Callback_Data'Class; N : String);
    procedure Get_Property_Value (Data : in out Callback_Data'Class;
-      PropId : String; PropName : String);
+      E : Node_Id; Property : Node_Id);
    procedure Get_Property_Value_By_Name (Data : in out Callback_Data'Class;
-      PropId : String; PropName : String);
+      E : Node_Id; PropName : String);
+   procedure Get_Property_Values (Data : in out Callback_Data'Class;
+      Nodes : List_Instance'Class; PropName : String);
+   procedure Get_Typed_Property_Values (Data : in out Callback_Data'Class;
+      Nodes : List_Instance'Class; PropName : String);
+   procedure Return_Typed_Value (Data : in out Callback_Data'Class;
+      V : Node_Id);
+   --  Append to Data the property value V as a tag followed by its
+   --  content: "i" or "f" and the image of an integer or real number,
+   --  converted to the base unit of its units type; "s", "e" and a
+   --  string or enumeration literal; "b" and a Boolean; "r" or "c"
+   --  and the referenced instance or classifier; "R" and the two
+   --  bounds of a range; "L", the number of elements of a list and
+   --  its elements; "?" for values of other kinds.
+   function Nth_Node_Arg (Nodes : List_Instance'Class; N : Positive)
+      return Node_Id;
+   --  Return the N-th node of a list of node ids passed as integers
+   function Property_Name (PropName : String) return Name_Id;
+   --  Return the name of property PropName, in lower case, as used by
+   --  all the functions taking a property name
 
    ------------------------
    -- Get_Property_Value --
    ------------------------
 
    procedure Get_Property_Value (Data : in out Callback_Data'Class;
-                                 PropId : String; PropName : String)
+                                 E : Node_Id; Property : Node_Id)
    is
-      Result : constant String_List :=
-        Ocarina.Backends.Properties.Utils.Check_And_Get_Property
-        (Get_Node_Id_From_String (PropId),
-         Get_Node_Id_From_String (PropName));
+      Result : constant String_List_Access :=
+        Ocarina.Property_Cache.Get_Property (E, Property);
    begin
       Set_Return_Value_As_List (Data);
 
-      for Elt of Result loop
+      for Elt of Result.all loop
          Set_Return_Value (Data, Elt.all);
       end loop;
-
-      --  XXX should free Result
    end Get_Property_Value;
 
    --------------------------------
@@ -94,22 +122,198 @@ package body Ocarina.Python_Cmd is
    --------------------------------
 
    procedure Get_Property_Value_By_Name (Data : in out Callback_Data'Class;
-                                         PropId : String; PropName : String)
+                                         E : Node_Id; PropName : String)
    is
-      Result : constant String_List :=
-        Ocarina.Backends.Properties.Utils.Check_And_Get_Property
-        (Get_Node_Id_From_String (PropId),
-         Get_String_Name (PropName));
+      Result : constant String_List_Access :=
+        Ocarina.Property_Cache.Get_Property (E, Property_Name (PropName));
    begin
       Set_Return_Value_As_List (Data);
 
-      for Elt of Result loop
+      for Elt of Result.all loop
          Set_Return_Value (Data, Elt.all);
       end loop;
-
-      --  XXX should free Result
    end Get_Property_Value_By_Name;
 
+   -------------------------
+   -- Get_Property_Values --
+   -------------------------
+
+   procedure Get_Property_Values (Data : in out Callback_Data'Class;
+      Nodes : List_Instance'Class; PropName : String)
+   is
+      Prop_Name : constant Name_Id := Property_Name (PropName);
+   begin
+      Set_Return_Value_As_List (Data);
+
+      for J in 1 .. Number_Of_Arguments (Nodes) loop
+         declare
+            Result : constant String_List_Access :=
+              Ocarina.Property_Cache.Get_Property
+              (Nth_Node_Arg (Nodes, J), Prop_Name);
+         begin
+            Set_Return_Value (Data, Result'Length);
+            for Elt of Result.all loop
+               Set_Return_Value (Data, Elt.all);
+            end loop;
+         end;
+      end loop;
+   end Get_Property_Values;
+
+   -------------------------------
+   -- Get_Typed_Property_Values --
+   -------------------------------
+
+   procedure Get_Typed_Property_Values (Data : in out Callback_Data'Class;
+      Nodes : List_Instance'Class; PropName : String)
+   is
+      Prop_Name : constant Name_Id := Property_Name (PropName);
+      E         : Node_Id;
+      Values    : List_Id;
+      V         : Node_Id;
+   begin
+      Set_Return_Value_As_List (Data);
+
+      for J in 1 .. Number_Of_Arguments (Nodes) loop
+         E := Nth_Node_Arg (Nodes, J);
+
+         if AIQ.Is_Defined_List_Property (E, Prop_Name) then
+            Values := AIQ.Get_List_Property (E, Prop_Name);
+            Set_Return_Value (Data, "L");
+            Set_Return_Value (Data, ATNU.Length (Values));
+
+            if not ATNU.Is_Empty (Values) then
+               V := ATN.First_Node (Values);
+               while Present (V) loop
+                  Return_Typed_Value (Data, V);
+                  V := ATN.Next_Node (V);
+               end loop;
+            end if;
+
+         elsif AIQ.Is_Defined_Range_Property (E, Prop_Name) then
+            Return_Typed_Value (Data, AIQ.Get_Range_Property (E, Prop_Name));
+
+         elsif AIQ.Is_Defined_Property (E, Prop_Name) then
+            Return_Typed_Value
+              (Data, AIQ.Get_Value_Of_Property_Association (E, Prop_Name));
+
+         else
+            --  The property is not defined for this node
+
+            Set_Return_Value (Data, "n");
+         end if;
+      end loop;
+   end Get_Typed_Property_Values;
+
+   ------------------------
+   -- Return_Typed_Value --
+   ------------------------
+
+   procedure Return_Typed_Value (Data : in out Callback_Data'Class;
+      V : Node_Id)
+   is
+      procedure Return_Number (VT : OV.Value_Type);
+
+      -------------------
+      -- Return_Number --
+      -------------------
+
+      procedure Return_Number (VT : OV.Value_Type) is
+      begin
+         if VT.T = OV.LT_Integer then
+            Set_Return_Value (Data, "i");
+            Set_Return_Value
+              (Data, (if VT.ISign then "-" else "") & OV.Image (VT.IVal));
+         else
+            Set_Return_Value (Data, "f");
+            Set_Return_Value
+              (Data, (if VT.RSign then "-" else "") & OV.Image (VT.RVal));
+         end if;
+      end Return_Number;
+
+      VT : OV.Value_Type;
+   begin
+      case ATN.Kind (V) is
+         when ATN.K_Signed_AADLNumber =>
+            if Present (ATN.Unit_Identifier (V))
+              and then Present
+                (ATN.Corresponding_Entity (ATN.Unit_Identifier (V)))
+            then
+               Return_Number
+                 (OV.Get_Value_Type
+                    (ATN.Value
+                       (Ocarina.Processor.Properties.Convert_To_Base
+                          (ATN.Number_Value (V),
+                           ATN.Corresponding_Entity
+                             (ATN.Unit_Identifier (V))))));
+            else
+               Return_Number
+                 (OV.Get_Value_Type (ATN.Value (ATN.Number_Value (V))));
+            end if;
+
+         when ATN.K_Literal =>
+            VT := OV.Get_Value_Type (ATN.Value (V));
+
+            case VT.T is
+               when OV.LT_Integer | OV.LT_Real =>
+                  Return_Number (VT);
+
+               when OV.LT_String =>
+                  Set_Return_Value (Data, "s");
+                  Set_Return_Value (Data, Get_Name_String (VT.SVal));
+
+               when OV.LT_Boolean =>
+                  Set_Return_Value (Data, "b");
+                  Set_Return_Value (Data, VT.BVal);
+
+               when OV.LT_Enumeration =>
+                  Set_Return_Value (Data, "e");
+                  Set_Return_Value (Data, Get_Name_String (VT.EVal));
+            end case;
+
+         when ATN.K_Enumeration_Term =>
+            Set_Return_Value (Data, "e");
+            Set_Return_Value
+              (Data, Get_Name_String (ATN.Name (ATN.Identifier (V))));
+
+         when ATN.K_Number_Range_Term =>
+            Set_Return_Value (Data, "R");
+            Return_Typed_Value (Data, ATN.Lower_Bound (V));
+            Return_Typed_Value (Data, ATN.Upper_Bound (V));
+
+         when ATN.K_Reference_Term =>
+            Set_Return_Value (Data, "r");
+            Set_Return_Value
+              (Data, Integer (ATE.Get_Referenced_Entity (V)));
+
+         when ATN.K_Component_Classifier_Term =>
+            Set_Return_Value (Data, "c");
+            Set_Return_Value
+              (Data, Integer (ATE.Get_Referenced_Entity (V)));
+
+         when others =>
+            Set_Return_Value (Data, "?");
+      end case;
+   end Return_Typed_Value;
+
+   ------------------
+   -- Nth_Node_Arg --
+   ------------------
+
+   function Nth_Node_Arg (Nodes : List_Instance'Class; N : Positive)
+      return Node_Id is
+   begin
+      return Node_Id (Integer'(Nth_Arg (Nodes, N)));
+   end Nth_Node_Arg;
+
+   -------------------
+   -- Property_Name --
+   -------------------
+
+   function Property_Name (PropName : String) return Name_Id is
+   begin
+      return Standard.Utils.To_Lower (Get_String_Name (PropName));
+   end Property_Name;
+
    -----------------
    -- Get_Node_Id --
    -----------------
@@ -117,8 +321,7 @@ package body Ocarina.Python_Cmd is
    procedure Get_Node_Id (Data : in out Callback_Data'Class;
       N : String) is
    begin
-      Set_Return_Value (Data, Integer'Image (Integer
-         (Namet.Get_String_Name (N))));
+      Set_Return_Value (Data, Integer (Namet.Get_String_Name (N)));
    end Get_Node_Id;
 
    --------------
@@ -166,6 +369,77 @@ package body Ocarina.Python_Cmd is
       Ocarina.Utils.Print_Status;
    end On_Status;
 
+   -------------------
+   -- On_Get_Status --
+   -------------------
+
+   procedure On_Get_Status
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Status
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+
+      package ATN renames Ocarina.ME_AADL.AADL_Tree.Nodes;
+      package AIN renames Ocarina.ME_AADL.AADL_Instances.Nodes;
+
+      Tree_Counts     : array (ATN.Node_Kind) of Natural := (others => 0);
+      Instance_Counts : array (AIN.Node_Kind) of Natural := (others => 0);
+      Kinds           : Natural;
+   begin
+      Set_Return_Value_As_List (Data);
+
+      for P in Phase loop
+         Set_Return_Value (Data, Get_Phase_Count (P));
+         Set_Return_Value (Data, Duration'Image (Get_Phase_Time (P)));
+      end loop;
+
+      Set_Return_Value (Data, Integer (Name_Entries_Count));
+      Set_Return_Value (Data, Integer (Name_Chars_Count));
+
+      --  Number of nodes of each kind, in both trees, as counted
+      --  lists of kind names and numbers
+
+      for N in ATN.Entries.First .. ATN.Entries.Last loop
+         Tree_Counts (ATN.Kind (N)) := Tree_Counts (ATN.Kind (N)) + 1;
+      end loop;
+
+      Kinds := 0;
+      for K in Tree_Counts'Range loop
+         if Tree_Counts (K) > 0 then
+            Kinds := Kinds + 1;
+         end if;
+      end loop;
+      Set_Return_Value (Data, Kinds);
+      for K in Tree_Counts'Range loop
+         if Tree_Counts (K) > 0 then
+            Set_Return_Value (Data, ATN.Node_Kind'Image (K));
+            Set_Return_Value (Data, Tree_Counts (K));
+         end if;
+      end loop;
+
+      for N in AIN.Entries.First .. AIN.Entries.Last loop
+         Instance_Counts (AIN.Kind (N)) :=
+           Instance_Counts (AIN.Kind (N)) + 1;
+      end loop;
+
+      Kinds := 0;
+      for K in Instance_Counts'Range loop
+         if Instance_Counts (K) > 0 then
+            Kinds := Kinds + 1;
+         end if;
+      end loop;
+      Set_Return_Value (Data, Kinds);
+      for K in Instance_Counts'Range loop
+         if Instance_Counts (K) > 0 then
+            Set_Return_Value (Data, AIN.Node_Kind'Image (K));
+            Set_Return_Value (Data, Instance_Counts (K));
+         end if;
+      end loop;
+   end On_Get_Status;
+
    -----------------------
    -- On_Load_AADL_File --
    -----------------------
@@ -182,6 +456,25 @@ package body Ocarina.Python_Cmd is
       Ocarina.Utils.Load_AADL_File (Nth_Arg (Data, 1, ""));
    end On_Load_AADL_File;
 
+   ------------------------
+   -- On_Load_AADL_Files --
+   ------------------------
+
+   procedure On_Load_AADL_Files
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Load_AADL_Files
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+      Files : constant List_Instance'Class := Nth_Arg (Data, 1);
+   begin
+      for J in 1 .. Number_Of_Arguments (Files) loop
+         Ocarina.Utils.Load_AADL_File (String'(Nth_Arg (Files, J)));
+      end loop;
+   end On_Load_AADL_Files;
+
    --------------------
    -- On_Instantiate --
    ---------------------
@@ -239,6 +532,77 @@ package body Ocarina.Python_Cmd is
       Set_Return_Value (Data, Result);
    end On_Add_REAL_Library;
 
+   -----------------------
+   -- On_Check_Theorems --
+   -----------------------
+
+   procedure On_Check_Theorems
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Check_Theorems
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+      Names : constant List_Instance'Class := Nth_Arg (Data, 1);
+      Theorems : Ocarina.Analyzer.REAL.Theorem_Names
+        (1 .. Number_Of_Arguments (Names));
+
+      function Element_Name (E : Node_Id) return String;
+
+      ------------------
+      -- Element_Name --
+      ------------------
+
+      function Element_Name (E : Node_Id) return String is
+      begin
+         return Get_Name_String (AINU.Compute_Full_Name_Of_Instance (E));
+      exception
+         when others =>
+            return Integer'Image (Integer (E));
+      end Element_Name;
+
+   begin
+      for J in Theorems'Range loop
+         Theorems (J) := Standard.Utils.To_Lower
+           (Get_String_Name (String'(Nth_Arg (Names, J))));
+      end loop;
+
+      Ocarina.Utils.Check_Theorems (Theorems);
+
+      --  Theorems not found in the REAL libraries are not evaluated,
+      --  report them
+
+      for J in Theorems'Range loop
+         declare
+            Found : Boolean := False;
+         begin
+            for Result of Ocarina.Backends.REAL.Results loop
+               Found := Found or else Result.Theorem = Theorems (J);
+            end loop;
+            if not Found then
+               Errors.Error_Name (1) := Theorems (J);
+               Errors.Display_Error ("theorem % not found");
+            end if;
+         end;
+      end loop;
+
+      --  For each theorem: its name, its result and the number of
+      --  elements of its range set that were evaluated, followed by
+      --  the name and the result of each of these elements
+
+      Set_Return_Value_As_List (Data);
+      for Result of Ocarina.Backends.REAL.Results loop
+         Set_Return_Value (Data, Get_Name_String (Result.Theorem));
+         Set_Return_Value (Data, Result.Success);
+         Set_Return_Value (Data, Integer (Result.Elements.Length));
+         for Element of Result.Elements loop
+            Set_Return_Value (Data, Element_Name (Element.Element));
+            Set_Return_Value (Data, Element.Success);
+         end loop;
+      end loop;
+   end On_Check_Theorems;
+
    ----------------------
    -- On_Get_AADL_Root --
    ----------------------
@@ -252,9 +616,9 @@ package body Ocarina.Python_Cmd is
    is
       pragma Unreferenced (Command);
    begin
-      Set_Return_Value (Data, Integer'Image (Integer (
+      Set_Return_Value (Data, Integer (
          Ocarina.ME_AADL.AADL_Instances.Nodes.Root_System (
-         Ocarina.Utils.Get_AADL_Root))));
+         Ocarina.Utils.Get_AADL_Root)));
    end On_Get_AADL_Root;
 
    ----------------
@@ -348,7 +712,7 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
       List_Node : Node_Id;
    begin
-      ATNP.return_List (Data, Get_Component_Types (Nth_Arg (Data, 1, "")));
+      Return_Nodes (Data, Get_Component_Types (Nth_Arg (Data, 1, "")));
    end On_Get_Component_Types;
 
    --------------------------------------
@@ -363,7 +727,7 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
       List_Node : Node_Id;
    begin
-      ATNP.return_List (Data, Get_Component_Implementations
+      Return_Nodes (Data, Get_Component_Implementations
          (Nth_Arg (Data, 1, "")));
    end On_Get_Component_Implementations;
 
@@ -515,7 +879,7 @@ package body Ocarina.Python_Cmd is
       List_Node : Node_Id;
    begin
       ATNP.return_List (Data, Get_Property_Types (
-         Get_Node_Id_From_String (Nth_Arg (Data, 1, ""))));
+         Get_Node_Id_Arg (Data, 1)));
    end On_Get_Property_Types;
 
    ---------------------------------
@@ -531,7 +895,7 @@ package body Ocarina.Python_Cmd is
       List_Node : Node_Id;
    begin
       ATNP.return_List (Data, Get_Property_Definitions (
-         Get_Node_Id_From_String (Nth_Arg (Data, 1, ""))));
+         Get_Node_Id_Arg (Data, 1)));
    end On_Get_Property_Definitions;
 
    ------------------------------
@@ -548,7 +912,7 @@ package body Ocarina.Python_Cmd is
    begin
       ATNP.return_List
         (Data, Get_Property_Constants
-           (Get_Node_Id_From_String (Nth_Arg (Data, 1, ""))));
+           (Get_Node_Id_Arg (Data, 1)));
    end On_Get_PropertyConstants;
 
    ---------------------------
@@ -563,8 +927,8 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
    begin
       Get_Property_Value
-        (Data, Nth_Arg (Data, 1, ""),
-         Nth_Arg (Data, 2, ""));
+        (Data, Get_Node_Id_Arg (Data, 1),
+         Get_Node_Id_Arg (Data, 2));
    end On_Get_Property_Value;
 
    procedure On_Get_Property_Value_By_Name
@@ -575,10 +939,40 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
    begin
       Get_Property_Value_By_Name
-        (Data, Nth_Arg (Data, 1, ""),
+        (Data, Get_Node_Id_Arg (Data, 1),
          Nth_Arg (Data, 2, ""));
    end On_Get_Property_Value_By_Name;
 
+   ----------------------------
+   -- On_Get_Property_Values --
+   ----------------------------
+
+   procedure On_Get_Property_Values
+      (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Property_Values
+      (Data : in out Callback_Data'Class; Command : String) is
+      pragma Unreferenced (Command);
+   begin
+      Get_Property_Values
+        (Data, Nth_Arg (Data, 1), Nth_Arg (Data, 2, ""));
+   end On_Get_Property_Values;
+
+   ----------------------------------
+   -- On_Get_Typed_Property_Values --
+   ----------------------------------
+
+   procedure On_Get_Typed_Property_Values
+      (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Typed_Property_Values
+      (Data : in out Callback_Data'Class; Command : String) is
+      pragma Unreferenced (Command);
+   begin
+      Get_Typed_Property_Values
+        (Data, Nth_Arg (Data, 1), Nth_Arg (Data, 2, ""));
+   end On_Get_Typed_Property_Values;
+
    ----------------------
    -- On_Get_Instances --
    ----------------------
@@ -591,9 +985,54 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
       List_Node : Node_Id;
    begin
-      AINP.return_List (Data, Get_Instances (Nth_Arg (Data, 1, "")));
+      Return_Nodes (Data, Get_Instances (Nth_Arg (Data, 1, "")));
    end On_Get_Instances;
 
+   -----------------------
+   -- On_Get_Node_Slice --
+   -----------------------
+
+   procedure On_Get_Node_Slice
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Node_Slice
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      Index : Node_Index;
+   begin
+      if Command = "getComponentTypesSlice" then
+         Index := Type_Nodes;
+      elsif Command = "getComponentImplementationsSlice" then
+         Index := Implementation_Nodes;
+      else
+         Index := Instance_Nodes;
+      end if;
+
+      Return_Node_Slice
+        (Data, Index, Nth_Arg (Data, 1, ""),
+         Nth_Arg (Data, 2), Nth_Arg (Data, 3));
+   end On_Get_Node_Slice;
+
+   --------------------------
+   -- On_Get_Subtree_Slice --
+   --------------------------
+
+   procedure On_Get_Subtree_Slice
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Subtree_Slice
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+   begin
+      Get_Subtree_Slice
+        (Data, Get_Node_Id_Arg (Data, 1),
+         Ada.Strings.Equal_Case_Insensitive (Nth_Arg (Data, 2, ""), "bfs"),
+         Get_Node_Id_Arg (Data, 3), Nth_Arg (Data, 4));
+   end On_Get_Subtree_Slice;
+
    --------------------
    -- On_Get_Node_Id --
    --------------------
@@ -610,6 +1049,45 @@ package body Ocarina.Python_Cmd is
       Get_Node_Id (Data, Nth_Arg (Data, 1, ""));
    end On_Get_Node_Id;
 
+   -------------------
+   -- On_Find_Nodes --
+   -------------------
+
+   procedure On_Find_Nodes
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Find_Nodes
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+      Names : constant List_Instance'Class := Nth_Arg (Data, 1);
+   begin
+      Set_Return_Value_As_List (Data);
+      for J in 1 .. Number_Of_Arguments (Names) loop
+         Set_Return_Value
+           (Data, Integer
+              (Ocarina.Lmp.Find_Node (String'(Nth_Arg (Names, J)))));
+      end loop;
+   end On_Find_Nodes;
+
+   -------------------------
+   -- On_Select_Instances --
+   -------------------------
+
+   procedure On_Select_Instances
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Select_Instances
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+      Query : constant List_Instance'Class := Nth_Arg (Data, 1);
+   begin
+      Ocarina.Lmp.Select_Instances (Data, Query);
+   end On_Select_Instances;
+
    ---------------------------
    -- On_Get_Component_Name --
    ---------------------------
@@ -624,7 +1102,7 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
    begin
       Ocarina.Lmp.Get_Component_Name (Data,
-         Node_Id (Integer'Value (Nth_Arg (Data, 1, ""))));
+         Get_Node_Id_Arg (Data, 1));
    end On_Get_Component_Name;
 
    -------------------------------
@@ -641,7 +1119,7 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
    begin
       Ocarina.Lmp.Get_Component_Fullname (Data,
-         Node_Id (Integer'Value (Nth_Arg (Data, 1, ""))));
+         Get_Node_Id_Arg (Data, 1));
    end On_Get_Component_Fullname;
 
    --------------------------
@@ -658,9 +1136,118 @@ package body Ocarina.Python_Cmd is
       pragma Unreferenced (Command);
    begin
       Ocarina.Lmp.Get_Instance_Name (Data,
-         Node_Id (Integer'Value (Nth_Arg (Data, 1, ""))));
+         Get_Node_Id_Arg (Data, 1));
    end On_Get_Instance_Name;
 
+   ----------------------------
+   -- On_Get_Component_Names --
+   ----------------------------
+
+   procedure On_Get_Component_Names
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Component_Names
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+      Nodes : constant List_Instance'Class := Nth_Arg (Data, 1);
+   begin
+      Set_Return_Value_As_List (Data);
+      for J in 1 .. Number_Of_Arguments (Nodes) loop
+         Ocarina.Lmp.Get_Component_Name (Data, Nth_Node_Arg (Nodes, J));
+      end loop;
+   end On_Get_Component_Names;
+
+   ---------------------------
+   -- On_Get_Instance_Names --
+   ---------------------------
+
+   procedure On_Get_Instance_Names
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Instance_Names
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+      Nodes : constant List_Instance'Class := Nth_Arg (Data, 1);
+   begin
+      Set_Return_Value_As_List (Data);
+      for J in 1 .. Number_Of_Arguments (Nodes) loop
+         Ocarina.Lmp.Get_Instance_Name (Data, Nth_Node_Arg (Nodes, J));
+      end loop;
+   end On_Get_Instance_Names;
+
+   ---------------------
+   -- On_Get_Children --
+   ---------------------
+
+   procedure On_Get_Children
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Children
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+      Nodes : constant List_Instance'Class := Nth_Arg (Data, 1);
+   begin
+      Set_Return_Value_As_List (Data);
+      for J in 1 .. Number_Of_Arguments (Nodes) loop
+         Ocarina.Lmp.Get_Children (Data, Nth_Node_Arg (Nodes, J));
+      end loop;
+   end On_Get_Children;
+
+   -------------------------------
+   -- On_Snapshot_Instance_Tree --
+   -------------------------------
+
+   procedure On_Snapshot_Instance_Tree
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Snapshot_Instance_Tree
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+   begin
+      Ocarina.Lmp.Snapshot_Instance_Tree
+        (Data, Get_Node_Id_Arg (Data, 1));
+   end On_Snapshot_Instance_Tree;
+
+   -----------------------------
+   -- On_Get_Connection_Graph --
+   -----------------------------
+
+   procedure On_Get_Connection_Graph
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_Connection_Graph
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+   begin
+      Ocarina.Lmp.Get_Connection_Graph (Data);
+   end On_Get_Connection_Graph;
+
+   -----------------------------
+   -- On_Get_End_To_End_Flows --
+   -----------------------------
+
+   procedure On_Get_End_To_End_Flows
+     (Data : in out Callback_Data'Class; Command : String);
+
+   procedure On_Get_End_To_End_Flows
+     (Data : in out Callback_Data'Class;
+      Command : String)
+   is
+      pragma Unreferenced (Command);
+   begin
+      Ocarina.Lmp.Get_End_To_End_Flows (Data);
+   end On_Get_End_To_End_Flows;
+
    -------------------------
    -- On_Get_Source_Ports --
    -------------------------
@@ -673,15 +1260,15 @@ package body Ocarina.Python_Cmd is
       Command : String)
    is
       pragma Unreferenced (Command);
-      N : constant Node_Id := Node_Id (Integer'Value (Nth_Arg (Data, 1, "")));
+      N : constant Node_Id := Get_Node_Id_Arg (Data, 1);
       Result : List_Id;
 
    begin
       if not AINU.Is_Empty (Sources (N)) then
          Result := Ocarina.Backends.Utils.Get_Source_Ports (N);
-         Set_Return_Value (Data, Item (First_Node (Result))'Img);
+         Set_Return_Value (Data, Integer (Item (First_Node (Result))));
       else
-         Set_Return_Value (Data, Integer'Image (0));
+         Set_Return_Value (Data, 0);
       end if;
    end On_Get_Source_Ports;
 
@@ -697,15 +1284,15 @@ package body Ocarina.Python_Cmd is
       Command : String)
    is
       pragma Unreferenced (Command);
-      N : constant Node_Id := Node_Id (Integer'Value (Nth_Arg (Data, 1, "")));
+      N : constant Node_Id := Get_Node_Id_Arg (Data, 1);
       Result : List_Id;
 
    begin
       if not AINU.Is_Empty (Destinations (N)) then
          Result := Ocarina.Backends.Utils.Get_Destination_Ports (N);
-         Set_Return_Value (Data, Item (First_Node (Result))'Img);
+         Set_Return_Value (Data, Integer (Item (First_Node (Result))));
       else
-         Set_Return_Value (Data, Integer'Image (0));
+         Set_Return_Value (Data, 0);
       end if;
    end On_Get_Destination_Ports;
 
@@ -739,11 +1326,21 @@ package body Ocarina.Python_Cmd is
       Register_Command
         (Repo, "status", 0, 0, Handler => On_Status'Unrestricted_Access);
 
+      --  getStatus() function
+      Register_Command
+        (Repo, "getStatus", 0, 0,
+         Handler => On_Get_Status'Unrestricted_Access);
+
       --  load() function
       Register_Command
         (Repo, "load", 1, 1,
           Handler => On_Load_AADL_File'Unrestricted_Access);
 
+      --  loadMany() function
+      Register_Command
+        (Repo, "loadMany", 1, 1,
+          Handler => On_Load_AADL_Files'Unrestricted_Access);
+
       --  analyze() function
       Register_Command
         (Repo, "analyze", 0, 0, Handler => On_Analyze'Unrestricted_Access);
@@ -840,6 +1437,16 @@ package body Ocarina.Python_Cmd is
         (Repo, "getPropertyValueByName", 2, 2,
          Handler => On_Get_Property_Value_By_Name'Unrestricted_Access);
 
+      --  getPropertyValues() function
+      Register_Command
+        (Repo, "getPropertyValues", 2, 2,
+         Handler => On_Get_Property_Values'Unrestricted_Access);
+
+      --  getTypedPropertyValues() function
+      Register_Command
+        (Repo, "getTypedPropertyValues", 2, 2,
+         Handler => On_Get_Typed_Property_Values'Unrestricted_Access);
+
       --  getPropertyConstants() function
       Register_Command
         (Repo, "getPropertyConstants", 1, 1,
@@ -850,6 +1457,23 @@ package body Ocarina.Python_Cmd is
         (Repo, "getInstances", 1, 1,
          Handler => On_Get_Instances'Unrestricted_Access);
 
+      --  getInstancesSlice(), getComponentTypesSlice() and
+      --  getComponentImplementationsSlice() functions
+      Register_Command
+        (Repo, "getInstancesSlice", 3, 3,
+         Handler => On_Get_Node_Slice'Unrestricted_Access);
+      Register_Command
+        (Repo, "getComponentTypesSlice", 3, 3,
+         Handler => On_Get_Node_Slice'Unrestricted_Access);
+      Register_Command
+        (Repo, "getComponentImplementationsSlice", 3, 3,
+         Handler => On_Get_Node_Slice'Unrestricted_Access);
+
+      --  getSubtreeSlice() function
+      Register_Command
+        (Repo, "getSubtreeSlice", 4, 4,
+         Handler => On_Get_Subtree_Slice'Unrestricted_Access);
+
       --  instantiate() function
       Register_Command
         (Repo, "instantiate", 1, 1,
@@ -865,6 +1489,11 @@ package body Ocarina.Python_Cmd is
         (Repo, "add_real_library", 1, 1,
          Handler => On_Add_REAL_Library'Unrestricted_Access);
 
+      --  check_theorems() function
+      Register_Command
+        (Repo, "check_theorems", 1, 1,
+         Handler => On_Check_Theorems'Unrestricted_Access);
+
       --  getRoot() function
       Register_Command
         (Repo, "getRoot", 0, 0,
@@ -890,11 +1519,51 @@ package body Ocarina.Python_Cmd is
         (Repo, "getInstanceName", 1, 1,
          Handler => On_Get_Instance_Name'Unrestricted_Access);
 
+      --  getComponentNames() function
+      Register_Command
+        (Repo, "getComponentNames", 1, 1,
+         Handler => On_Get_Component_Names'Unrestricted_Access);
+
+      --  getInstanceNames() function
+      Register_Command
+        (Repo, "getInstanceNames", 1, 1,
+         Handler => On_Get_Instance_Names'Unrestricted_Access);
+
+      --  getChildren() function
+      Register_Command
+        (Repo, "getChildren", 1, 1,
+         Handler => On_Get_Children'Unrestricted_Access);
+
+      --  snapshotInstanceTree() function
+      Register_Command
+        (Repo, "snapshotInstanceTree", 1, 1,
+         Handler => On_Snapshot_Instance_Tree'Unrestricted_Access);
+
+      --  getConnectionGraph() function
+      Register_Command
+        (Repo, "getConnectionGraph", 0, 0,
+         Handler => On_Get_Connection_Graph'Unrestricted_Access);
+
+      --  getEndToEndFlows() function
+      Register_Command
+        (Repo, "getEndToEndFlows", 0, 0,
+         Handler => On_Get_End_To_End_Flows'Unrestricted_Access);
+
       --  getNodeId() function
       Register_Command
         (Repo, "getNodeId", 1, 1,
          Handler => On_Get_Node_Id'Unrestricted_Access);
 
+      --  findNodes() function
+      Register_Command
+        (Repo, "findNodes", 1, 1,
+         Handler => On_Find_Nodes'Unrestricted_Access);
+
+      --  selectInstances() function
+      Register_Command
+        (Repo, "selectInstances", 1, 1,
+         Handler => On_Select_Instances'Unrestricted_Access);
+
       --  getSourcePorts() function
       Register_Command
         (Repo, "getSourcePorts", 1, 1,
@@ -29,6 +29,9 @@
 --                                                                          --
 ------------------------------------------------------------------------------
 
+with Ada.Calendar;
+with Ada.Unchecked_Deallocation;
+
 with Errors;                     use Errors;
 with Locations;                  use Locations;
 with Ocarina.Namet;              use Ocarina.Namet;
@@ -53,6 +56,13 @@ package body Ocarina.Utils is
    File_Name             : Name_Id := No_Name;
    Buffer                : Location;
    Language              : Name_Id := No_Name;
+   Declarative_Serial    : Natural := 0;
+   Instance_Serial       : Natural := 0;
+   Phase_Counts          : array (Phase) of Natural := (others => 0);
+   Phase_Times           : array (Phase) of Duration := (others => 0.0);
+
+   procedure End_Phase (P : Phase; Start : Ada.Calendar.Time);
+   --  Account for a run of phase P started at Start
 
    -----------
    -- Reset --
@@ -77,8 +87,41 @@ package body Ocarina.Utils is
       AADL_Root := No_Node;
       File_Name := No_Name;
       Language := No_Name;
+      Declarative_Serial := Declarative_Serial + 1;
+      Instance_Serial := Instance_Serial + 1;
+      Phase_Counts := (others => 0);
+      Phase_Times := (others => 0.0);
    end Reset;
 
+   ---------------
+   -- End_Phase --
+   ---------------
+
+   procedure End_Phase (P : Phase; Start : Ada.Calendar.Time) is
+      use type Ada.Calendar.Time;
+   begin
+      Phase_Counts (P) := Phase_Counts (P) + 1;
+      Phase_Times (P) := Phase_Times (P) + (Ada.Calendar.Clock - Start);
+   end End_Phase;
+
+   ---------------------
+   -- Get_Phase_Count --
+   ---------------------
+
+   function Get_Phase_Count (P : Phase) return Natural is
+   begin
+      return Phase_Counts (P);
+   end Get_Phase_Count;
+
+   --------------------
+   -- Get_Phase_Time --
+   --------------------
+
+   function Get_Phase_Time (P : Phase) return Duration is
+   begin
+      return Phase_Times (P);
+   end Get_Phase_Time;
+
    ------------------
    -- Print_Status --
    ------------------
@@ -97,6 +140,7 @@ package body Ocarina.Utils is
    --------------------
 
    procedure Load_AADL_File (Filename : String) is
+      Start : constant Ada.Calendar.Time := Ada.Calendar.Clock;
    begin
       Language := Get_String_Name ("aadl");
       Set_Str_To_Name_Buffer (Filename);
@@ -114,6 +158,8 @@ package body Ocarina.Utils is
       end if;
 
       AADL_Root := Parse (Language, AADL_Root, Buffer);
+      Declarative_Serial := Declarative_Serial + 1;
+      End_Phase (Load_Phase, Start);
       Exit_On_Error
         (No (AADL_Root),
          "Cannot parse AADL specifications");
@@ -127,9 +173,12 @@ package body Ocarina.Utils is
    -------------
 
    function Analyze return Boolean is
+      Start   : constant Ada.Calendar.Time := Ada.Calendar.Clock;
       Success : Boolean;
    begin
       Success := Analyze (Language, AADL_Root);
+      Declarative_Serial := Declarative_Serial + 1;
+      End_Phase (Analysis_Phase, Start);
       if not Success then
          Write_Line ("Cannot analyze AADL specifications");
       else
@@ -164,11 +213,33 @@ package body Ocarina.Utils is
       return True;
    end Add_REAL_Library;
 
+   --------------------
+   -- Check_Theorems --
+   --------------------
+
+   procedure Check_Theorems
+     (Theorem_Names : Ocarina.Analyzer.REAL.Theorem_Names)
+   is
+      procedure Free is new Ada.Unchecked_Deallocation
+        (Ocarina.Analyzer.REAL.Theorem_Names,
+         Ocarina.Analyzer.REAL.Theorem_Names_Access);
+   begin
+      Main_Theorems := new Ocarina.Analyzer.REAL.Theorem_Names'
+        (Theorem_Names);
+      Generate ("real_theorem");
+      Free (Main_Theorems);
+   exception
+      when others =>
+         Free (Main_Theorems);
+         raise;
+   end Check_Theorems;
+
    -----------------
    -- Instantiate --
    -----------------
 
    function Instantiate (Root_System : String) return Boolean is
+      Start   : constant Ada.Calendar.Time := Ada.Calendar.Clock;
       Success : Boolean;
    begin
       if Root_System /= "" then
@@ -176,6 +247,9 @@ package body Ocarina.Utils is
            (Get_String_Name (Root_System));
       end if;
       AADL_Root := Instantiate_Model (AADL_Root);
+      Declarative_Serial := Declarative_Serial + 1;
+      Instance_Serial := Instance_Serial + 1;
+      End_Phase (Instantiation_Phase, Start);
       if Present (AADL_Root) then
          Write_Line ("Model instantiated sucessfully");
          Success := True;
@@ -191,10 +265,12 @@ package body Ocarina.Utils is
    --------------
 
    procedure Generate (Backend_Name : String) is
+      Start : constant Ada.Calendar.Time := Ada.Calendar.Clock;
    begin
       Set_Current_Backend_Name (Backend_Name);
       Write_Line ("Generating code using backend " & Backend_Name);
       Generate_Code (AADL_Root);
+      End_Phase (Generation_Phase, Start);
    end Generate;
 
    -------------------
@@ -206,6 +282,52 @@ package body Ocarina.Utils is
       return AADL_Root;
    end Get_AADL_Root;
 
+   ----------------------------
+   -- Get_Declarative_Serial --
+   ----------------------------
+
+   function Get_Declarative_Serial return Natural is
+   begin
+      return Declarative_Serial;
+   end Get_Declarative_Serial;
+
+   -------------------------
+   -- Get_Instance_Serial --
+   -------------------------
+
+   function Get_Instance_Serial return Natural is
+   begin
+      return Instance_Serial;
+   end Get_Instance_Serial;
+
+   ---------------------
+   -- Get_Node_Id_Arg --
+   ---------------------
+
+   function Get_Node_Id_Arg
+     (Data : Callback_Data'Class;
+      N    : Positive) return Node_Id is
+   begin
+      return Node_Id (Integer'(Nth_Arg (Data, N)));
+   exception
+      when Invalid_Parameter =>
+         return Get_Node_Id_From_String (Nth_Arg (Data, N));
+   end Get_Node_Id_Arg;
+
+   ---------------------
+   -- Get_List_Id_Arg --
+   ---------------------
+
+   function Get_List_Id_Arg
+     (Data : Callback_Data'Class;
+      N    : Positive) return List_Id is
+   begin
+      return List_Id (Integer'(Nth_Arg (Data, N)));
+   exception
+      when Invalid_Parameter =>
+         return Get_List_Id_From_String (Nth_Arg (Data, N));
+   end Get_List_Id_Arg;
+
    -----------------------------
    -- Get_Node_Id_From_String --
    -----------------------------
@@ -1,28 +1,936 @@
 #! /usr/bin/python
 
+import os
+import sys
+import tempfile
+import unittest
+
 from ocarina import *;
+import lmp
+
+try:
+    import libocarina_python
+except ImportError:
+    libocarina_python = None
 
 def main ():
     '''Test function'''
 
     result = add_real_library("rma.real")      # load a file
-    print "%r" % (result)
+    print ("%r" % (result))
     result = load("rma.aadl")             # load a file
-    print "%r" % (result)
+    print ("%r" % (result))
     result = load("deployment.aadl")      # load a file
-    print "%r" % (result)
+    print ("%r" % (result))
     result = analyze()                    # analyze models
-    print "Analysis result %r" % (result)
+    print ("Analysis result %r" % (result))
 
     result = set_real_theorem ("rma_prop_def")
     result = generate (Backends.real_theorem)
-    print "REAL execution %r" % (result)
-    print ""
+    print ("REAL execution %r" % (result))
+    print ("")
 
     result = set_real_theorem ("rma_prop_def_2")
     result = generate (Backends.real_theorem)
-    print "REAL execution %r" % (result)
+    print ("REAL execution %r" % (result))
+
+################################################################################
+# Behaviour tests, run after main () or by pytest
+
+_here = os.path.dirname (os.path.abspath (__file__))
+_rma = os.path.join (_here, "rma.aadl")
+
+def needsOcarina ():
+    '''Skip the calling test if libocarina is not available'''
+
+    if libocarina_python is None:
+        raise unittest.SkipTest ('libocarina_python is not available')
+
+_theorems = """theorem check_scheduling
+  foreach e in system_set do
+  check (1 = 1);
+end check_scheduling;
+
+theorem check_threads
+  foreach t in thread_set do
+  check (1 = 0);
+end check_threads;
+"""
+
+def realLibrary ():
+    '''Write a REAL library of two theorems, the second one failing,
+    return its name'''
+
+    library = os.path.join (tempfile.mkdtemp (), "checks.real")
+    with open (library, "w") as target:
+        target.write (_theorems)
+    return library
+
+def loadRma ():
+    '''Load and instantiate rma.aadl, return the root instance'''
+
+    needsOcarina ()
+    reset ()
+    result = load_many ([ _rma, "deployment.aadl" ])
+    assert result[3] == [], result
+    assert analyze ()[3] == []
+    result = instantiate ("")
+    assert result[3] == [], result
+    return lmp.getRoot ()[0]
+
+def test_captureSession ():
+    '''Messages written on the file descriptors are captured, except
+    in quiet mode'''
+
+    def write (text):
+        os.write (getCaptureSession ().stdout_fd, text.encode ('utf-8'))
+        return len (text)
+
+    result = runOcarinaFunction (write, "captured\n")
+    assert result[0] == 9
+    assert result[1] == [ [ "captured\n" ] ]
+    assert runOcarinaFunction (write, "")[1] == [ [] ]
+
+    with quiet ():
+        result = runOcarinaFunction (write, "")
+    assert result[0] == 0
+    assert result[1] == [ [] ]
+    assert getCaptureSession () is getCaptureSession ()
+
+    # A redirection of stdout made after the session was created is
+    # kept by later calls
+
+    session = getCaptureSession ()
+    target = tempfile.TemporaryFile ()
+    saved = os.dup (session.stdout_fd)
+    os.dup2 (target.fileno (), session.stdout_fd)
+    try:
+        assert runOcarinaFunction (write, "captured\n")[1] == \
+            [ [ "captured\n" ] ]
+        os.write (session.stdout_fd, b"redirected\n")
+    finally:
+        os.dup2 (saved, session.stdout_fd)
+        os.close (saved)
+    target.seek (0)
+    assert target.read () == b"redirected\n"
+
+def test_parseDiagnostics ():
+    '''A message spanning several lines is one diagnostic'''
+
+    diagnostics = parseDiagnostics(
+        'rma.aadl:12:3: warning: Period of Task1\n'
+        '  is not a multiple of the hyperperiod\n'
+        'error: no root system\n'
+        'rma.aadl:30:1: unknown property\n')
+
+    assert len(diagnostics) == 3
+    assert diagnostics[0] == Diagnostic(
+        'warning', 'rma.aadl', 12, 3,
+        'Period of Task1\nis not a multiple of the hyperperiod')
+    assert diagnostics[1] == Diagnostic('error', None, None, None,
+                                        'no root system')
+    assert diagnostics[2].severity == 'error'
+    assert diagnostics[2].line == 30
+
+def test_OcarinaResult ():
+    '''A result behaves as [ value, stdout, warnings, errors ], and only
+    decodes the messages that are read'''
+
+    result = OcarinaResult (42, b'hello\n', b'warning: w\nerror: e\n', [])
+    assert result[0] == 42
+    assert result[3] == [ [ 'e' ] ]
+    assert result._stdout is None
+    assert result[2] == [ 'w' ]
+    assert result[1] == [ [ 'hello\n' ] ]
+    assert result[-1] == result.errors
+    assert result == [ 42, [ [ 'hello\n' ] ], [ 'w' ], [ [ 'e' ] ] ]
+    assert result != None
+    assert result != 42
+    try:
+        result[4]
+        assert False
+    except IndexError:
+        pass
+
+    result[0] = 'value'
+    value, stdout, warnings, errors = result
+    assert value == 'value'
+
+def test_load_many ():
+    '''Files already loaded under any path are skipped, copies and
+    files that failed to load are not'''
+
+    needsOcarina ()
+    reset ()
+    directory = tempfile.mkdtemp ()
+    copy = os.path.join (directory, "rma_copy.aadl")
+    broken = os.path.join (directory, "broken.aadl")
+    with open (_rma) as source, open (copy, "w") as target:
+        target.write (source.read ())
+    with open (broken, "w") as target:
+        target.write ("package Broken\npublic\n  thread T\nend Broken;\n")
+
+    alias = os.path.join (_here, os.curdir, "rma.aadl")
+    result = load_many ([ _rma, alias, "deployment.aadl" ])
+    assert result[3] == [], result
+    assert str (result[1]).count ("rma.aadl loaded") == 1
+    assert load_many ([ alias ])[1] == [ [] ]
+    assert analyze ()[3] == []
+
+    result = load_many ([ copy ])
+    assert "rma_copy.aadl loaded" in str (result[1])
+
+    assert load_many ([ broken ])[3] != []
+    assert load_many ([ broken ])[3] != []
+
+def test_aio_session ():
+    '''Steps and theorems are run by the worker of a session'''
+
+    needsOcarina ()
+    try:
+        import asyncio
+        import aio
+        aio.runSteps
+    except (ImportError, AttributeError):
+        raise unittest.SkipTest ('asyncio is not available')
+
+    loop = asyncio.new_event_loop ()
+    session = aio.Session (loop)
+    try:
+        progress = session.run ([ ("add_real_library", realLibrary ()),
+                                  ("load_many", [ _rma, "deployment.aadl" ]),
+                                  ("analyze",),
+                                  ("instantiate", "") ])
+        steps = []
+        while True:
+            try:
+                step = progress.__anext__ ()
+            except StopAsyncIteration:
+                break
+            steps.append (loop.run_until_complete (step))
+        assert [ step.step for step in steps ] == \
+            [ "add_real_library", "load_many", "analyze", "instantiate" ]
+        assert all (step.errors == [] for step in steps)
+
+        result = loop.run_until_complete (
+            session.check_theorem ("check_scheduling"))
+        assert result.step == "generate"
+        assert result.errors == []
+    finally:
+        session.close ()
+        loop.close ()
+
+def test_analyzeFlows ():
+    '''Latencies of elements and connections are summed along flows'''
+
+    from flow_latency import analyzeFlows
+
+    latencies = { 1 : ( 1.0, 2.0 ), 2 : ( 0.5, 0.5 ), 3 : ( 3.0, 4.0 ),
+                  12 : ( 0.25, 0.25 ) }
+    connections = { ( 1, 2 ) : 12 }
+    flows = analyzeFlows ([ [ 1, 2, 3 ], [ 1, 2 ], [ 3 ] ], latencies.get,
+                          lambda source, destination:
+                          connections.get (( source, destination )))
+
+    assert flows[0].connections == [ 12 ]
+    assert ( flows[0].minimum, flows[0].maximum ) == ( 4.75, 6.75 )
+    assert ( flows[1].minimum, flows[1].maximum ) == ( 1.75, 2.75 )
+    assert ( flows[2].minimum, flows[2].maximum ) == ( 3.0, 4.0 )
+
+def test_analyzeEndToEndFlows ():
+    '''Querying the flows does not change the instance tree'''
+
+    loadRma ()
+    flows = lmp.getEndToEndFlows ()
+    assert flows[3] == []
+    assert lmp.getEndToEndFlows ()[0] == flows[0]
+    result = lmp.analyzeEndToEndFlows ()
+    assert result[3] == []
+    assert len (result[0]) == len (flows[0])
+
+def test_compileQuery ():
+    '''Category keywords are category tests, other words and quoted
+    words are subcomponent names'''
+
+    program = [ 'self', 'category', 'system', 0,
+                'descendant', 'category', 'process', 0,
+                'child', 'category', 'thread', 1,
+                '=', 'dispatch_protocol', 'Periodic' ]
+    assert lmp._compileQuery (
+        'system//process/thread[Dispatch_Protocol=Periodic]') == program
+    assert lmp._compileQuery (
+        'system()//process()/thread()[Dispatch_Protocol=Periodic]') == program
+    assert lmp._compileQuery ('*/cpu[Priority!="2"]') == \
+        [ 'self', '*', '', 0, 'child', 'name', 'cpu', 1, '!=', 'priority', '2' ]
+    assert lmp._compileQuery ('//Virtual_Processor[Period]') == \
+        [ 'descendant', 'category', 'virtual_processor', 1,
+          'has', 'period', '' ]
+    assert lmp._compileQuery ('*/"System"/\'thread\'') == \
+        [ 'self', '*', '', 0, 'child', 'name', 'system', 0,
+          'child', 'name', 'thread', 0 ]
+    assert lmp._compileQuery ('//unknown') == \
+        [ 'descendant', 'name', 'unknown', 0 ]
+    for query in [ '', 'cpu()', 'system thread', '//thread[', '*/""',
+                   '*/"cpu"()' ]:
+        try:
+            lmp._compileQuery (query)
+            assert False, query
+        except ValueError:
+            pass
+
+def test_select ():
+    '''Instances are selected by category, name and properties'''
+
+    needsOcarina ()
+    reset ()
+    copy = os.path.join (tempfile.mkdtemp (), "rma.aadl")
+    with open (_rma) as source, open (copy, "w") as target:
+        target.write (source.read ().replace ("cpu_rm", "cpu"))
+    assert load_many ([ copy, "deployment.aadl" ])[3] == []
+    assert analyze ()[3] == []
+    assert instantiate ("")[3] == []
+
+    threads = lmp.getInstances ("thread")[0]
+    processors = lmp.getInstances ("processor")[0]
+    assert sorted (lmp.select ('//thread')[0]) == sorted (threads)
+    assert sorted (lmp.select ('system/node_a/thread'
+                               '[Dispatch_Protocol=Periodic]')[0]) == \
+        sorted (threads)
+    assert sorted (lmp.select ('system//process/thread'
+                               '[Dispatch_Protocol=Periodic]')[0]) == \
+        sorted (threads)
+    assert lmp.select ('//thread()[Priority]')[0] == []
+    assert lmp.select ('*/cpu')[0] == processors
+    assert lmp.select ('*/"cpu"')[0] == processors
+    assert lmp.select ('//processor')[0] == processors
+
+def test_iterSubtree ():
+    '''Subtrees are iterated in chunks, in depth-first or breadth-first
+    order, and several iterations may be interleaved'''
+
+    root = loadRma ()
+
+    def children (node):
+        return [ c for c in lmp.getChildren ([ node ])[0][0] if c != 0 ]
+
+    def dfs (node):
+        nodes = [ node ]
+        for child in children (node):
+            nodes.extend (dfs (child))
+        return nodes
+
+    def bfs (node):
+        nodes = [ node ]
+        for n in nodes:
+            nodes.extend (children (n))
+        return nodes
+
+    assert list (lmp.iterSubtree (root, chunkSize=1)) == dfs (root)
+    assert list (lmp.iterSubtree (root, 'bfs', chunkSize=2)) == bfs (root)
+
+    process = lmp.getInstances ("process")[0][0]
+    first = lmp.iterSubtree (root, chunkSize=1)
+    second = lmp.iterSubtree (process, 'bfs', chunkSize=1)
+    interleaved = []
+    for pair in zip (first, second):
+        interleaved.append (pair)
+    assert [ a for a, b in interleaved ] == dfs (root)[:len (interleaved)]
+    assert [ b for a, b in interleaved ] == bfs (process)
+
+    assert list (lmp.iterInstances ("thread", chunkSize=1)) == \
+        lmp.getInstances ("thread")[0]
+    try:
+        lmp.iterSubtree (root, 'postorder')
+        assert False
+    except ValueError:
+        pass
+
+def test_batchedQueries ():
+    '''Batched queries return what the per-node queries return'''
+
+    root = loadRma ()
+    threads = lmp.getInstances ("thread")[0]
+    assert len (threads) == 2
+
+    assert lmp.getInstanceNames (threads)[0] == \
+        [ lmp.getInstanceName (t)[0] for t in threads ]
+    assert getPropertyValues (threads, "period")[0] == \
+        [ getPropertyValueByName (t, "period")[0] for t in threads ]
+    assert getPropertyValues (threads, "Period")[0] == \
+        [ getPropertyValueByName (t, "Period")[0] for t in threads ]
+    assert getPropertyValueByName (threads[0], "PERIOD")[0] == \
+        getPropertyValueByName (threads[0], "period")[0]
+    assert getTypedPropertyValues (threads, "Period")[0] == \
+        getTypedPropertyValues (threads, "period")[0]
+
+    children = lmp.getChildren ([ root ] + threads)[0]
+    assert len (children) == 3
+    assert sorted (children[0]) == sorted (
+        lmp.getInstances ("process")[0] + lmp.getInstances ("processor")[0])
+    assert children[1:] == [ [], [] ]
+
+def test_InstanceTree ():
+    '''A snapshot is navigated without calling Ocarina'''
+
+    from instance_tree import InstanceTree
+
+    tree = InstanceTree ([ 10, -1, 13, 'rma.impl', 'rma.impl', 0,
+                           11, 0, 6, 'node_a', 'node_a.impl', 0,
+                           12, 1, 4, 'task1', 'task.impl_1', 1,
+                           3, 'period', '1000', 'ms',
+                           13, 0, 8, 'cpu', 'cpu.impl', 0 ])
+    assert len (tree) == 4
+    assert list (tree.children (0)) == [ 1, 3 ]
+    assert tree.parent (2) == 1
+    assert tree.fullName (2) == 'rma.impl.node_a.task1'
+    assert tree.category (3) == 'processor'
+    assert tree.classifier (2) == 'task.impl_1'
+    assert tree.property (2, 'period') == ( '1000', 'ms' )
+    assert tree.properties (1) == {}
+    assert list (tree.subtree (1)) == [ 1, 2 ]
+    assert tree.findAll ('Thread') == [ 2 ]
+    assert tree.position (13) == 3
+
+def test_snapshotInstanceTree ():
+    '''A snapshot holds the instances of the model'''
+
+    root = loadRma ()
+    tree = lmp.snapshotInstanceTree (root)[0]
+    assert tree.nodeId (0) == root
+    assert len (tree) == 5
+    assert sorted (tree.nodeId (p) for p in tree.findAll ('thread')) == \
+        sorted (lmp.getInstances ('thread')[0])
+
+def test_categoryIndex ():
+    '''Components are listed by category, and the lists follow the
+    changes of the model'''
+
+    loadRma ()
+    assert len (lmp.getComponentTypes ("thread")[0]) == 1
+    assert len (lmp.getComponentImplementations ("thread")[0]) == 2
+    assert len (lmp.getComponentTypes ("processor")[0]) == 1
+    assert len (lmp.getInstances ("thread")[0]) == 2
+    assert lmp.getInstances ("bus")[0] == []
+
+    reset ()
+    assert lmp.getComponentTypes ("thread")[0] == []
+    assert lmp.getInstances ("thread")[0] == []
+    loadRma ()
+    assert len (lmp.getInstances ("thread")[0]) == 2
+
+def test_runJob ():
+    '''A job stops at its first failing step'''
+
+    import pool
+
+    needsOcarina ()
+    try:
+        pool.runJob ([ ("load", _rma), ("system", "ls") ])
+        assert False
+    except ValueError:
+        pass
+
+    results = pool.runJob ([ ("load", _rma), ("load", "deployment.aadl"),
+                             ("analyze",), ("instantiate", "") ])
+    assert [ r.step for r in results ] == \
+        [ "load", "load", "analyze", "instantiate" ]
+    assert all (r.errors == [] for r in results)
+
+    results = pool.runJob ([ ("load", "missing.aadl"), ("analyze",) ])
+    assert len (results) == 1 and results[0].errors != []
+
+def test_Pool ():
+    '''Jobs run in workers, their results keep the order of the jobs'''
+
+    import pool
+
+    needsOcarina ()
+    jobs = [ [ ("load", _rma), ("load", "deployment.aadl"), ("analyze",) ],
+             [ ("load", "missing.aadl"), ("analyze",) ] ]
+    with pool.Pool (2) as workers:
+        results = workers.map (jobs * 2)
+        single = workers.run (jobs[0])
+    assert [ len (r) for r in results ] == [ 3, 1, 3, 1 ]
+    assert [ r.step for r in single ] == [ "load", "load", "analyze" ]
+    assert single[-1].errors == []
+
+def test_check_theorems ():
+    '''Several theorems are evaluated in one run, each with its own
+    result'''
+
+    loadRma ()
+    assert add_real_library (realLibrary ())[3] == []
+    result = check_theorems ([ "check_scheduling", "check_threads" ])
+    assert result[3] == [], result
+    theorems = result[0]
+    assert sorted (theorems) == [ "check_scheduling", "check_threads" ]
+    assert theorems["check_scheduling"].passed
+    assert not theorems["check_threads"].passed
+    assert len (theorems["check_threads"].values) == 2
+    assert not any (theorems["check_threads"].values.values ())
+
+    result = check_theorems ([ "check_scheduling", "check_missing" ])
+    assert result[3] != []
+    assert list (result[0]) == [ "check_scheduling" ]
+
+def test_propertyCache ():
+    '''Property values are read again once the model changed'''
+
+    loadRma ()
+    threads = sorted (lmp.getInstances ("thread")[0])
+    first = getPropertyValueByName (threads[0], "period")[0]
+    assert first != []
+    for i in range (3):
+        assert getPropertyValueByName (threads[0], "period")[0] == first
+    assert getPropertyValues (threads, "period")[0][0] == first
+
+    copy = os.path.join (tempfile.mkdtemp (), "rma.aadl")
+    with open (_rma) as source, open (copy, "w") as target:
+        target.write (source.read ().replace ("1000 ms", "2000 ms"))
+    reset ()
+    assert load_many ([ copy, "deployment.aadl" ])[3] == []
+    assert analyze ()[3] == []
+    assert instantiate ("")[3] == []
+    threads = lmp.getInstances ("thread")[0]
+    periods = [ getPropertyValueByName (t, "period")[0] for t in threads ]
+    assert first not in periods
+
+def test_nodeIds ():
+    '''Node ids cross the binding as Python integers'''
+
+    root = loadRma ()
+    assert isinstance (root, int)
+    subcomponents = AIN.Subcomponents (root)[0]
+    assert len (subcomponents) == 2
+    assert all (isinstance (n, int) for n in subcomponents)
+    threads = lmp.getInstances ("thread")[0]
+    assert all (isinstance (n, int) for n in threads)
+    assert lmp.getInstanceNames ([ str (n) for n in threads ])[0] == \
+        lmp.getInstanceNames (threads)[0]
+    assert toNodeIdList ([ "12", 13 ]) == [ 12, 13 ]
+
+def test_ConnectionGraph ():
+    '''Connections are followed without calling Ocarina'''
+
+    from connection_graph import ConnectionGraph
+
+    graph = ConnectionGraph ([ 100, 1, 2, 10, 20,
+                               101, 2, 3, 20, 30,
+                               102, 1, 4, 10, 40 ])
+    assert len (graph) == 3
+    assert list (graph.outgoing (1)) == [ 0, 2 ]
+    assert list (graph.incoming (3)) == [ 1 ]
+    assert graph.destinationsOf (1) == [ 2, 4 ]
+    assert graph.sourcesOf (2) == [ 1 ]
+    assert graph.destinationsOf (3) == []
+    assert list (graph.fanOut (10)) == [ 0, 2 ]
+    assert list (graph.fanIn (30)) == [ 1 ]
+    assert graph.reachable (1) == set ([ 1, 2, 3, 4 ])
+    assert graph.reachable (20, components=True) == set ([ 20, 30 ])
+
+_connections = """package Connections
+public
+  data Msg
+  end Msg;
+
+  thread Producer
+  features
+    o : out event data port Msg;
+  end Producer;
+
+  thread implementation Producer.impl
+  end Producer.impl;
+
+  thread Consumer
+  features
+    i : in event data port Msg;
+  end Consumer;
+
+  thread implementation Consumer.impl
+  end Consumer.impl;
+
+  process Node
+  end Node;
+
+  process implementation Node.impl
+  subcomponents
+    p : thread Producer.impl;
+    c1 : thread Consumer.impl;
+    c2 : thread Consumer.impl;
+  connections
+    k1 : port p.o -> c1.i;
+    k2 : port p.o -> c2.i;
+  end Node.impl;
+
+  system Top
+  end Top;
+
+  system implementation Top.impl
+  subcomponents
+    n : process Node.impl;
+  end Top.impl;
+end Connections;
+"""
+
+def test_getConnectionGraph ():
+    '''The connection graph holds the ports and threads of each
+    connection'''
+
+    needsOcarina ()
+    model = os.path.join (tempfile.mkdtemp (), "connections.aadl")
+    with open (model, "w") as target:
+        target.write (_connections)
+    reset ()
+    assert load (model)[3] == []
+    assert analyze ()[3] == []
+    assert instantiate ("")[3] == []
+    root = lmp.getRoot ()[0]
+
+    path = lmp.getInstanceName (root)[0] + ".n."
+    producer, c1, c2 = lmp.findNodes ([ path + "p", path + "c1",
+                                       path + "c2" ])[0]
+    output = AIN.Features (producer)[0][0]
+    input1 = AIN.Features (c1)[0][0]
+    input2 = AIN.Features (c2)[0][0]
+
+    result = lmp.getConnectionGraph ()
+    assert result[3] == [], result
+    graph = result[0]
+    assert len (graph) == 2
+    assert list (graph.sources) == [ output, output ]
+    assert sorted (graph.destinations) == sorted ([ input1, input2 ])
+    assert sorted (graph.destinationsOf (output)) == sorted ([ input1, input2 ])
+    assert graph.sourcesOf (input2) == [ output ]
+    assert list (graph.sourceComponents) == [ producer, producer ]
+    assert len (graph.fanOut (producer)) == 2
+    assert len (graph.fanIn (c1)) == 1
+    assert len (graph.fanOut (c1)) == 0
+    assert graph.reachable (producer, components=True) == \
+        set ([ producer, c1, c2 ])
+
+def test_Profile ():
+    '''Calls are recorded by function name while a profile is active'''
+
+    import json
+
+    def profiled (text):
+        os.write (getCaptureSession ().stdout_fd, text.encode ('utf-8'))
+        return len (text)
+
+    runOcarinaFunction (profiled, "not recorded\n")
+    with Profile () as profile:
+        runOcarinaFunction (profiled, "12345\n")
+        runOcarinaFunction (profiled, "")
+        with quiet ():
+            runOcarinaFunction (profiled, "")
+    runOcarinaFunction (profiled, "not recorded\n")
+
+    report = profile.report ()
+    assert list (report) == [ "profiled" ]
+    assert report["profiled"]["calls"] == 3
+    assert report["profiled"]["stdout_bytes"] == 6
+    assert report["profiled"]["max"] >= report["profiled"]["p50"] >= 0.0
+
+    name = os.path.join (tempfile.mkdtemp (), "profile.json")
+    with open (name, "w") as stream:
+        profile.dump (stream)
+    with open (name) as stream:
+        assert json.load (stream)["profiled"]["calls"] == 3
+
+def test_stats ():
+    '''enable_stats records the calls until it is disabled'''
+
+    def counted ():
+        return 0
+
+    enable_stats ()
+    try:
+        runOcarinaFunction (counted)
+        runOcarinaFunction (counted)
+    finally:
+        enable_stats (False)
+    runOcarinaFunction (counted)
+    assert stats ()["counted"]["calls"] == 2
+
+def test_status ():
+    '''The status report counts the phases run since the last reset'''
+
+    loadRma ()
+    report = status ()
+    assert sorted (report["phases"]) == sorted (Phases)
+    assert report["phases"]["load"]["count"] == 2
+    assert report["phases"]["analysis"]["count"] == 1
+    assert report["phases"]["instantiation"]["count"] == 1
+    assert report["phases"]["generation"]["count"] == 0
+    assert report["phases"]["load"]["time"] >= 0.0
+    assert report["names"]["entries"] > 0
+    assert report["nodes"]["instance"] != {}
+    assert report["peak_memory"] is None or report["peak_memory"] > 0
+
+    reset ()
+    assert status ()["phases"]["load"]["count"] == 0
+
+def test_bench ():
+    '''Benchmark runs are summarized, and compared to a baseline'''
+
+    directory = os.path.join (_here, "..", "..", "resources", "runtime",
+                              "python", "test")
+    if not os.path.exists (os.path.join (directory, "bench.py")):
+        raise unittest.SkipTest ('bench.py is not available')
+    sys.path.insert (0, directory)
+    try:
+        import bench
+    finally:
+        sys.path.remove (directory)
+
+    summary = bench.summarize ([ 0.3, 0.1, 0.2 ])
+    assert summary["runs"] == 3
+    assert (summary["min"], summary["median"], summary["max"]) == \
+        (0.1, 0.2, 0.3)
+    assert summary["per_second"] == 5.0
+
+    baseline = { "m" : { "load" : { "median" : 1.0 },
+                         "analyze" : { "median" : 1.0 } } }
+    results = { "m" : { "load" : { "median" : 1.1 },
+                        "analyze" : { "median" : 1.5 } },
+                "other" : { "load" : { "median" : 9.0 } } }
+    regressions = bench.compare (results, baseline, 0.2)
+    assert len (regressions) == 1
+    assert regressions[0].startswith ("m analyze")
+
+def test_generateModel ():
+    '''Synthetic models have the requested shape, and depend on the
+    seed only'''
+
+    import model_generator
+
+    def text (files):
+        result = []
+        for name in files:
+            with open (name) as source:
+                result.append (source.read ())
+        return result
+
+    first = tempfile.mkdtemp ()
+    files, root = model_generator.generateModel (
+        first, systems=2, processes=3, threads=4, flows=1, modes=2,
+        properties=3, seed=7)
+    assert root == "root.impl"
+    assert len (files) == 3 + 2
+    assert all (os.path.dirname (f) == first for f in files)
+    packages = text (files)
+    assert sum (p.count (" : thread ") for p in packages) == 3 * 4
+    assert packages[-1].count (" : system Sub.impl;") == 2
+    assert "end to end flow" in packages[1]
+
+    again = model_generator.generateModel (
+        tempfile.mkdtemp (), systems=2, processes=3, threads=4, flows=1,
+        modes=2, properties=3, seed=7)[0]
+    assert text (again) == packages
+    other = model_generator.generateModel (
+        tempfile.mkdtemp (), systems=2, processes=3, threads=4, flows=1,
+        modes=2, properties=3, seed=8)[0]
+    assert text (other) != packages
+
+def test_loadGeneratedModel ():
+    '''Synthetic models are loaded and instantiated'''
+
+    import model_generator
+
+    needsOcarina ()
+    files, root = model_generator.generateModel (
+        tempfile.mkdtemp (), systems=2, processes=3, threads=4, flows=1)
+    reset ()
+    result = load_many (files)
+    assert result[3] == [], result
+    assert analyze ()[3] == []
+    result = instantiate (root)
+    assert result[3] == [], result
+    assert len (lmp.getInstances ("thread")[0]) == 2 * 3 * 4
+    assert len (lmp.getInstances ("process")[0]) == 2 * 3
+
+def test_decodeTypedValues ():
+    '''Tagged values are decoded into Python values'''
+
+    values = decodeTypedValues ([ 'i', '42',
+                                  'f', '0.5',
+                                  's', 'Hello.Hello_Spg_1',
+                                  'R', 'i', '1', 'i', '3',
+                                  'L', '2', 'e', 'Ada95', 'n',
+                                  'n',
+                                  '?' ])
+    assert values == [ 42, 0.5, 'Hello.Hello_Spg_1', Range (1, 3),
+                       ( 'Ada95', None ), None, None ]
+    assert values[3].high == 3
+    assert decodeTypedValues ([]) == []
+    assert decodeTypedValues (None) == []
+
+def test_getTypedPropertyValue ():
+    '''Typed values are in the base unit of their units type'''
+
+    loadRma ()
+    threads = lmp.getInstances ("thread")[0]
+    periods = getTypedPropertyValues (threads, "period")[0]
+    assert sorted (periods) == [ 500 * 10 ** 9, 1000 * 10 ** 9 ]
+    result = getTypedPropertyValue (threads[0], "compute_execution_time")
+    assert result[3] == [], result
+    assert result[0] == Range (0, 3 * 10 ** 9)
+    assert getTypedPropertyValue (threads[0], "priority")[0] is None
+
+def test_PropertyTable ():
+    '''Values are stored by column, as arrays when they are numbers'''
+
+    import property_table
+
+    table = property_table.PropertyTable (
+        [ 11, 12, 13 ], [ 'period', 'cet', 'language' ],
+        [ [ 1000, None, 500 ],
+          [ Range (0, 3), Range (1, 2), None ],
+          [ 'Ada95', None, ( 'C', ) ] ])
+    assert len (table) == 3
+    assert list (table.masks['period']) == [ 1, 0, 1 ]
+    assert list (table.columns['period']) == [ 1000, 0, 500 ]
+    assert list (table.columns['cet.high']) == [ 3, 2, 0 ]
+    assert table.columns['language'] == [ 'Ada95', None, ( 'C', ) ]
+    assert table.row (1) == { 'id' : 12, 'period' : None, 'cet.low' : 1,
+                              'cet.high' : 2, 'language' : None }
+    assert table.row (2)['cet.low'] is None
+
+    mixed = property_table.PropertyTable ([ 1, 2 ], [ 'p' ], [ [ 1, 0.5 ] ])
+    assert mixed.columns['p'].typecode == 'd'
+
+    if property_table.numpy is None:
+        try:
+            table.toNumpy ()
+            assert False
+        except ImportError:
+            pass
+    else:
+        columns = table.toNumpy ()
+        assert list (columns['id']) == [ 11, 12, 13 ]
+        assert columns['period'].mask.tolist () == [ False, True, False ]
+        assert columns['period'].sum () == 1500
+
+def test_getPropertyTable ():
+    '''A property table holds the values of the per-node queries'''
+
+    loadRma ()
+    threads = lmp.getInstances ("thread")[0]
+    result = lmp.getPropertyTable ("thread", [ "period", "priority",
+                                               "compute_execution_time" ],
+                                   chunkSize=1)
+    assert result[3] == [], result
+    table = result[0]
+    assert list (table.ids) == threads
+    assert list (table.columns["period"]) == \
+        getTypedPropertyValues (threads, "period")[0]
+    assert list (table.masks["priority"]) == [ 0, 0 ]
+    assert list (table.columns["compute_execution_time.high"]) == \
+        [ 3 * 10 ** 9, 3 * 10 ** 9 ]
+
+def test_TaskSet ():
+    '''Schedulability tests of variants of a task set'''
+
+    import schedulability
+
+    def rows (values):
+        return [ list (row) for row in values ]
+
+    assert schedulability.liuLaylandBound (1) == 1.0
+    assert abs (schedulability.liuLaylandBound (2) - 0.8284) < 1e-4
+
+    tasks = schedulability.TaskSet ([ 1, 2, 3 ], [ 100, 100, 200 ],
+                                    [ 4.0, 6.0, 10.0 ], [ 4.0, 6.0, 10.0 ],
+                                    [ 1.0, 2.0, 5.0 ])
+    assert len (tasks) == 3
+    assert tasks.processorIds == [ 100, 200 ]
+
+    load = rows (tasks.utilization ())
+    assert abs (load[0][0] - 7.0 / 12) < 1e-9 and load[0][1] == 0.5
+    assert rows (tasks.rmaTest ()) == [ [ True, True ] ]
+    assert rows (tasks.edfTest ()) == [ [ True, True ] ]
+    assert rows (tasks.responseTimes ()) == [ [ 1.0, 3.0, 5.0 ] ]
+    assert list (tasks.schedulable ()) == [ True ]
+
+    wcets = [ [ 1.0, 2.0, 5.0 ], [ 2.0, 4.0, 5.0 ] ]
+    assert rows (tasks.rmaTest (wcets=wcets)) == \
+        [ [ True, True ], [ False, True ] ]
+    times = rows (tasks.responseTimes (wcets=wcets))
+    assert times[1][:2] == [ 2.0, float ('inf') ]
+    assert list (tasks.schedulable (wcets=wcets)) == [ True, False ]
+
+    # Thread 2 has the highest priority: thread 1 is preempted
+
+    assert rows (tasks.responseTimes (priorities=[ 1, 2, 1 ])) == \
+        [ [ 3.0, 2.0, 5.0 ] ]
+
+    try:
+        tasks.utilization (periods=[ 1.0, 2.0 ])
+        assert False
+    except ValueError:
+        pass
+    try:
+        tasks.schedulable (periods=[ [ 4.0, 6.0, 10.0 ] ] * 2,
+                           wcets=[ [ 1.0, 2.0, 5.0 ] ] * 3)
+        assert False
+    except ValueError:
+        pass
+
+def test_getTaskSet ():
+    '''The threads of rma.aadl are schedulable on their processor'''
+
+    import schedulability
+
+    loadRma ()
+    result = schedulability.getTaskSet ()
+    assert result[3] == [], result
+    tasks = result[0]
+    assert len (tasks) == 2
+    assert sorted (tasks.periods) == [ 0.5, 1.0 ]
+    assert list (tasks.wcets) == [ 0.003, 0.003 ]
+    assert tasks.priorities is None
+    assert len (tasks.processorIds) == 1
+    assert tasks.processorIds[0] in lmp.getInstances ("processor")[0]
+    assert list (tasks.schedulable ()) == [ True ]
+
+def test_findNode ():
+    '''Classifiers and instances are found by their qualified names'''
+
+    root = loadRma ()
+    rootName = lmp.getInstanceName (root)[0]
+    thread = lmp.findNode (rootName + ".node_a.Task1")
+    assert thread[3] == [], thread
+    assert thread[0] in lmp.getInstances ("thread")[0]
+    assert lmp.findNode (rootName.upper () + ".NODE_A.TASK1")[0] == thread[0]
+    assert lmp.findNode (rootName)[0] == root
+
+    types = lmp.getComponentImplementations ("thread")[0]
+    result = lmp.findNodes ([ "RMAAadl::Task.impl_1", "rmaaadl::task.impl_2",
+                              "RMAAadl::Missing", rootName + ".cpu_rm.x" ])
+    assert result[3] == [], result
+    assert sorted (result[0][:2]) == sorted (types)
+    assert result[0][2:] == [ None, None ]
+
+    reset ()
+    assert lmp.findNode ("RMAAadl::Task.impl_1")[0] is None
+
+def runTests ():
+    '''Run the behaviour tests, return the number of failures'''
+
+    failures = 0
+    for name in sorted(globals()):
+        if not name.startswith('test_'):
+            continue
+        try:
+            globals()[name]()
+            print ("%s: ok" % name)
+        except unittest.SkipTest as reason:
+            print ("%s: skipped (%s)" % (name, reason))
+        except Exception:
+            failures += 1
+            print ("%s: FAILED %r" % (name, sys.exc_info()[1]))
+    return failures
 
 if __name__ == "__main__":
     main ()
-    sys.exit (0)                         # exit
+    sys.exit (runTests ())               # exit
@@ -2133,8 +2133,7 @@ package body Parser is
       Output.Write_Str ("while Present (List_Node) loop");
       Output.Write_Eol;
       W_Indentation (3);
-      Output.Write_Str ("Set_Return_Value (Data, Integer'Image ");
-      Output.Write_Str ("(Integer (List_Node)));");
+      Output.Write_Str ("Set_Return_Value (Data, Integer (List_Node));");
       Output.Write_Eol;
       W_Indentation (3);
       Output.Write_Str ("List_Node := Next_Entity (List_Node);");
@@ -2173,8 +2172,7 @@ package body Parser is
       Output.Write_Str ("while Present (List_Node) loop");
       Output.Write_Eol;
       W_Indentation (4);
-      Output.Write_Str
-        ("Set_Return_Value (Data, Integer'Image (Integer (List_Node)));");
+      Output.Write_Str ("Set_Return_Value (Data, Integer (List_Node));");
       Output.Write_Eol;
       W_Indentation (4);
       Output.Write_Str ("List_Node := Next_Node (List_Node);");
@@ -2300,8 +2298,7 @@ package body Parser is
       W_Indentation (2);
       Output.Write_Str ("Set_Return_Value (Data, Get_Name_Of_Entity (");
       Output.Write_Str (A);
-      Output.Write_Str (" (get_Node_Id_From_String ");
-      Output.Write_Str ("(Nth_Arg (Data, 1, """")))");
+      Output.Write_Str (" (Get_Node_Id_Arg (Data, 1))");
       Output.Write_Str (", false);");
       Output.Write_Eol;
       W_Indentation (1);
@@ -2340,10 +2337,8 @@ package body Parser is
       Output.Write_Eol;
       W_Indentation (2);
       Output.Write_Str (WS (A));
-      Output.Write_Str (" (get_Node_Id_From_String (Nth_Arg ");
-      Output.Write_Str ("(Data, 1, """")),");
-      Output.Write_Str ("get_Node_Id_From_String (Nth_Arg ");
-      Output.Write_Str ("(Data, 2, """")));");
+      Output.Write_Str (" (Get_Node_Id_Arg (Data, 1), ");
+      Output.Write_Str ("Get_Node_Id_Arg (Data, 2));");
       Output.Write_Eol;
       W_Indentation (1);
       Output.Write_Str ("end On_");
@@ -2400,12 +2395,10 @@ package body Parser is
       W_Indentation (2);
       if GNS (Identifier (NS)) = "Node_Id" then
          Output.Write_Str (WS (GNS (Identifier (A))));
-         Output.Write_Str (" (get_Node_Id_From_String");
-         Output.Write_Str (" (Nth_Arg (Data, 1, """")), ");
+         Output.Write_Str (" (Get_Node_Id_Arg (Data, 1), ");
       elsif GNS (Identifier (NS)) = "List_Id" then
          Output.Write_Str (WS (GNS (Identifier (A))));
-         Output.Write_Str (" (get_List_Id_From_String");
-         Output.Write_Str (" (Nth_Arg (Data, 1, """")), ");
+         Output.Write_Str (" (Get_List_Id_Arg (Data, 1), ");
       else
          Output.Write_Str ("dummy;");
          isDummy := True;
@@ -2414,11 +2407,9 @@ package body Parser is
          Output.Write_Eol;
          W_Indentation (3);
          if GNS (Identifier (Type_Spec (A))) = "Node_Id" then
-            Output.Write_Str ("get_Node_Id_From_String ");
-            Output.Write_Str ("(Nth_Arg (Data, 2, """")));");
+            Output.Write_Str ("Get_Node_Id_Arg (Data, 2));");
          elsif GNS (Identifier (Type_Spec (A))) = "List_Id" then
-            Output.Write_Str ("get_List_Id_From_String ");
-            Output.Write_Str ("(Nth_Arg (Data, 2, """")));");
+            Output.Write_Str ("Get_List_Id_Arg (Data, 2));");
          elsif GNS (Identifier (Type_Spec (A))) = "Name_Id" then
             Output.Write_Str ("get_Name_Id_From_String ");
             Output.Write_Str ("(Nth_Arg (Data, 2, """")));");
@@ -2499,15 +2490,15 @@ package body Parser is
          W_Indentation (4);
 
          if GNS (Identifier (NS)) = "Node_Id" then
-            Output.Write_Str ("get_Node_Id_From_String");
+            Output.Write_Str ("Get_Node_Id_Arg");
          elsif GNS (Identifier (NS)) = "List_Id" then
-            Output.Write_Str ("get_List_Id_From_String");
+            Output.Write_Str ("Get_List_Id_Arg");
          end if;
 
          if GNS (Identifier (Type_Spec (A))) = "List_Id" then
-            Output.Write_Str (" (Nth_Arg (Data, 1, """"))));");
+            Output.Write_Str (" (Data, 1)));");
          else
-            Output.Write_Str (" (Nth_Arg (Data, 1, """")))));");
+            Output.Write_Str (" (Data, 1))));");
          end if;
       else
          Output.Write_Str ("dummy;");